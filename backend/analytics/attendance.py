@@ -0,0 +1,86 @@
+"""
+Attendance analytics read from the check-in buckets.
+
+Every query here touches one row per event per minute with check-ins,
+however many registrations the events have.
+"""
+
+from django.db.models import Sum
+from django.db.models.functions import Trunc
+
+from .models import CheckInBucket
+
+
+def check_in_series(event_ids=None, start=None, end=None, interval='minute'):
+    """
+    Check-in counts per event over time.
+    
+    Args:
+        event_ids: Events to include; every event with check-ins when None
+        start: Inclusive lower bound on the bucket start
+        end: Exclusive upper bound on the bucket start
+        interval: ``minute``, ``hour`` or ``day``
+        
+    Returns:
+        List of ``{"event_id", "total", "series"}`` dicts ordered by event
+    """
+    buckets = CheckInBucket.objects.all()
+    if event_ids is not None:
+        buckets = buckets.filter(event_id__in=event_ids)
+    if start is not None:
+        buckets = buckets.filter(bucket__gte=start)
+    if end is not None:
+        buckets = buckets.filter(bucket__lt=end)
+    
+    rows = buckets.annotate(period=Trunc('bucket', interval)).values('event_id', 'period').annotate(
+        total=Sum('count')
+    ).order_by('event_id', 'period')
+    
+    results = []
+    for row in rows:
+        if not results or results[-1]['event_id'] != row['event_id']:
+            results.append({'event_id': row['event_id'], 'total': 0, 'series': []})
+        results[-1]['total'] += row['total']
+        results[-1]['series'].append({'bucket': row['period'], 'count': row['total']})
+    return results
+
+
+def event_attendance(event, now=None):
+    """
+    Attendance summary for one event.
+    
+    Rates are relative to active (registered or checked in) registrations;
+    the no-show rate is only reported once the event has ended.
+    """
+    from django.utils import timezone
+    
+    now = now or timezone.now()
+    expected = event.registered_count + event.checked_in_count
+    
+    first = last = peak = None
+    before_start = after_start = 0
+    for bucket, count in event.check_in_buckets.order_by('bucket').values_list('bucket', 'count'):
+        first = first or bucket
+        last = bucket
+        if peak is None or count > peak['count']:
+            peak = {'bucket': bucket, 'count': count}
+        if bucket < event.start_time:
+            before_start += count
+        else:
+            after_start += count
+    
+    return {
+        'event_id': event.pk,
+        'registered': event.registered_count,
+        'checked_in': event.checked_in_count,
+        'cancelled': event.cancelled_count,
+        'check_in_rate': event.checked_in_count / expected if expected else None,
+        'no_show_rate': event.registered_count / expected if expected and event.end_time < now else None,
+        'arrivals': {
+            'first': first,
+            'last': last,
+            'peak': peak,
+            'before_start': before_start,
+            'after_start': after_start,
+        },
+    }
@@ -0,0 +1,38 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from analytics.models import CheckInBucket
+from events.models import Event
+
+
+class Command(BaseCommand):
+    """Backfill the per-minute check-in buckets from registrations."""
+
+    help = 'Rebuild check-in buckets from the check-in times on registrations.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--event', type=int, action='append', dest='event_ids',
+            help='Only rebuild the given event id (may be repeated).'
+        )
+        parser.add_argument(
+            '--batch-size', type=int, default=1000,
+            help='Number of buckets written per INSERT batch.'
+        )
+
+    def handle(self, *args, **options):
+        event_ids = options['event_ids']
+
+        events = Event.objects.only('id').order_by('id')
+        if event_ids:
+            events = events.filter(pk__in=event_ids)
+
+        with transaction.atomic():
+            # Check-ins update their event's counters, so locking the events
+            # holds them back until the rebuilt buckets are committed
+            events = list(events.select_for_update())
+            written = CheckInBucket.rebuild(event_ids, batch_size=options['batch_size'])
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Rebuilt check-in buckets for {len(events)} events ({written} buckets).'
+        ))
@@ -0,0 +1,49 @@
+# Generated by Django 4.2.10 on 2026-10-17 04:43
+
+from django.db import migrations, models
+from django.db.models import Count
+from django.db.models.functions import TruncMinute
+import django.db.models.deletion
+
+
+def backfill_buckets(apps, schema_editor):
+    CheckInBucket = apps.get_model('analytics', 'CheckInBucket')
+    Registration = apps.get_model('registrations', 'Registration')
+
+    rows = Registration.objects.filter(checked_in_at__isnull=False).annotate(
+        minute=TruncMinute('checked_in_at')
+    ).order_by().values('event_id', 'minute').annotate(total=Count('id'))
+    CheckInBucket.objects.bulk_create(
+        [CheckInBucket(event_id=row['event_id'], bucket=row['minute'], count=row['total']) for row in rows],
+        batch_size=1000
+    )
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('events', '0005_event_search_index'),
+        ('registrations', '0005_keyset_pagination_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CheckInBucket',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('bucket', models.DateTimeField(verbose_name='bucket start')),
+                ('count', models.PositiveIntegerField(default=0, verbose_name='check-ins')),
+                ('event', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='check_in_buckets', to='events.event', verbose_name='event')),
+            ],
+            options={
+                'verbose_name': 'check-in bucket',
+                'verbose_name_plural': 'check-in buckets',
+                'ordering': ['event', 'bucket'],
+                'indexes': [models.Index(fields=['bucket'], name='analytics_c_bucket_e09cde_idx')],
+                'unique_together': {('event', 'bucket')},
+            },
+        ),
+        migrations.RunPython(backfill_buckets, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,21 @@
+from rest_framework import serializers
+
+INTERVALS = ('minute', 'hour', 'day')
+
+
+class CheckInSeriesSerializer(serializers.Serializer):
+    """Serializer for the query parameters of a check-in time series."""
+    
+    event_id = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        required=False,
+        max_length=100
+    )
+    start = serializers.DateTimeField(required=False)
+    end = serializers.DateTimeField(required=False)
+    interval = serializers.ChoiceField(choices=INTERVALS, default='minute')
+    
+    def validate(self, data):
+        if 'start' in data and 'end' in data and data['start'] >= data['end']:
+            raise serializers.ValidationError({"end": "End must be after start."})
+        return data
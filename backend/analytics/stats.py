@@ -0,0 +1,65 @@
+"""
+Aggregated statistics for the admin dashboard.
+
+Totals are computed in the database with two aggregate queries and kept in
+the cache for ``STATS_CACHE_TIMEOUT`` seconds, so dashboards refreshing at
+the same time share one computation.
+"""
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db.models import Count, Q, Sum
+from django.utils import timezone
+
+STATS_CACHE_KEY = 'admin-stats'
+DEFAULT_CACHE_TIMEOUT = 30
+
+
+def compute_stats():
+    """
+    Count events, users and registrations.
+
+    Registration totals come from the per-event status counters, which sum
+    a row per event instead of scanning every registration.
+    """
+    from events.models import Event
+    from registrations.models import Registration
+
+    now = timezone.now()
+    counters = {
+        f'{status}_total': Sum(field) for status, field in Event.REGISTRATION_COUNTERS.items()
+    }
+    events = Event.objects.aggregate(
+        total=Count('id'),
+        upcoming=Count('id', filter=Q(start_time__gt=now)),
+        ongoing=Count('id', filter=Q(start_time__lte=now, end_time__gte=now)),
+        past=Count('id', filter=Q(end_time__lt=now)),
+        active=Count('id', filter=Q(active=True)),
+        **counters,
+    )
+
+    User = get_user_model()
+    roles = dict.fromkeys((role for role, _ in User.ROLE_CHOICES), 0)
+    roles.update(User.objects.order_by().values_list('role').annotate(count=Count('id')))
+
+    statuses = dict.fromkeys((status for status, _ in Registration.STATUS_CHOICES), 0)
+    for status in statuses:
+        statuses[status] = events.pop(f'{status}_total', None) or 0
+
+    return {
+        'events': events,
+        'users': {'total': sum(roles.values()), 'by_role': roles},
+        'registrations': {'total': sum(statuses.values()), 'by_status': statuses},
+        'generated_at': now,
+    }
+
+
+def get_stats():
+    """Return the dashboard statistics, computing them at most once per timeout."""
+    timeout = getattr(settings, 'STATS_CACHE_TIMEOUT', DEFAULT_CACHE_TIMEOUT)
+    stats = cache.get(STATS_CACHE_KEY)
+    if stats is None:
+        stats = compute_stats()
+        cache.set(STATS_CACHE_KEY, stats, timeout)
+    return stats
@@ -0,0 +1,8 @@
+from django.urls import path
+from .views import StatsView, CheckInSeriesView, EventAttendanceView
+
+urlpatterns = [
+    path('stats/', StatsView.as_view(), name='stats'),
+    path('analytics/check-ins/', CheckInSeriesView.as_view(), name='check-in-series'),
+    path('analytics/events/<int:event_id>/attendance/', EventAttendanceView.as_view(), name='event-attendance'),
+]
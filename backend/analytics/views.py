@@ -0,0 +1,48 @@
+from django.shortcuts import get_object_or_404
+from rest_framework import permissions
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from events.models import Event
+from events.views import IsAdminUser
+from .attendance import check_in_series, event_attendance
+from .serializers import CheckInSeriesSerializer
+from .stats import get_stats
+
+
+class StatsView(APIView):
+    """View for the admin dashboard's aggregated statistics."""
+    
+    permission_classes = [permissions.IsAuthenticated, IsAdminUser]
+    
+    def get(self, request):
+        return Response(get_stats())
+
+
+class CheckInSeriesView(APIView):
+    """View for check-in time series across one or more events (admin only)."""
+    
+    permission_classes = [permissions.IsAuthenticated, IsAdminUser]
+    
+    def get(self, request):
+        serializer = CheckInSeriesSerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        params = serializer.validated_data
+        
+        results = check_in_series(
+            event_ids=params.get('event_id'),
+            start=params.get('start'),
+            end=params.get('end'),
+            interval=params['interval']
+        )
+        return Response({'interval': params['interval'], 'results': results})
+
+
+class EventAttendanceView(APIView):
+    """View for an event's check-in rate, no-show rate and arrival times (admin only)."""
+    
+    permission_classes = [permissions.IsAuthenticated, IsAdminUser]
+    
+    def get(self, request, event_id):
+        event = get_object_or_404(Event, pk=event_id)
+        return Response(event_attendance(event))
@@ -1,5 +1,7 @@
 """
 ASGI config for campus_connect project.
+
+Serves the whole API, including the async live update streams.
 """
 
 import os
@@ -8,4 +10,11 @@ from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'campus_connect.settings')
 
-application = get_asgi_application() 
\ No newline at end of file
+application = get_asgi_application()
+
+from django.conf import settings  # noqa: E402
+
+if settings.DEBUG:
+    # Serve static files in development, like runserver does
+    from django.contrib.staticfiles.handlers import ASGIStaticFilesHandler
+    application = ASGIStaticFilesHandler(application)
@@ -0,0 +1,89 @@
+"""
+Async counterparts of the DRF views the hot read paths use.
+
+DRF dispatches synchronously, so under ASGI every request would hop to a
+worker thread for its whole lifetime. These views keep the request on the
+event loop: authentication, permission and throttle checks run in a
+thread (they are sync and may query the user), and the handler awaits the
+async ORM for its own queries.
+"""
+
+import asyncio
+
+from asgiref.sync import sync_to_async
+from django.http import Http404
+from rest_framework import generics
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+
+class AsyncAPIView(APIView):
+    """``APIView`` whose HTTP handlers are coroutines."""
+    
+    async def dispatch(self, request, *args, **kwargs):
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+        
+        try:
+            await sync_to_async(self.initial)(request, *args, **kwargs)
+            
+            if request.method.lower() in self.http_method_names:
+                handler = getattr(self, request.method.lower(), self.http_method_not_allowed)
+            else:
+                handler = self.http_method_not_allowed
+            
+            response = handler(request, *args, **kwargs)
+            # OPTIONS and method-not-allowed stay synchronous
+            if asyncio.iscoroutine(response):
+                response = await response
+        except Exception as exc:
+            response = self.handle_exception(exc)
+        
+        self.response = self.finalize_response(request, response, *args, **kwargs)
+        return self.response
+
+
+class AsyncGenericAPIView(AsyncAPIView, generics.GenericAPIView):
+    """``GenericAPIView`` with async object lookup and pagination."""
+    
+    async def aget_object(self):
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        queryset = self.get_queryset().filter(**{self.lookup_field: self.kwargs[lookup_url_kwarg]})
+        obj = await queryset.afirst()
+        if obj is None:
+            raise Http404
+        await sync_to_async(self.check_object_permissions)(self.request, obj)
+        return obj
+    
+    async def apaginate_queryset(self, queryset):
+        if self.paginator is None:
+            return None
+        return await self.paginator.apaginate_queryset(queryset, self.request, view=self)
+
+
+class AsyncListAPIView(AsyncGenericAPIView):
+    """Async ``ListAPIView``; the paginator must provide ``apaginate_queryset``."""
+    
+    async def get(self, request, *args, **kwargs):
+        # Filter backends may probe the database while building the queryset
+        queryset = await sync_to_async(self.filter_queryset)(self.get_queryset())
+        
+        page = await self.apaginate_queryset(queryset)
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
+        
+        serializer = self.get_serializer([obj async for obj in queryset], many=True)
+        return Response(serializer.data)
+
+
+class AsyncRetrieveAPIView(AsyncGenericAPIView):
+    """Async ``RetrieveAPIView``."""
+    
+    async def get(self, request, *args, **kwargs):
+        instance = await self.aget_object()
+        serializer = self.get_serializer(instance)
+        return Response(serializer.data)
@@ -0,0 +1,162 @@
+"""
+Publish/subscribe fan-out for live updates.
+
+Sync code (views, models) publishes JSON-serializable messages to a named
+channel; async consumers (SSE streams served under ASGI) subscribe to it.
+The default backend fans out within the current process. Deployments with
+several worker processes point ``LIVE_BROKER['BACKEND']`` at the Redis
+backend so a message published by one worker reaches every subscriber.
+"""
+
+import asyncio
+import json
+import threading
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils.module_loading import import_string
+
+DEFAULT_BACKEND = 'campus_connect.broker.InProcessBroker'
+
+# Messages a slow subscriber may fall behind by before it is dropped
+SUBSCRIBER_QUEUE_SIZE = 100
+
+
+class Subscription:
+    """Messages for one subscriber, readable with ``await subscription.get()``."""
+
+    def __init__(self, loop):
+        self.loop = loop
+        self.queue = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        self.overflowed = False
+
+    def put(self, message):
+        # Runs on the subscriber's loop
+        try:
+            self.queue.put_nowait(message)
+        except asyncio.QueueFull:
+            self.overflowed = True
+
+    async def get(self):
+        return await self.queue.get()
+
+
+class InProcessBroker:
+    """Fan messages out to the subscribers of this process."""
+
+    def __init__(self, **options):
+        self._subscriptions = defaultdict(set)
+        self._lock = threading.Lock()
+
+    def publish(self, channel, message):
+        """Deliver ``message`` to every subscriber of ``channel``; safe from any thread."""
+        with self._lock:
+            subscriptions = list(self._subscriptions.get(channel, ()))
+        for subscription in subscriptions:
+            try:
+                subscription.loop.call_soon_threadsafe(subscription.put, message)
+            except RuntimeError:
+                # The subscriber's loop has been closed
+                self._remove(channel, subscription)
+
+    def has_subscribers(self, channel):
+        """Whether anything listens on ``channel``, so publishers can skip work."""
+        with self._lock:
+            return bool(self._subscriptions.get(channel))
+
+    def subscribe(self, channel):
+        """Register a subscription on the running event loop."""
+        subscription = Subscription(asyncio.get_running_loop())
+        with self._lock:
+            self._subscriptions[channel].add(subscription)
+        return subscription
+
+    def unsubscribe(self, channel, subscription):
+        self._remove(channel, subscription)
+
+    def _remove(self, channel, subscription):
+        with self._lock:
+            subscriptions = self._subscriptions.get(channel)
+            if subscriptions is not None:
+                subscriptions.discard(subscription)
+                if not subscriptions:
+                    del self._subscriptions[channel]
+
+
+class RedisBroker(InProcessBroker):
+    """
+    Fan messages out to every process through Redis pub/sub.
+
+    Publishing sends the message to Redis; one listener task per process
+    and channel relays what Redis delivers to that process's subscribers.
+    """
+
+    def __init__(self, url=None, prefix='live', **options):
+        super().__init__(**options)
+        import redis
+        import redis.asyncio
+
+        self.url = url or getattr(settings, 'REDIS_URL', None)
+        self.prefix = prefix
+        self._client = redis.Redis.from_url(self.url)
+        self._async_redis = redis.asyncio
+        self._listeners = {}
+
+    def _redis_channel(self, channel):
+        return f'{self.prefix}:{channel}'
+
+    def publish(self, channel, message):
+        self._client.publish(self._redis_channel(channel), json.dumps(message, cls=DjangoJSONEncoder))
+
+    def has_subscribers(self, channel):
+        # Subscribers may be in any process; each process listens once per channel
+        [(_, count)] = self._client.pubsub_numsub(self._redis_channel(channel))
+        return count > 0
+
+    def subscribe(self, channel):
+        subscription = super().subscribe(channel)
+        loop = subscription.loop
+        listener = self._listeners.get((loop, channel))
+        if listener is None or listener.done():
+            self._listeners[(loop, channel)] = loop.create_task(self._listen(channel))
+        return subscription
+
+    def unsubscribe(self, channel, subscription):
+        super().unsubscribe(channel, subscription)
+        with self._lock:
+            still_listening = any(
+                other.loop is subscription.loop for other in self._subscriptions.get(channel, ())
+            )
+        if not still_listening:
+            listener = self._listeners.pop((subscription.loop, channel), None)
+            if listener is not None:
+                listener.cancel()
+
+    async def _listen(self, channel):
+        client = self._async_redis.Redis.from_url(self.url)
+        pubsub = client.pubsub()
+        try:
+            await pubsub.subscribe(self._redis_channel(channel))
+            async for item in pubsub.listen():
+                if item.get('type') == 'message':
+                    super().publish(channel, json.loads(item['data']))
+        finally:
+            await pubsub.close()
+            await client.close()
+
+
+_broker = None
+_broker_lock = threading.Lock()
+
+
+def get_broker():
+    """Return the process-wide broker configured by ``LIVE_BROKER``."""
+    global _broker
+    if _broker is None:
+        with _broker_lock:
+            if _broker is None:
+                config = getattr(settings, 'LIVE_BROKER', {})
+                backend = import_string(config.get('BACKEND', DEFAULT_BACKEND))
+                _broker = backend(**config.get('OPTIONS', {}))
+    return _broker
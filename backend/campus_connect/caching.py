@@ -0,0 +1,213 @@
+"""
+Versioned read-through caching for API responses.
+
+Cached entries are keyed on one or more version counters held in the
+shared cache. Writers never delete entries; they bump a version, which
+moves every reader onto fresh keys, and the old entries age out. A miss is
+rebuilt by a single worker while concurrent requests for the same key wait
+for its result instead of all hitting the database.
+
+Views that also send conditional GET validators store the values those
+are computed from with each entry, so a hit, 304 or not, runs no query.
+"""
+
+import asyncio
+import hashlib
+import time
+from collections import namedtuple
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework.response import Response
+
+DEFAULT_CACHE_TIMEOUT = 60
+
+# How long a rebuild may hold its lock, and how often waiters poll for it
+LOCK_TIMEOUT = 10
+POLL_INTERVAL = 0.05
+
+# A cached response: its serialized data, and the conditional GET validator
+# values it was built against (None for views without validators)
+CachedResponse = namedtuple('CachedResponse', ['data', 'validator_values'])
+
+
+def get_versions(keys):
+    """Return the current value of each version key (0 if never bumped)."""
+    versions = cache.get_many(keys)
+    return [versions.get(key, 0) for key in keys]
+
+
+def bump_version(key):
+    """Increment a version key, creating it if needed."""
+    if not cache.add(key, 1, timeout=None):
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, 1, timeout=None)
+
+
+def get_or_build(key, build, timeout, wait=LOCK_TIMEOUT):
+    """
+    Read ``key`` from the cache, building it on a miss.
+    
+    Only the worker that wins the rebuild lock calls ``build``; others poll
+    for its result for up to ``wait`` seconds and then build it themselves,
+    so a crashed or slow rebuild never blocks requests for long. A ``build``
+    result of None is returned but not cached.
+    """
+    value = cache.get(key)
+    if value is not None:
+        return value
+    
+    lock_key = f'{key}:lock'
+    if cache.add(lock_key, 1, timeout=LOCK_TIMEOUT):
+        try:
+            value = build()
+            if value is not None:
+                cache.set(key, value, timeout)
+        finally:
+            cache.delete(lock_key)
+        return value
+    
+    deadline = time.monotonic() + wait
+    while time.monotonic() < deadline:
+        time.sleep(POLL_INTERVAL)
+        value = cache.get(key)
+        if value is not None:
+            return value
+        if cache.get(lock_key) is None:
+            break
+    return build()
+
+
+async def aget_or_build(key, build, timeout, wait=LOCK_TIMEOUT):
+    """Async version of ``get_or_build``; ``build`` is a coroutine function."""
+    value = await cache.aget(key)
+    if value is not None:
+        return value
+    
+    lock_key = f'{key}:lock'
+    if await cache.aadd(lock_key, 1, timeout=LOCK_TIMEOUT):
+        try:
+            value = await build()
+            if value is not None:
+                await cache.aset(key, value, timeout)
+        finally:
+            await cache.adelete(lock_key)
+        return value
+    
+    deadline = time.monotonic() + wait
+    while time.monotonic() < deadline:
+        await asyncio.sleep(POLL_INTERVAL)
+        value = await cache.aget(key)
+        if value is not None:
+            return value
+        if await cache.aget(lock_key) is None:
+            break
+    return await build()
+
+
+class CachedResponseMixin:
+    """
+    Serve successful GET responses of a DRF view from the cache.
+    
+    Views list the version keys their output depends on in
+    ``get_cache_version_keys()``. Entries are keyed on those versions, the
+    host (links in the payload are absolute), the path and the sorted query
+    parameters. Only the serialized data is cached; rendering still follows
+    content negotiation.
+    
+    Combined with ``ConditionalGetMixin`` (listed first), the entry is read
+    before validators are computed: a hit takes its validator values from
+    the entry, and a miss stores the ones the view computed with it.
+    """
+    
+    cache_prefix = None
+    
+    # Set per request by get_cached_response()
+    cache_key = None
+    cached_response = None
+    
+    # Set per request by ConditionalGetMixin
+    validator_values = None
+    
+    def get_cache_version_keys(self):
+        raise NotImplementedError('Views using CachedResponseMixin must define get_cache_version_keys()')
+    
+    def get_cache_timeout(self):
+        return getattr(settings, 'API_CACHE_TIMEOUT', DEFAULT_CACHE_TIMEOUT)
+    
+    def get_cache_key(self, request):
+        return self.make_cache_key(request, get_versions(self.get_cache_version_keys()))
+    
+    def make_cache_key(self, request, versions):
+        params = sorted((name, sorted(values)) for name, values in request.query_params.lists())
+        digest = hashlib.md5(
+            repr((request.get_host(), request.path, params)).encode()
+        ).hexdigest()
+        prefix = self.cache_prefix or self.__class__.__name__
+        return f"response:{prefix}:{'.'.join(map(str, versions))}:{digest}"
+    
+    def get_cached_response(self, request):
+        """Look up the request's entry; ``get()`` serves it without reading it again."""
+        self.cache_key = self.get_cache_key(request)
+        self.cached_response = cache.get(self.cache_key)
+        return self.cached_response
+    
+    def build_cached_response(self, response):
+        if response.status_code != 200:
+            return None
+        return CachedResponse(response.data, self.validator_values)
+    
+    def get(self, request, *args, **kwargs):
+        if self.cached_response is not None:
+            return self.finalize_cached_response(None, self.cached_response)
+        
+        built = {}
+        
+        def build():
+            response = built['response'] = super(CachedResponseMixin, self).get(request, *args, **kwargs)
+            return self.build_cached_response(response)
+        
+        key = self.cache_key or self.get_cache_key(request)
+        cached = get_or_build(key, build, self.get_cache_timeout())
+        return self.finalize_cached_response(built.get('response'), cached)
+    
+    def finalize_cached_response(self, built_response, cached):
+        if built_response is not None:
+            built_response['X-Cache'] = 'MISS'
+            return built_response
+        response = Response(cached.data)
+        response['X-Cache'] = 'HIT'
+        return response
+
+
+class AsyncCachedResponseMixin(CachedResponseMixin):
+    """``CachedResponseMixin`` for async views."""
+    
+    async def aget_cache_key(self, request):
+        keys = self.get_cache_version_keys()
+        versions = await cache.aget_many(keys)
+        return self.make_cache_key(request, [versions.get(name, 0) for name in keys])
+    
+    async def aget_cached_response(self, request):
+        self.cache_key = await self.aget_cache_key(request)
+        self.cached_response = await cache.aget(self.cache_key)
+        return self.cached_response
+    
+    async def get(self, request, *args, **kwargs):
+        if self.cached_response is not None:
+            return self.finalize_cached_response(None, self.cached_response)
+        
+        built = {}
+        
+        async def build():
+            # Skip the synchronous CachedResponseMixin.get
+            response = built['response'] = await super(CachedResponseMixin, self).get(
+                request, *args, **kwargs
+            )
+            return self.build_cached_response(response)
+        
+        key = self.cache_key or await self.aget_cache_key(request)
+        cached = await aget_or_build(key, build, self.get_cache_timeout())
+        return self.finalize_cached_response(built.get('response'), cached)
@@ -0,0 +1,142 @@
+"""
+Conditional GET support for API views.
+
+Validators are computed with one aggregate query over the rows a response
+is built from (how many there are and when the latest one changed), so an
+unchanged resource is answered with 304 Not Modified before anything is
+serialized. Views with cached responses (``CachedResponseMixin``) keep
+those values with each cache entry and skip the query on a hit.
+"""
+
+import hashlib
+
+from asgiref.sync import sync_to_async
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import http_date, quote_etag
+
+
+class ConditionalGetMixin:
+    """
+    Add ETag (and, for detail views, Last-Modified) validators to GET.
+    
+    List views aggregate the filtered queryset; views with a lookup
+    aggregate the single object's row. ``last_modified_fields`` lists the
+    timestamps the payload depends on, including those of nested objects.
+    Output that changes without a write (fields derived from the current
+    time) is folded into the ETag through ``get_etag_aggregates()``.
+    
+    Lists send no Last-Modified: deleting a row changes the list without
+    moving its latest ``updated_at``, which only the ETag's count catches.
+    """
+    
+    last_modified_fields = ('updated_at',)
+    
+    def get_etag_aggregates(self):
+        """Extra aggregates that feed the ETag, as a dict of expressions."""
+        return {}
+    
+    def is_detail_request(self):
+        return (self.lookup_url_kwarg or self.lookup_field) in self.kwargs
+    
+    def get_validator_queryset(self):
+        queryset = self.get_queryset()
+        if self.is_detail_request():
+            lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+            return queryset.filter(**{self.lookup_field: self.kwargs[lookup_url_kwarg]})
+        return self.filter_queryset(queryset)
+    
+    def get_validator_aggregates(self):
+        modified = {
+            f'validator_modified_{index}': Max(field)
+            for index, field in enumerate(self.last_modified_fields)
+        }
+        return {'validator_count': Count('pk'), **modified, **self.get_etag_aggregates()}
+    
+    def get_validators(self, request):
+        """
+        Return ``(etag, last_modified)`` for the request, or ``(None, None)``
+        when the lookup matches nothing and the view should answer normally.
+        """
+        # Defined by CachedResponseMixin
+        get_cached_response = getattr(self, 'get_cached_response', None)
+        cached = get_cached_response(request) if get_cached_response else None
+        if cached is not None and cached.validator_values is not None:
+            values = cached.validator_values
+        else:
+            values = self.get_validator_queryset().order_by().aggregate(**self.get_validator_aggregates())
+        self.validator_values = values
+        return self.make_validators(request, values)
+    
+    def make_validators(self, request, values):
+        if self.is_detail_request() and not values['validator_count']:
+            return None, None
+        
+        user = request.user.pk if request.user and request.user.is_authenticated else None
+        params = sorted((name, sorted(items)) for name, items in request.query_params.lists())
+        renderer = getattr(request, 'accepted_renderer', None)
+        state = (
+            request.path, params, user, renderer and renderer.format,
+            sorted((name, str(value)) for name, value in values.items())
+        )
+        etag = quote_etag(hashlib.md5(repr(state).encode()).hexdigest())
+        
+        last_modified = None
+        timestamps = [
+            value for name, value in values.items()
+            if name.startswith('validator_modified_') and value
+        ]
+        if self.is_detail_request() and timestamps:
+            last_modified = int(max(timestamps).timestamp())
+        return etag, last_modified
+    
+    def get(self, request, *args, **kwargs):
+        etag, last_modified = self.get_validators(request)
+        response = self.get_not_modified_response(request, etag, last_modified)
+        if response is None:
+            response = super().get(request, *args, **kwargs)
+        return self.add_validators(response, etag, last_modified)
+    
+    def get_not_modified_response(self, request, etag, last_modified):
+        if etag:
+            return get_conditional_response(request, etag=etag, last_modified=last_modified)
+        return None
+    
+    def add_validators(self, response, etag, last_modified):
+        if response.status_code not in (200, 304):
+            return response
+        if etag:
+            response['ETag'] = etag
+        if last_modified:
+            response['Last-Modified'] = http_date(last_modified)
+        # Validators differ per user, and the token travels in Authorization
+        patch_vary_headers(response, ('Authorization',))
+        return response
+
+
+class AsyncConditionalGetMixin(ConditionalGetMixin):
+    """``ConditionalGetMixin`` for async views; the aggregate runs through the async ORM."""
+    
+    async def aget_validators(self, request):
+        # Defined by AsyncCachedResponseMixin
+        aget_cached_response = getattr(self, 'aget_cached_response', None)
+        cached = await aget_cached_response(request) if aget_cached_response else None
+        if cached is not None and cached.validator_values is not None:
+            self.validator_values = cached.validator_values
+            return self.make_validators(request, self.validator_values)
+        
+        if self.is_detail_request():
+            queryset = self.get_validator_queryset()
+        else:
+            # Filter backends may probe the database while building the queryset
+            queryset = await sync_to_async(self.get_validator_queryset)()
+        values = self.validator_values = await queryset.order_by().aaggregate(**self.get_validator_aggregates())
+        return self.make_validators(request, values)
+    
+    async def get(self, request, *args, **kwargs):
+        etag, last_modified = await self.aget_validators(request)
+        response = self.get_not_modified_response(request, etag, last_modified)
+        if response is None:
+            # Skip the synchronous ConditionalGetMixin.get
+            response = await super(ConditionalGetMixin, self).get(request, *args, **kwargs)
+        return self.add_validators(response, etag, last_modified)
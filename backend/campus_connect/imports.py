@@ -0,0 +1,174 @@
+"""
+Streaming row parsers for bulk imports.
+
+CSV, JSON and NDJSON files are parsed one row at a time from a binary or
+text stream, so imports of any size run in constant memory.
+"""
+
+import codecs
+import csv
+import io
+import json
+
+IMPORT_FORMATS = {
+    'text/csv': 'csv',
+    'application/json': 'json',
+    'application/x-ndjson': 'ndjson',
+}
+
+READ_SIZE = 64 * 1024
+
+
+class ImportFormatError(Exception):
+    """The file cannot be parsed any further."""
+
+
+def detect_format(content_type='', filename=''):
+    """Guess the import format from a content type or file name."""
+    content_type = content_type.split(';')[0].strip().lower()
+    if content_type in IMPORT_FORMATS:
+        return IMPORT_FORMATS[content_type]
+    extension = filename.rsplit('.', 1)[-1].lower() if '.' in filename else ''
+    if extension in ('csv', 'json', 'ndjson'):
+        return extension
+    return None
+
+
+def _text(stream):
+    """Decode a binary stream as UTF-8 (with or without a BOM) without reading it all."""
+    if isinstance(stream, io.TextIOBase):
+        return stream
+    return codecs.getreader('utf-8-sig')(stream)
+
+
+def iter_csv_rows(stream):
+    """Yield a dict per CSV data row, keyed by the lower-cased header."""
+    reader = csv.reader(_text(stream))
+    header = next(reader, None)
+    if header is None:
+        return
+    columns = [column.strip().lower() for column in header]
+    for values in reader:
+        if not any(value.strip() for value in values):
+            continue
+        # Empty cells mean "not given", like a missing JSON key
+        yield {column: value.strip() for column, value in zip(columns, values) if value.strip()}
+
+
+def iter_ndjson_rows(stream):
+    """Yield an object per non-blank line."""
+    for number, line in enumerate(_text(stream), start=1):
+        if not line.strip():
+            continue
+        try:
+            yield json.loads(line)
+        except ValueError as exc:
+            raise ImportFormatError(f'Line {number}: {exc}')
+
+
+def iter_json_rows(stream):
+    """
+    Yield the elements of a top-level JSON array.
+
+    Elements are decoded as soon as they are complete, so memory use is
+    bounded by the largest element, not the file.
+    """
+    decoder = json.JSONDecoder()
+    text = _text(stream)
+    buffer = ''
+    position = 0
+    started = False
+    exhausted = False
+    count = 0
+
+    while True:
+        # Skip whitespace and separators, reading more input as needed
+        while True:
+            while position < len(buffer) and buffer[position] in ' \t\r\n':
+                position += 1
+            if position < len(buffer) or exhausted:
+                break
+            chunk = text.read(READ_SIZE)
+            buffer, position = buffer[position:] + chunk, 0
+            exhausted = not chunk
+
+        if position >= len(buffer):
+            raise ImportFormatError('Unexpected end of JSON input.')
+        character = buffer[position]
+        if not started:
+            if character != '[':
+                raise ImportFormatError('Expected a JSON array of events.')
+            started = True
+            position += 1
+            continue
+        if character == ']':
+            return
+        if character == ',':
+            position += 1
+            continue
+
+        while True:
+            try:
+                row, end = decoder.raw_decode(buffer, position)
+                # A number at the end of the buffer may continue in the next chunk
+                if end < len(buffer) or exhausted:
+                    break
+            except ValueError:
+                if exhausted:
+                    raise ImportFormatError(f'Invalid JSON after row {count}.')
+            chunk = text.read(READ_SIZE)
+            buffer, position = buffer[position:] + chunk, 0
+            exhausted = not chunk
+        position = end
+        count += 1
+        yield row
+
+
+PARSERS = {
+    'csv': iter_csv_rows,
+    'json': iter_json_rows,
+    'ndjson': iter_ndjson_rows,
+}
+
+
+def batches(rows, size):
+    """
+    Group ``rows`` into lists of ``(row_number, row)`` pairs.
+
+    Parse errors end the iteration with ``ImportFormatError``, after the
+    rows read before them have been yielded.
+    """
+    batch = []
+    try:
+        for number, row in enumerate(rows, start=1):
+            batch.append((number, row))
+            if len(batch) == size:
+                yield batch
+                batch = []
+    except (csv.Error, UnicodeDecodeError) as exc:
+        # The rows before the damage are still imported
+        if batch:
+            yield batch
+        raise ImportFormatError(str(exc))
+    except ImportFormatError:
+        if batch:
+            yield batch
+        raise
+    if batch:
+        yield batch
+
+
+def get_import_stream(request):
+    """
+    Return ``(stream, filename, content_type)`` for an import request.
+
+    The file is either the ``file`` field of a multipart upload (which
+    Django spools to disk) or the raw request body, read as it arrives.
+    Returns None for a multipart request without a file.
+    """
+    if request.content_type.startswith('multipart/'):
+        upload = request.FILES.get('file')
+        if upload is None:
+            return None
+        return upload, upload.name, upload.content_type
+    return request.stream or io.BytesIO(), '', request.content_type
@@ -0,0 +1,203 @@
+"""
+HTTP load generation for the server benchmarks.
+
+``serve()`` starts the project under gunicorn in a subprocess with a
+throwaway settings module layered over the current one, and ``run_load()``
+drives it from client processes that each hold a share of the keep-alive
+connections open and send requests back to back. The client speaks just
+enough HTTP/1.1 to read the API's responses, so it needs no extra
+dependencies.
+"""
+
+import asyncio
+import multiprocessing
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.core.management.base import CommandError
+from django.db import connections
+
+HOST = '127.0.0.1'
+
+SETTINGS_MODULE = 'loadtest_server_settings'
+
+
+def build_request(method, path, body='', token=None):
+    """Encode one HTTP/1.1 request for ``run_load``."""
+    lines = [f'{method} {path} HTTP/1.1', f'Host: {HOST}', 'Accept: application/json']
+    if token:
+        lines.append(f'Authorization: Bearer {token}')
+    if body:
+        lines += ['Content-Type: application/json', f'Content-Length: {len(body.encode())}']
+    return ('\r\n'.join(lines) + '\r\n\r\n' + body).encode()
+
+
+@contextmanager
+def serve(app, port, gunicorn_args=(), overrides=None, environment=None, settings_module=None):
+    """
+    Run ``app`` under gunicorn for the duration of the block.
+
+    ``overrides`` maps setting names to values written into a settings
+    module that star-imports ``settings_module`` (by default the current
+    one); ``environment`` adds variables to the server's environment.
+    """
+    base = settings_module or os.environ['DJANGO_SETTINGS_MODULE']
+    lines = [f'from {base} import *', f'ALLOWED_HOSTS = [{HOST!r}]']
+    lines += [f'{name} = {value!r}' for name, value in (overrides or {}).items()]
+
+    with tempfile.TemporaryDirectory() as directory:
+        with open(os.path.join(directory, f'{SETTINGS_MODULE}.py'), 'w') as handle:
+            handle.write('\n'.join(lines) + '\n')
+        # An empty config keeps gunicorn.conf.py out; the caller chooses the profile
+        config = os.path.join(directory, 'gunicorn_benchmark.conf.py')
+        open(config, 'w').close()
+
+        command = [
+            sys.executable, '-m', 'gunicorn', app,
+            '--config', config,
+            '--bind', f'{HOST}:{port}',
+            '--keep-alive', '75',
+            '--backlog', '4096',
+            '--log-level', 'warning',
+            *gunicorn_args,
+        ]
+        env = dict(
+            os.environ,
+            **(environment or {}),
+            DJANGO_SETTINGS_MODULE=SETTINGS_MODULE,
+            PYTHONPATH=os.pathsep.join([directory, str(settings.BASE_DIR), os.environ.get('PYTHONPATH', '')]),
+        )
+        # The server and the client processes open their own connections
+        connections.close_all()
+        process = subprocess.Popen(command, cwd=settings.BASE_DIR, env=env)
+        try:
+            wait_for_port(port, process)
+            yield process
+        finally:
+            process.terminate()
+            process.wait(timeout=30)
+
+
+def wait_for_port(port, process, timeout=60):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise CommandError('The server exited during startup.')
+        try:
+            socket.create_connection((HOST, port), timeout=1).close()
+            return
+        except OSError:
+            time.sleep(0.2)
+    raise CommandError('The server did not start listening in time.')
+
+
+def run_load(requests, port, connections, duration, client_processes=1):
+    """
+    Cycle through ``requests`` on ``connections`` connections for
+    ``duration`` seconds and return request count, req/s, p50/p99 latency
+    in milliseconds and the number of errors.
+    """
+    processes = max(1, min(client_processes, connections))
+    shares = [connections // processes] * processes
+    for index in range(connections % processes):
+        shares[index] += 1
+
+    arguments = [(requests, share, port, duration, index) for index, share in enumerate(shares)]
+    # Forked clients only run the asyncio loop below, never the ORM
+    with multiprocessing.get_context('fork').Pool(processes) as pool:
+        outputs = pool.starmap(_client_process, arguments)
+
+    latencies = sorted(latency for timings, _ in outputs for latency in timings)
+    errors = sum(errors for _, errors in outputs)
+    if not latencies:
+        return {'requests': 0, 'rps': 0, 'p50': 0, 'p99': 0, 'errors': errors}
+    return {
+        'requests': len(latencies),
+        'rps': len(latencies) / duration,
+        'p50': statistics.median(latencies) * 1000,
+        'p99': latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000,
+        'errors': errors,
+    }
+
+
+def _client_process(requests, connections, port, duration, offset):
+    return asyncio.run(_client(requests, connections, port, duration, offset))
+
+
+async def _client(requests, connections, port, duration, offset):
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + duration
+    latencies = []
+    errors = [0]
+
+    async def connection(number):
+        reader = writer = None
+        index = number
+        while loop.time() < deadline:
+            try:
+                if writer is None:
+                    reader, writer = await asyncio.open_connection(HOST, port)
+                started = time.perf_counter()
+                writer.write(requests[index % len(requests)])
+                await writer.drain()
+                status, keep_alive = await _read_response(reader)
+                latencies.append(time.perf_counter() - started)
+                if status >= 500 or status in (401, 403, 404):
+                    errors[0] += 1
+                if not keep_alive:
+                    writer.close()
+                    writer = None
+            except (OSError, asyncio.IncompleteReadError, ValueError):
+                errors[0] += 1
+                if writer is not None:
+                    writer.close()
+                writer = None
+                await asyncio.sleep(0.05)
+            index += connections
+        if writer is not None:
+            writer.close()
+
+    await asyncio.gather(*(connection(offset * connections + number) for number in range(connections)))
+    return latencies, errors[0]
+
+
+async def _read_response(reader):
+    """Read one HTTP/1.1 response; return its status and whether the connection stays open."""
+    status_line = await reader.readuntil(b'\r\n')
+    status = int(status_line.split()[1])
+    headers = {}
+    while True:
+        line = await reader.readuntil(b'\r\n')
+        if line == b'\r\n':
+            break
+        name, _, value = line.decode('latin-1').partition(':')
+        headers[name.strip().lower()] = value.strip()
+
+    if headers.get('transfer-encoding', '').lower() == 'chunked':
+        while True:
+            size = int((await reader.readuntil(b'\r\n')).split(b';')[0], 16)
+            await reader.readexactly(size + 2)
+            if size == 0:
+                break
+    else:
+        await reader.readexactly(int(headers.get('content-length', 0)))
+    return status, headers.get('connection', '').lower() != 'close'
+
+
+def format_results(rows, label='server'):
+    """Render result rows from ``run_load`` (plus ``label`` and ``endpoint``) as a table."""
+    lines = [f"{label:<26} {'endpoint':<8} {'requests':>9} {'req/s':>8} "
+             f"{'p50 ms':>8} {'p99 ms':>8} {'errors':>7}"]
+    for row in rows:
+        lines.append(
+            f"{row[label]:<26} {row['endpoint']:<8} {row['requests']:>9} {row['rps']:>8.0f} "
+            f"{row['p50']:>8.1f} {row['p99']:>8.1f} {row['errors']:>7}"
+        )
+    return '\n'.join(lines)
@@ -0,0 +1,205 @@
+"""
+Pagination classes shared by the API apps.
+"""
+
+import base64
+import json
+from collections import OrderedDict
+
+from django.core.exceptions import ValidationError
+from django.core.paginator import InvalidPage
+from django.db.models import Q
+from django.utils.translation import gettext_lazy as _
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    Keyset (seek) pagination over ``(ordering_field, id)``.
+
+    Every page is a single range scan on the matching composite index, with
+    no OFFSET and no COUNT(*), so page 1000 costs the same as page 1.
+    """
+
+    ordering_field = None
+    page_size = api_settings.PAGE_SIZE
+    cursor_query_param = 'cursor'
+    invalid_cursor_message = _('Invalid cursor')
+
+    def __init__(self, ordering_field=None):
+        if ordering_field is not None:
+            self.ordering_field = ordering_field
+
+    def paginate_queryset(self, queryset, request, view=None):
+        queryset = self.get_page_queryset(queryset, request)
+        return self.set_page(list(queryset[:self.page_size + 1]))
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        queryset = self.get_page_queryset(queryset, request)
+        return self.set_page([row async for row in queryset[:self.page_size + 1]])
+
+    def get_page_queryset(self, queryset, request):
+        """Order and filter ``queryset`` to start at the request's cursor."""
+        self.base_url = request.build_absolute_uri()
+        field = self.ordering_field.lstrip('-')
+        descending = self.ordering_field.startswith('-')
+
+        cursor = self.decode_cursor(request, queryset.model._meta.get_field(field))
+        reverse = self.reverse = cursor is not None and cursor[2]
+        self.has_cursor = cursor is not None
+        self.field = field
+
+        # Walking backwards means scanning the index in the opposite direction
+        scan_descending = descending != reverse
+        prefix = '-' if scan_descending else ''
+        queryset = queryset.order_by(f'{prefix}{field}', f'{prefix}id')
+
+        if cursor is not None:
+            value, pk = cursor[:2]
+            lookup = 'lt' if scan_descending else 'gt'
+            queryset = queryset.filter(
+                Q(**{f'{field}__{lookup}': value}) |
+                Q(**{field: value, f'id__{lookup}': pk})
+            )
+
+        return queryset
+
+    def set_page(self, rows):
+        """Trim the look-ahead row off ``rows`` and record the page's links."""
+        has_more = len(rows) > self.page_size
+        rows = rows[:self.page_size]
+        if self.reverse:
+            rows.reverse()
+            self.has_next, self.has_previous = True, has_more
+        else:
+            self.has_next, self.has_previous = has_more, self.has_cursor
+
+        self.page = rows
+        return rows
+
+    def get_paginated_response(self, data):
+        return Response(OrderedDict([
+            ('next', self.get_next_link()),
+            ('previous', self.get_previous_link()),
+            ('results', data),
+        ]))
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'properties': {
+                'next': {'type': 'string', 'nullable': True},
+                'previous': {'type': 'string', 'nullable': True},
+                'results': schema,
+            },
+        }
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous or not self.page:
+            return None
+        return self.encode_cursor(self.page[0], reverse=True)
+
+    def encode_cursor(self, row, reverse):
+        value = getattr(row, self.field)
+        if hasattr(value, 'isoformat'):
+            value = value.isoformat()
+        token = json.dumps([value, row.pk, int(reverse)], separators=(',', ':'))
+        encoded = base64.urlsafe_b64encode(token.encode()).decode()
+        return replace_query_param(self.base_url, self.cursor_query_param, encoded)
+
+    def decode_cursor(self, request, model_field):
+        """Return ``(value, pk, reverse)`` from the request, or None for the first page."""
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            value, pk, reverse = json.loads(base64.urlsafe_b64decode(encoded.encode()))
+            return model_field.to_python(value), int(pk), bool(reverse)
+        except (TypeError, ValueError, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+
+
+class SelectablePagination(BasePagination):
+    """
+    Page-number pagination by default, keyset pagination on request.
+
+    Clients opt in with ``?pagination=keyset``; the ``next``/``previous``
+    links keep the mode via their ``cursor`` parameter. Keyset pages are
+    always ordered by ``keyset_ordering`` and skip the total count.
+    """
+
+    keyset_ordering = None
+    mode_query_param = 'pagination'
+
+    def __init__(self):
+        self.paginator = PageNumberPagination()
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.select_paginator(request)
+        return self.paginator.paginate_queryset(queryset, request, view)
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        """Async version of ``paginate_queryset`` that reads through the async ORM."""
+        self.select_paginator(request)
+        if isinstance(self.paginator, KeysetPagination):
+            return await self.paginator.apaginate_queryset(queryset, request, view)
+
+        paginator = self.paginator
+        page_size = paginator.get_page_size(request)
+        if not page_size:
+            return None
+
+        django_paginator = paginator.django_paginator_class(queryset, page_size)
+        # Count up front so the Paginator never evaluates the queryset itself
+        django_paginator.count = await queryset.acount()
+        page_number = paginator.get_page_number(request, django_paginator)
+        try:
+            paginator.page = django_paginator.page(page_number)
+        except InvalidPage as exc:
+            msg = paginator.invalid_page_message.format(page_number=page_number, message=str(exc))
+            raise NotFound(msg)
+        paginator.page.object_list = [row async for row in paginator.page.object_list]
+
+        if django_paginator.num_pages > 1 and paginator.template is not None:
+            paginator.display_page_controls = True
+        paginator.request = request
+        return list(paginator.page)
+
+    def select_paginator(self, request):
+        keyset = KeysetPagination(self.keyset_ordering)
+        if (request.query_params.get(self.mode_query_param) == 'keyset' or
+                keyset.cursor_query_param in request.query_params):
+            self.paginator = keyset
+
+    def get_paginated_response(self, data):
+        return self.paginator.get_paginated_response(data)
+
+    def get_paginated_response_schema(self, schema):
+        return self.paginator.get_paginated_response_schema(schema)
+
+
+class EventPagination(SelectablePagination):
+    """Pagination for public event lists (soonest first)."""
+
+    keyset_ordering = 'start_time'
+
+
+class AdminEventPagination(SelectablePagination):
+    """Pagination for admin event lists (latest start first)."""
+
+    keyset_ordering = '-start_time'
+
+
+class RegistrationPagination(SelectablePagination):
+    """Pagination for registration lists (newest first)."""
+
+    keyset_ordering = '-created_at'
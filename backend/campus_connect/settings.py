@@ -49,6 +49,8 @@ INSTALLED_APPS = [
     'users',
     'events',
     'registrations',
+    'analytics',
+    'taskqueue',
 ]
 
 MIDDLEWARE = [
@@ -94,9 +96,25 @@ DATABASES = {
         'PASSWORD': os.environ.get('POSTGRES_PASSWORD', 'postgres'),
         'HOST': os.environ.get('POSTGRES_HOST', 'db'),
         'PORT': os.environ.get('POSTGRES_PORT', '5432'),
+        # Seconds a connection is reused across requests; 0 closes it
+        # after every request
+        'CONN_MAX_AGE': int(os.environ.get('POSTGRES_CONN_MAX_AGE', 0)),
+        # Ping reused connections at the start of each request so a
+        # database restart does not surface as a failed request
+        'CONN_HEALTH_CHECKS': os.environ.get('POSTGRES_CONN_HEALTH_CHECKS', 'False') == 'True',
+        'OPTIONS': {
+            'connect_timeout': int(os.environ.get('POSTGRES_CONNECT_TIMEOUT', 10)),
+        },
     }
 }
 
+# Connection pooling is done by PgBouncer in front of Postgres (Django 4.2
+# has no built-in pool). In transaction pooling mode consecutive queries can
+# run on different server connections, which breaks server-side cursors.
+POSTGRES_POOLER = os.environ.get('POSTGRES_POOLER', '')
+if POSTGRES_POOLER == 'pgbouncer':
+    DATABASES['default']['DISABLE_SERVER_SIDE_CURSORS'] = True
+
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
 
@@ -155,11 +173,12 @@ ACCOUNT_EMAIL_REQUIRED = True
 ACCOUNT_USERNAME_REQUIRED = False
 ACCOUNT_AUTHENTICATION_METHOD = 'email'
 ACCOUNT_EMAIL_VERIFICATION = 'mandatory'
+ACCOUNT_ADAPTER = 'users.adapter.AccountAdapter'
 
 # Django REST Framework settings
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'users.authentication.ClaimsJWTAuthentication',
     ),
     'DEFAULT_PERMISSION_CLASSES': (
         'rest_framework.permissions.IsAuthenticated',
@@ -168,6 +187,82 @@ REST_FRAMEWORK = {
     'PAGE_SIZE': 10,
 }
 
+# Cache settings. Versioned response caches are invalidated through the
+# cache itself, so deployments running several processes need the shared
+# Redis backend; the file and memory backends suit development and tests.
+if os.environ.get('REDIS_URL'):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': os.environ.get('REDIS_URL'),
+        }
+    }
+elif os.environ.get('CACHE_DIR'):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': os.environ.get('CACHE_DIR'),
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+
+# Live updates (check-ins, capacity) fan out through Redis when it is
+# configured, so every worker's subscribers see every message
+LIVE_BROKER = {
+    'BACKEND': (
+        'campus_connect.broker.RedisBroker' if os.environ.get('REDIS_URL')
+        else 'campus_connect.broker.InProcessBroker'
+    ),
+    'OPTIONS': {'url': os.environ.get('REDIS_URL')} if os.environ.get('REDIS_URL') else {},
+}
+
+# Background tasks (email, exports, image and QR rendering). The database
+# backend needs a worker (manage.py run_tasks); the thread backend runs
+# them inside the web process and loses queued tasks on restart.
+TASK_QUEUE = {
+    'BACKEND': (
+        'taskqueue.backends.ThreadBackend' if os.environ.get('TASK_QUEUE_BACKEND') == 'thread'
+        else 'taskqueue.backends.DatabaseBackend'
+    ),
+    'OPTIONS': {},
+}
+
+# Event check-in QR codes. 'signed' codes are HMAC tokens that change every
+# EVENT_QR_TOKEN_STEP seconds, stay accepted for EVENT_QR_TOKEN_WINDOWS
+# steps after that, and are checked without a query; 'uuid' stores random
+# codes that the scheduler rotates. Scans of UUID codes work in both modes.
+EVENT_QR_CODE_MODE = os.environ.get('EVENT_QR_CODE_MODE', 'signed')
+EVENT_QR_TOKEN_STEP = int(os.environ.get('EVENT_QR_TOKEN_STEP', 300))
+EVENT_QR_TOKEN_WINDOWS = int(os.environ.get('EVENT_QR_TOKEN_WINDOWS', 1))
+
+# Hours before an event starts that registered users are reminded of it
+EVENT_REMINDER_HOURS = int(os.environ.get('EVENT_REMINDER_HOURS', 24))
+
+# Seconds a live update stream stays open before the client reconnects
+LIVE_STREAM_MAX_AGE = int(os.environ.get('LIVE_STREAM_MAX_AGE', 300))
+
+# Seconds a live stream ticket can be used to open a stream
+LIVE_TICKET_MAX_AGE = int(os.environ.get('LIVE_TICKET_MAX_AGE', 60))
+
+# Events whose attendance codes each process keeps in memory, least
+# recently used dropped first
+ATTENDANCE_CODE_SNAPSHOTS = int(os.environ.get('ATTENDANCE_CODE_SNAPSHOTS', 256))
+
+# Seconds the admin dashboard statistics are cached for
+STATS_CACHE_TIMEOUT = int(os.environ.get('STATS_CACHE_TIMEOUT', 30))
+
+# Upper bound, in seconds, on how long public event responses are cached;
+# writes invalidate them sooner
+API_CACHE_TIMEOUT = int(os.environ.get('API_CACHE_TIMEOUT', 60))
+
+# Processes hashing passwords during bulk user provisioning through the API
+PROVISIONING_HASH_WORKERS = int(os.environ.get('PROVISIONING_HASH_WORKERS', 1))
+
 # JWT settings
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(minutes=60),
@@ -182,8 +277,14 @@ SIMPLE_JWT = {
     'USER_ID_CLAIM': 'user_id',
     'AUTH_TOKEN_CLASSES': ('rest_framework_simplejwt.tokens.AccessToken',),
     'TOKEN_TYPE_CLAIM': 'token_type',
+    'TOKEN_OBTAIN_SERIALIZER': 'users.serializers.ClaimsTokenObtainPairSerializer',
+    'TOKEN_REFRESH_SERIALIZER': 'users.serializers.ClaimsTokenRefreshSerializer',
 }
 
+# Seconds the JWT denylist is cached for; revocations clear it immediately
+# in shared caches
+JWT_DENYLIST_CACHE_TIMEOUT = int(os.environ.get('JWT_DENYLIST_CACHE_TIMEOUT', 300))
+
 # CORS settings
 CORS_ALLOWED_ORIGINS = os.environ.get(
     'CORS_ALLOWED_ORIGINS', 
@@ -0,0 +1,63 @@
+"""
+Production settings for campus_connect.
+
+Layered over the base settings, which read everything from the
+environment; this module only changes the defaults a production
+deployment wants. Select it with
+``DJANGO_SETTINGS_MODULE=campus_connect.settings_production``.
+"""
+
+import os
+import warnings
+
+from django.core.exceptions import ImproperlyConfigured
+
+from .settings import *  # noqa: F401,F403
+from .settings import CACHES, DATABASES, LIVE_BROKER
+
+# Web workers, the task worker and the scheduler share response cache
+# versions, the token denylist and attendance code versions through the
+# cache. A per-process cache would let each worker serve what another has
+# invalidated, so production needs Redis (REDIS_URL) or a cache directory
+# shared by every process (CACHE_DIR).
+if CACHES['default']['BACKEND'] == 'django.core.cache.backends.locmem.LocMemCache':
+    raise ImproperlyConfigured(
+        'Production needs a cache shared by every process: set REDIS_URL (or CACHE_DIR on a single host).'
+    )
+
+# Without Redis, live updates only reach streams opened on the worker that
+# published them
+if LIVE_BROKER['BACKEND'] == 'campus_connect.broker.InProcessBroker':
+    warnings.warn(
+        'REDIS_URL is not set: live updates only reach clients connected to the same worker.',
+        RuntimeWarning,
+    )
+
+# The web server (entrypoint.sh) runs the ASGI application, which runs each
+# request's sync code in a thread of its own. Django's connections belong
+# to a thread, so one kept open for reuse is never reused and stays open
+# until the server closes it: web processes close theirs after every
+# request, and PgBouncer keeps the server connections warm. The task worker
+# and scheduler reuse one connection per thread, so they keep theirs open,
+# checking them before reuse.
+ASGI_SERVER = os.environ.get('ASGI_SERVER', 'False') == 'True'
+DATABASES['default']['CONN_MAX_AGE'] = 0 if ASGI_SERVER else int(os.environ.get('POSTGRES_CONN_MAX_AGE', 60))
+DATABASES['default']['CONN_HEALTH_CHECKS'] = os.environ.get('POSTGRES_CONN_HEALTH_CHECKS', 'True') == 'True'
+
+# TLS is terminated by the load balancer in front of gunicorn
+SECURE_PROXY_SSL_HEADER = ('HTTP_X_FORWARDED_PROTO', 'https')
+SECURE_SSL_REDIRECT = os.environ.get('SECURE_SSL_REDIRECT', 'False') == 'True'
+SESSION_COOKIE_SECURE = True
+CSRF_COOKIE_SECURE = True
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler'},
+    },
+    'root': {
+        'handlers': ['console'],
+        'level': os.environ.get('LOG_LEVEL', 'INFO'),
+    },
+}
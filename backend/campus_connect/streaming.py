@@ -0,0 +1,60 @@
+"""
+Streaming responses that stream under both WSGI and ASGI, and helpers
+for generating their content.
+
+Under ASGI, Django reads a synchronous ``StreamingHttpResponse`` iterator
+to the end with ``sync_to_async(list)`` before sending any of it, so a
+large export is held in memory and the client sees nothing until it is
+complete. ``streaming_response`` hands ASGI an async iterator instead,
+which pulls a batch of chunks at a time from the sync iterator in the
+request's thread (where its database connection lives) and sends each
+batch as soon as it is ready.
+"""
+
+from itertools import islice
+
+from asgiref.sync import sync_to_async
+from django.core.handlers.asgi import ASGIRequest
+from django.http import StreamingHttpResponse
+
+# Chunks pulled from the sync iterator per thread hop
+BATCH_SIZE = 50
+
+
+class Echo:
+    """
+    File-like object that hands back what is written to it, so
+    ``csv.writer(Echo()).writerow()`` returns the formatted line.
+    """
+
+    def write(self, value):
+        return value
+
+
+async def iterate_async(iterator, batch_size=BATCH_SIZE):
+    """Yield from a sync iterator without blocking the event loop."""
+    iterator = iter(iterator)
+    next_batch = sync_to_async(lambda: list(islice(iterator, batch_size)), thread_sensitive=True)
+    try:
+        while True:
+            batch = await next_batch()
+            if not batch:
+                return
+            for chunk in batch:
+                yield chunk
+    finally:
+        # Runs the generator's cleanup (server-side cursors, worker pools)
+        # when the client disconnects part way through
+        close = getattr(iterator, 'close', None)
+        if close is not None:
+            await sync_to_async(close, thread_sensitive=True)()
+
+
+def streaming_response(request, streaming_content, **kwargs):
+    """
+    Return a ``StreamingHttpResponse`` for a sync iterator that streams
+    under the server the request came in through.
+    """
+    if isinstance(getattr(request, '_request', request), ASGIRequest):
+        streaming_content = iterate_async(streaming_content)
+    return StreamingHttpResponse(streaming_content, **kwargs)
@@ -25,6 +25,8 @@ urlpatterns = [
         # App endpoints
         path('events/', include('events.urls')),
         path('registrations/', include('registrations.urls')),
+        path('', include('analytics.urls')),
+        path('tasks/', include('taskqueue.urls')),
     ])),
     
     # Django AllAuth URLs
@@ -0,0 +1,18 @@
+#!/bin/sh
+# Production entrypoint: prepare the database and static files, then hand
+# the process over to gunicorn (configured by gunicorn.conf.py).
+set -e
+
+export DJANGO_SETTINGS_MODULE="${DJANGO_SETTINGS_MODULE:-campus_connect.settings_production}"
+# Connections are not kept between requests under ASGI (see settings_production)
+export ASGI_SERVER=True
+
+if [ "${RUN_MIGRATIONS:-1}" = "1" ]; then
+    python manage.py migrate --noinput
+fi
+
+if [ "${COLLECT_STATIC:-1}" = "1" ]; then
+    python manage.py collectstatic --noinput
+fi
+
+exec gunicorn campus_connect.asgi:application "$@"
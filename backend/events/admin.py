@@ -10,7 +10,10 @@ class EventAdmin(admin.ModelAdmin):
     list_filter = ('active',)
     search_fields = ('name', 'description', 'location')
     date_hierarchy = 'start_time'
-    readonly_fields = ('created_at', 'updated_at')
+    readonly_fields = (
+        'registered_count', 'checked_in_count', 'cancelled_count',
+        'created_at', 'updated_at'
+    )
     
     fieldsets = (
         (None, {
@@ -22,6 +25,9 @@ class EventAdmin(admin.ModelAdmin):
         ('Settings', {
             'fields': ('capacity', 'active')
         }),
+        ('Registrations', {
+            'fields': ('registered_count', 'checked_in_count', 'cancelled_count')
+        }),
         ('Metadata', {
             'fields': ('created_at', 'updated_at'),
             'classes': ('collapse',)
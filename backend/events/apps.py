@@ -3,4 +3,24 @@ from django.apps import AppConfig
 
 class EventsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
-    name = 'events' 
\ No newline at end of file
+    name = 'events' 
+
+    def ready(self):
+        from django.db.models.signals import post_migrate
+        post_migrate.connect(repair_search_index, sender=self)
+
+
+def repair_search_index(sender, using, **kwargs):
+    """
+    Re-create the SQLite FTS triggers after migrating.
+
+    SQLite migrations rebuild tables by copying them, which silently drops
+    the triggers that keep the full-text index in sync. The index itself is
+    only rebuilt when that happened.
+    """
+    from django.db import connections
+    from .search import install_search_index
+
+    connection = connections[using]
+    if connection.vendor == 'sqlite':
+        install_search_index(connection)
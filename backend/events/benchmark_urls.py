@@ -0,0 +1,77 @@
+"""
+URLconf that serves synchronous versions of the async hot paths.
+
+Only the ``benchmark_servers`` command uses it, to compare the views as
+they were under WSGI with their async versions under ASGI. Every other
+route is the project's own.
+"""
+
+from django.urls import include, path
+from django.utils import timezone
+from rest_framework import generics, permissions, status
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from campus_connect.caching import CachedResponseMixin
+from campus_connect.conditional import ConditionalGetMixin
+from registrations.models import Registration
+from registrations.serializers import AttendanceConfirmSerializer, RegistrationSerializer
+from .views import EventDetailView, EventListView
+
+
+class SyncEventListView(ConditionalGetMixin, CachedResponseMixin, generics.ListAPIView):
+    cache_prefix = EventListView.cache_prefix
+    queryset = EventListView.queryset
+    serializer_class = EventListView.serializer_class
+    filter_backends = EventListView.filter_backends
+    filterset_fields = EventListView.filterset_fields
+    ordering_fields = EventListView.ordering_fields
+    ordering = EventListView.ordering
+    pagination_class = EventListView.pagination_class
+    permission_classes = EventListView.permission_classes
+    get_cache_version_keys = EventListView.get_cache_version_keys
+    get_etag_aggregates = EventListView.get_etag_aggregates
+    
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        upcoming = self.request.query_params.get('upcoming')
+        if upcoming and upcoming.lower() == 'true':
+            queryset = queryset.filter(start_time__gt=timezone.now())
+        return queryset
+
+
+class SyncEventDetailView(ConditionalGetMixin, CachedResponseMixin, generics.RetrieveAPIView):
+    cache_prefix = EventDetailView.cache_prefix
+    queryset = EventDetailView.queryset
+    serializer_class = EventDetailView.serializer_class
+    permission_classes = EventDetailView.permission_classes
+    get_cache_version_keys = EventDetailView.get_cache_version_keys
+    get_etag_aggregates = EventDetailView.get_etag_aggregates
+
+
+class SyncAttendanceConfirmView(APIView):
+    permission_classes = [permissions.IsAuthenticated]
+    
+    def post(self, request):
+        serializer = AttendanceConfirmSerializer(data=request.data, context={'request': request})
+        serializer.is_valid(raise_exception=True)
+        
+        registration, message = Registration.confirm_attendance(
+            event_qr_code=serializer.validated_data['event_qr_code'],
+            user=request.user,
+            attendance_code=serializer.validated_data.get('attendance_code', '')
+        )
+        if not registration:
+            return Response({"detail": message}, status=status.HTTP_400_BAD_REQUEST)
+        return Response({
+            "registration": RegistrationSerializer(registration).data,
+            "message": message
+        })
+
+
+urlpatterns = [
+    path('api/v1/events/', SyncEventListView.as_view()),
+    path('api/v1/events/<int:pk>/', SyncEventDetailView.as_view()),
+    path('api/v1/registrations/confirm-attendance/', SyncAttendanceConfirmView.as_view()),
+    path('', include('campus_connect.urls')),
+]
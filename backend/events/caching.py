@@ -0,0 +1,42 @@
+"""
+Cache versions for public event responses.
+
+Event lists depend on every event, so they share one version; an event's
+detail response has its own. Both are bumped whenever an event or its
+registration counters change.
+"""
+
+from django.db import transaction
+
+from campus_connect.caching import bump_version
+
+LIST_VERSION_KEY = 'events-cache-version'
+
+
+def event_version_key(event_id):
+    return f'events-cache-version:{event_id}'
+
+
+def invalidate_event_cache(event_id=None):
+    """
+    Bump the list version and the event's version once the current
+    transaction commits, so no reader can cache the pre-commit state.
+    """
+    def bump():
+        bump_version(LIST_VERSION_KEY)
+        if event_id is not None:
+            bump_version(event_version_key(event_id))
+    
+    transaction.on_commit(bump)
+
+
+def invalidate_event_caches(event_ids):
+    """Like ``invalidate_event_cache`` for many events, bumping the list version once."""
+    event_ids = list(event_ids)
+    
+    def bump():
+        bump_version(LIST_VERSION_KEY)
+        for event_id in event_ids:
+            bump_version(event_version_key(event_id))
+    
+    transaction.on_commit(bump)
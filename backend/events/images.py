@@ -0,0 +1,136 @@
+"""
+Resized variants of event background images.
+
+Uploads are stored as they arrive; the variants are rendered afterwards by
+a background task, once the transaction that saved the event commits, so
+the upload request never waits on decoding and re-encoding. Each variant is
+written as WebP plus a JPEG fallback, and their storage paths are recorded
+in ``Event.image_variants`` together with the original they were rendered
+from. Until they exist, serializers fall back to the original.
+"""
+
+import io
+import os
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+from PIL import Image, ImageOps
+
+# Name -> (width, height, crop). Cropped variants fill the box exactly;
+# the others only shrink to fit inside it.
+IMAGE_VARIANTS = {
+    'thumbnail': (320, 180, True),
+    'card': (640, 360, True),
+    'hero': (1600, 900, False),
+}
+
+# Encoding -> (Pillow format, save options)
+IMAGE_ENCODINGS = {
+    'webp': ('WEBP', {'quality': 80, 'method': 4}),
+    'jpeg': ('JPEG', {'quality': 82, 'optimize': True, 'progressive': True}),
+}
+
+
+def variant_path(source, name, encoding):
+    """Storage path of one variant of the original at ``source``."""
+    directory, filename = os.path.split(source)
+    stem = os.path.splitext(filename)[0]
+    return os.path.join(directory, 'variants', f'{stem}-{name}.{encoding}')
+
+
+def render_variants(image):
+    """Yield ``(name, encoding, bytes)`` for every variant of a Pillow image."""
+    image = ImageOps.exif_transpose(image)
+    if image.mode not in ('RGB', 'RGBA'):
+        image = image.convert('RGBA' if 'transparency' in image.info or image.mode in ('LA', 'PA') else 'RGB')
+
+    for name, (width, height, crop) in IMAGE_VARIANTS.items():
+        if crop:
+            resized = ImageOps.fit(image, (width, height), Image.LANCZOS)
+        else:
+            resized = image.copy()
+            resized.thumbnail((width, height), Image.LANCZOS)
+        for encoding, (image_format, options) in IMAGE_ENCODINGS.items():
+            output = resized
+            if image_format == 'JPEG' and output.mode == 'RGBA':
+                output = Image.new('RGB', resized.size, 'white')
+                output.paste(resized, mask=resized.getchannel('A'))
+            buffer = io.BytesIO()
+            output.save(buffer, format=image_format, **options)
+            yield name, encoding, buffer.getvalue()
+
+
+def generate_image_variants(event_id):
+    """
+    Render and store the variants of an event's current background image,
+    then delete the files of the variants they replace.
+
+    Returns the new ``image_variants`` value, or None if the event is gone
+    or its image changed while rendering (the newer upload has its own run).
+    """
+    from .caching import invalidate_event_cache
+    from .models import Event
+
+    event = Event.objects.filter(pk=event_id).only('background_image', 'image_variants').first()
+    if event is None:
+        return None
+    source = event.background_image.name or ''
+    previous = event.image_variants or {}
+
+    variants = {}
+    if source:
+        with event.background_image.open('rb') as original, Image.open(original) as image:
+            image.draft('RGB', (IMAGE_VARIANTS['hero'][0], IMAGE_VARIANTS['hero'][1]))
+            for name, encoding, content in render_variants(image):
+                path = variant_path(source, name, encoding)
+                if default_storage.exists(path):
+                    default_storage.delete(path)
+                variants.setdefault(name, {})[encoding] = default_storage.save(path, ContentFile(content))
+        variants = {'source': source, 'variants': variants}
+
+    current = Q(background_image=source) if source else Q(background_image='') | Q(background_image__isnull=True)
+    with transaction.atomic():
+        # Only record the variants if the image is still the one rendered
+        updated = Event.objects.filter(current, pk=event_id).update(
+            image_variants=variants, updated_at=timezone.now()
+        )
+        if updated:
+            invalidate_event_cache(event_id)
+
+    stale = _variant_files(variants) if not updated else _variant_files(previous) - _variant_files(variants)
+    for path in stale:
+        default_storage.delete(path)
+    return variants if updated else None
+
+
+def _variant_files(image_variants):
+    return {
+        path
+        for encodings in (image_variants or {}).get('variants', {}).values()
+        for path in encodings.values()
+    }
+
+
+def schedule_image_variants(event_id):
+    """Queue rendering of the event's image variants."""
+    from .tasks import render_image_variants
+
+    render_image_variants.enqueue(event_id)
+
+
+def get_variant_url(event, name, encoding='jpeg'):
+    """
+    URL of one variant of the event's background image; the original's URL
+    while the variants are pending, and None without an image.
+    """
+    if not event.background_image:
+        return None
+    image_variants = event.image_variants or {}
+    if image_variants.get('source') == event.background_image.name:
+        path = image_variants['variants'].get(name, {}).get(encoding)
+        if path:
+            return default_storage.url(path)
+    return event.background_image.url
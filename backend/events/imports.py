@@ -0,0 +1,178 @@
+"""
+Bulk event imports from CSV, JSON and NDJSON.
+
+Files are parsed as a stream, one row at a time, and handled in batches:
+each batch is validated row by row with a single reused
+``EventImportSerializer``, the events it updates are loaded with one query,
+and the valid rows are written with one ``bulk_create``, one ``bulk_update``
+per set of columns the rows set, or one UPDATE for deactivation. Invalid
+rows are reported by their position in the file and do not stop the rest
+of the import, unless it is atomic.
+"""
+
+from collections import defaultdict
+
+from django.db import transaction
+from django.utils import timezone
+from rest_framework import serializers
+
+from campus_connect.imports import PARSERS, ImportFormatError, batches
+from registrations.models import WaitlistEntry
+from .caching import invalidate_event_caches
+from .live import announce_capacity
+from .models import Event
+from .serializers import EventImportSerializer
+
+OPERATIONS = ('create', 'update', 'deactivate')
+
+BATCH_SIZE = 1000
+
+# Errors listed in a result; the count covers all of them
+MAX_REPORTED_ERRORS = 1000
+
+
+def _row_id(row):
+    try:
+        return int(row['id'])
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+class EventImport:
+    """
+    One bulk import run.
+
+    Args:
+        operation: ``create``, ``update`` or ``deactivate``. Update rows
+            carry an ``id`` and the fields to change; deactivate rows only
+            need an ``id``.
+        dry_run: Validate without writing anything
+        atomic: Write nothing unless every row is valid
+        batch_size: Rows validated and written together
+    """
+
+    def __init__(self, operation, dry_run=False, atomic=False, batch_size=BATCH_SIZE):
+        if operation not in OPERATIONS:
+            raise ValueError(f'Unknown import operation: {operation}')
+        self.operation = operation
+        self.dry_run = dry_run
+        self.atomic = atomic
+        self.batch_size = batch_size
+        self.serializer = EventImportSerializer(partial=operation == 'update')
+        self.rows = 0
+        self.written = 0
+        self.error_count = 0
+        self.errors = []
+
+    def run(self, stream, import_format):
+        """Import every row of ``stream`` and return the result summary."""
+        rows = PARSERS[import_format](stream)
+        if self.atomic or self.dry_run:
+            with transaction.atomic():
+                self._run(rows)
+                # A dry run still reports what it would have written
+                if self.dry_run or self.error_count:
+                    transaction.set_rollback(True)
+                if self.atomic and self.error_count:
+                    self.written = 0
+        else:
+            self._run(rows)
+        return self.result()
+
+    def _run(self, rows):
+        try:
+            for batch in batches(rows, self.batch_size):
+                self.rows += len(batch)
+                with transaction.atomic():
+                    getattr(self, f'_{self.operation}')(batch)
+        except ImportFormatError as exc:
+            self.add_error(self.rows + 1, {'non_field_errors': [str(exc)]})
+
+    def result(self):
+        key = {'create': 'created', 'update': 'updated', 'deactivate': 'deactivated'}[self.operation]
+        return {
+            'rows': self.rows,
+            key: self.written,
+            'error_count': self.error_count,
+            'errors': sorted(self.errors, key=lambda error: error['row']),
+            'dry_run': self.dry_run,
+        }
+
+    def add_error(self, row_number, detail):
+        self.error_count += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({'row': row_number, 'errors': detail})
+
+    def validate(self, row_number, row, instance=None):
+        """Validate one row, recording its errors; return the validated data or None."""
+        if not isinstance(row, dict):
+            self.add_error(row_number, {'non_field_errors': ['Expected an object.']})
+            return None
+        self.serializer.instance = instance
+        try:
+            return self.serializer.run_validation(row)
+        except serializers.ValidationError as exc:
+            self.add_error(row_number, exc.detail)
+            return None
+
+    def load_events(self, batch):
+        """Return the batch's events by id, recording rows whose id is missing or unknown."""
+        events = Event.objects.in_bulk({_row_id(row) for _, row in batch if isinstance(row, dict)} - {None})
+        found = []
+        for row_number, row in batch:
+            event = events.get(_row_id(row)) if isinstance(row, dict) else None
+            if event is None:
+                self.add_error(row_number, {'id': ['No event with this id.']})
+            else:
+                found.append((row_number, row, event))
+        return found
+
+    def _create(self, batch):
+        events = []
+        for row_number, row in batch:
+            data = self.validate(row_number, row)
+            if data is not None:
+                events.append(Event(**data))
+        if events:
+            Event.objects.bulk_create(events)
+            invalidate_event_caches([])
+            self.written += len(events)
+
+    def _update(self, batch):
+        now = timezone.now()
+        updated, fields, capacity_changed, capacity_raised = {}, {}, [], []
+        for row_number, row, event in self.load_events(batch):
+            data = self.validate(row_number, row, event)
+            if data is None:
+                continue
+            if 'capacity' in data and data['capacity'] != event.capacity:
+                capacity_changed.append(event.pk)
+            for field, value in data.items():
+                setattr(event, field, value)
+            if event._capacity_raised():
+                capacity_raised.append(event.pk)
+            event.updated_at = now
+            fields.setdefault(event.pk, {'updated_at'}).update(data)
+            updated[event.pk] = event
+        if updated:
+            # Only write the columns each row sets, so concurrent edits to
+            # the others survive: one bulk_update per set of columns
+            groups = defaultdict(list)
+            for event_id, event in updated.items():
+                groups[frozenset(fields[event_id])].append(event)
+            for group_fields, events in groups.items():
+                Event.objects.bulk_update(events, sorted(group_fields))
+            # Hand the new spots to the waitlists
+            for event_id in capacity_raised:
+                WaitlistEntry.promote_all(event_id)
+            invalidate_event_caches(updated)
+            for event_id in capacity_changed:
+                announce_capacity(event_id)
+            self.written += len(updated)
+
+    def _deactivate(self, batch):
+        event_ids = {event.pk for _, _, event in self.load_events(batch)}
+        if event_ids:
+            Event.objects.filter(pk__in=event_ids).update(active=False, updated_at=timezone.now())
+            invalidate_event_caches(event_ids)
+            self.written += len(event_ids)
@@ -0,0 +1,201 @@
+"""
+Live event updates over Server-Sent Events.
+
+Check-ins and capacity changes are published to a per-event channel on the
+broker once their transaction commits, unless nobody is listening;
+``event_feed`` streams a channel to admin clients. The feed is an async
+view and needs the ASGI application.
+
+EventSource cannot send headers, so browsers first fetch a stream ticket
+(``events.views.LiveTicketView``) and pass it in the query string. Tickets are scoped to
+one event's feed and expire within ``LIVE_TICKET_MAX_AGE`` seconds, so the
+copies written to access logs are of no use; JWTs are only accepted in the
+``Authorization`` header.
+"""
+
+import asyncio
+import json
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core import signing
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.http import JsonResponse, StreamingHttpResponse
+from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
+
+from campus_connect.broker import get_broker
+from users.authentication import ClaimsJWTAuthentication
+from .models import Event
+
+# Seconds between keep-alive comments, and before a stream is closed so
+# clients reconnect (EventSource does this on its own)
+HEARTBEAT_INTERVAL = 15
+DEFAULT_STREAM_MAX_AGE = 300
+
+# Seconds a stream ticket can be used to open a feed
+DEFAULT_TICKET_MAX_AGE = 60
+
+TICKET_SALT = 'events.live'
+
+CAPACITY_FIELDS = ('capacity', 'registered_count', 'checked_in_count', 'cancelled_count')
+
+
+def event_channel(event_id):
+    return f'event:{event_id}'
+
+
+def capacity_message(values):
+    """Build a ``capacity`` message from an event's counter values."""
+    taken = values['registered_count'] + values['checked_in_count']
+    capacity = values['capacity']
+    return {
+        'type': 'capacity',
+        'event_id': values['id'],
+        **{field: values[field] for field in CAPACITY_FIELDS},
+        'available_spots': None if capacity is None else max(0, capacity - taken),
+        'is_full': capacity is not None and taken >= capacity,
+    }
+
+
+def announce_capacity(event_id):
+    """Publish the event's counters once the current transaction commits."""
+    def publish():
+        # Checked at commit time: a feed opened before then reads its
+        # snapshot after subscribing, so it cannot miss this change
+        broker = get_broker()
+        if not broker.has_subscribers(event_channel(event_id)):
+            return
+        values = Event.objects.filter(pk=event_id).values('id', *CAPACITY_FIELDS).first()
+        if values is not None:
+            broker.publish(event_channel(event_id), capacity_message(values))
+    
+    transaction.on_commit(publish)
+
+
+def announce_check_ins(event_id, registrations):
+    """Publish check-ins once the current transaction commits."""
+    check_ins = [
+        {
+            'registration_id': registration.pk,
+            'user_id': registration.admin_user_id,
+            'checked_in_at': registration.checked_in_at,
+        }
+        for registration in registrations
+    ]
+    
+    def publish():
+        broker = get_broker()
+        if broker.has_subscribers(event_channel(event_id)):
+            broker.publish(
+                event_channel(event_id), {'type': 'check_in', 'event_id': event_id, 'check_ins': check_ins}
+            )
+    
+    transaction.on_commit(publish)
+
+
+def format_sse(message):
+    data = json.dumps(message, cls=DjangoJSONEncoder)
+    return f"event: {message['type']}\ndata: {data}\n\n"
+
+
+def ticket_max_age():
+    return getattr(settings, 'LIVE_TICKET_MAX_AGE', DEFAULT_TICKET_MAX_AGE)
+
+
+def issue_ticket(user, event_id):
+    """A ticket that opens ``event_id``'s feed as ``user`` for a short while."""
+    return signing.dumps({'user': user.pk, 'event': event_id}, salt=TICKET_SALT)
+
+
+async def _authenticate(request, event_id):
+    """
+    Resolve the user from a stream ticket for ``event_id``, or from a JWT
+    access token in the ``Authorization`` header.
+    """
+    ticket = request.GET.get('ticket')
+    if ticket:
+        try:
+            claims = signing.loads(ticket, salt=TICKET_SALT, max_age=ticket_max_age())
+        except signing.BadSignature:
+            return None
+        if claims.get('event') != event_id:
+            return None
+        return await get_user_model().objects.filter(pk=claims.get('user'), is_active=True).afirst()
+    
+    authentication = ClaimsJWTAuthentication()
+    header = authentication.get_header(request)
+    raw_token = authentication.get_raw_token(header) if header else None
+    if not raw_token:
+        return None
+    
+    def resolve():
+        # The denylist check may read the database
+        return authentication.get_user(authentication.get_validated_token(raw_token))
+    
+    try:
+        return await sync_to_async(resolve)()
+    except (InvalidToken, TokenError):
+        return None
+
+
+async def _capacity_snapshot(event_id):
+    values = await Event.objects.filter(pk=event_id).values('id', *CAPACITY_FIELDS).afirst()
+    return capacity_message(values) if values is not None else None
+
+
+async def _stream(event_id):
+    broker = get_broker()
+    # Subscribe before reading the snapshot so no change falls in between
+    subscription = broker.subscribe(event_channel(event_id))
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + getattr(settings, 'LIVE_STREAM_MAX_AGE', DEFAULT_STREAM_MAX_AGE)
+    try:
+        snapshot = await _capacity_snapshot(event_id)
+        if snapshot is None:
+            return
+        yield 'retry: 3000\n\n'
+        yield format_sse(snapshot)
+        while True:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            try:
+                message = await asyncio.wait_for(
+                    subscription.get(), timeout=min(HEARTBEAT_INTERVAL, remaining)
+                )
+            except asyncio.TimeoutError:
+                yield ': keep-alive\n\n'
+                continue
+            if subscription.overflowed:
+                # Messages were dropped; the client must reload its state
+                yield format_sse({'type': 'resync'})
+                break
+            yield format_sse(message)
+    finally:
+        broker.unsubscribe(event_channel(event_id), subscription)
+
+
+async def event_feed(request, pk):
+    """
+    Stream an event's check-ins and capacity changes (admin only).
+    
+    The first message is a ``capacity`` snapshot, followed by ``check_in``
+    and ``capacity`` messages as they happen.
+    """
+    user = await _authenticate(request, pk)
+    if user is None:
+        return JsonResponse({"detail": "Authentication credentials were not provided."}, status=401)
+    if user.role != 'admin':
+        return JsonResponse({"detail": "You do not have permission to perform this action."}, status=403)
+    
+    if not await Event.objects.filter(pk=pk).aexists():
+        return JsonResponse({"detail": "Not found."}, status=404)
+    
+    response = StreamingHttpResponse(_stream(pk), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    # Stop nginx from buffering the stream
+    response['X-Accel-Buffering'] = 'no'
+    return response
+
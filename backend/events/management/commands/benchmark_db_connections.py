@@ -0,0 +1,89 @@
+import copy
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from campus_connect.loadtest import build_request, format_results, run_load, serve
+from events.models import Event
+
+
+class Command(BaseCommand):
+    """
+    Measure events list throughput under each database connection profile.
+
+    The API runs under gunicorn (uvicorn workers, like production) once per
+    profile: a new connection for every request, persistent connections
+    with health checks, and, given ``--pgbouncer-host``, a new connection to
+    PgBouncer for every request, which is what production runs. Under ASGI
+    a persistent connection is left behind with the thread its request ran
+    in, so that profile is only there for comparison; watch the server's
+    connection count while it runs. Response caching is disabled so every
+    request reaches the database. The generated events are deleted
+    afterwards.
+    """
+
+    help = 'Compare events list req/s with per-request, persistent and pooled database connections.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--connections', type=int, default=100, help='Concurrent connections.')
+        parser.add_argument('--duration', type=float, default=15, help='Seconds of load per profile.')
+        parser.add_argument('--workers', type=int, default=2, help='Server worker processes.')
+        parser.add_argument('--client-processes', type=int, default=2, help='Load generator processes.')
+        parser.add_argument('--port', type=int, default=8798)
+        parser.add_argument('--events', type=int, default=50, help='Events to list.')
+        parser.add_argument('--pgbouncer-host', help='Also run through the PgBouncer at this host.')
+        parser.add_argument('--pgbouncer-port', default='6432')
+
+    def handle(self, *args, **options):
+        now = timezone.now()
+        events = Event.objects.bulk_create([
+            Event(
+                name=f'Connection benchmark {i}', location='Benchmark hall',
+                start_time=now + timedelta(days=1, minutes=i), end_time=now + timedelta(days=1, hours=2),
+            )
+            for i in range(options['events'])
+        ])
+        try:
+            results = [
+                {'profile': label, 'endpoint': 'list', **self.run_profile(database, options)}
+                for label, database in self.profiles(options)
+            ]
+        finally:
+            Event.objects.filter(pk__in=[event.pk for event in events]).delete()
+
+        self.stdout.write('')
+        self.stdout.write(format_results(results, label='profile'))
+
+    def profiles(self, options):
+        base = settings.DATABASES['default']
+
+        per_request = copy.deepcopy(base)
+        per_request.update(CONN_MAX_AGE=0, CONN_HEALTH_CHECKS=False)
+        yield 'per-request connections', per_request
+
+        persistent = copy.deepcopy(base)
+        persistent.update(CONN_MAX_AGE=60, CONN_HEALTH_CHECKS=True)
+        yield 'persistent + health checks', persistent
+
+        if options['pgbouncer_host']:
+            pooled = copy.deepcopy(per_request)
+            pooled.update(
+                HOST=options['pgbouncer_host'], PORT=options['pgbouncer_port'],
+                DISABLE_SERVER_SIDE_CURSORS=True,
+            )
+            yield 'per-request via PgBouncer', pooled
+
+    def run_profile(self, database, options):
+        overrides = {'DEBUG': False, 'API_CACHE_TIMEOUT': 0, 'DATABASES': {'default': database}}
+        gunicorn_args = [
+            '--workers', str(options['workers']),
+            '--worker-class', 'uvicorn.workers.UvicornWorker',
+        ]
+        self.stdout.write(f"CONN_MAX_AGE={database['CONN_MAX_AGE']} {database.get('HOST') or ''}...")
+        with serve('campus_connect.asgi:application', options['port'], gunicorn_args, overrides):
+            return run_load(
+                [build_request('GET', '/api/v1/events/')], options['port'],
+                options['connections'], options['duration'], options['client_processes'],
+            )
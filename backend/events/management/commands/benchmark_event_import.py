@@ -0,0 +1,118 @@
+import csv
+import json
+import os
+import random
+import tempfile
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from events.imports import BATCH_SIZE, EventImport
+from events.serializers import EventSerializer
+
+COLUMNS = ('name', 'description', 'location', 'start_time', 'end_time', 'capacity')
+
+
+class Command(BaseCommand):
+    """
+    Compare a bulk event import against creating the same events one
+    request-equivalent at a time (``EventSerializer`` validate and save,
+    as ``EventCreateView`` does).
+
+    The per-row path runs on a sample and is extrapolated; the bulk path
+    creates, updates and deactivates every event. Everything runs inside a
+    transaction that is rolled back.
+    """
+
+    help = 'Benchmark bulk event import on a generated CSV file.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--events', type=int, default=50000, help='Rows in the generated file.')
+        parser.add_argument('--baseline-rows', type=int, default=2000, help='Rows created one at a time.')
+        parser.add_argument('--batch-size', type=int, default=BATCH_SIZE)
+        parser.add_argument('--seed', type=int, default=42)
+
+    def handle(self, *args, **options):
+        rng = random.Random(options['seed'])
+        rows = self.generate(rng, options['events'])
+
+        with tempfile.TemporaryDirectory() as directory:
+            csv_path = os.path.join(directory, 'events.csv')
+            with open(csv_path, 'w', newline='') as handle:
+                writer = csv.DictWriter(handle, fieldnames=COLUMNS)
+                writer.writeheader()
+                writer.writerows(rows)
+
+            with transaction.atomic():
+                baseline = self.time_per_row(rows[:options['baseline_rows']])
+
+                started = time.perf_counter()
+                with open(csv_path, 'rb') as stream:
+                    created = EventImport('create', batch_size=options['batch_size']).run(stream, 'csv')
+                create_time = time.perf_counter() - started
+
+                ids = self.imported_ids(created['created'])
+                update_path = os.path.join(directory, 'updates.ndjson')
+                with open(update_path, 'w') as handle:
+                    for event_id in ids:
+                        handle.write(json.dumps({'id': event_id, 'capacity': rng.randint(20, 500)}) + '\n')
+
+                started = time.perf_counter()
+                with open(update_path, 'rb') as stream:
+                    updated = EventImport('update', batch_size=options['batch_size']).run(stream, 'ndjson')
+                update_time = time.perf_counter() - started
+
+                started = time.perf_counter()
+                with open(update_path, 'rb') as stream:
+                    deactivated = EventImport('deactivate', batch_size=options['batch_size']).run(stream, 'ndjson')
+                deactivate_time = time.perf_counter() - started
+
+                transaction.set_rollback(True)
+
+        count = len(rows)
+        self.stdout.write(
+            f'one at a time      {baseline:>9.0f} rows/s  (~{count / baseline:.1f}s for {count} rows, extrapolated)'
+        )
+        self.report('bulk create', created['created'], created['error_count'], create_time)
+        self.report('bulk update', updated['updated'], updated['error_count'], update_time)
+        self.report('bulk deactivate', deactivated['deactivated'], deactivated['error_count'], deactivate_time)
+        self.stdout.write(f'Speed-up (create): {count / create_time / baseline:.1f}x')
+
+    def generate(self, rng, count):
+        now = timezone.now()
+        rows = []
+        for i in range(count):
+            start = now + timedelta(days=rng.randint(1, 180), minutes=15 * rng.randint(0, 60))
+            rows.append({
+                'name': f'Imported event {i}',
+                'description': f'Session {i} of the semester schedule',
+                'location': f'Building {rng.randint(1, 40)}, room {rng.randint(100, 499)}',
+                'start_time': start.isoformat(),
+                'end_time': (start + timedelta(minutes=rng.choice([50, 75, 110]))).isoformat(),
+                'capacity': rng.choice(['', 30, 60, 120, 300]),
+            })
+        return rows
+
+    def time_per_row(self, rows):
+        started = time.perf_counter()
+        for row in rows:
+            serializer = EventSerializer(data={key: value for key, value in row.items() if value != ''})
+            serializer.is_valid(raise_exception=True)
+            serializer.save()
+        return len(rows) / (time.perf_counter() - started)
+
+    @staticmethod
+    def imported_ids(count):
+        from events.models import Event
+
+        return list(Event.objects.filter(name__startswith='Imported event ').order_by('-id').values_list(
+            'id', flat=True
+        )[:count])
+
+    def report(self, label, written, errors, elapsed):
+        self.stdout.write(
+            f'{label:<18} {written / elapsed:>9.0f} rows/s  ({written} rows in {elapsed:.1f}s, {errors} errors)'
+        )
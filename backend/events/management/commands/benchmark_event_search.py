@@ -0,0 +1,103 @@
+import random
+import statistics
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from events.models import Event
+from events.search import search_events
+
+WORDS = (
+    'lecture workshop seminar concert hackathon career fair orientation robotics '
+    'chemistry biology physics poetry theatre film debate chess football basketball '
+    'volunteering alumni networking startup finance design photography music jazz '
+    'library auditorium stadium gallery laboratory campus north south east west hall'
+).split()
+
+SYLLABLES = 'ka lo mi ne ru sa ti vo ze ba de fi go hu ja ke li mo nu pa'.split()
+
+
+class Command(BaseCommand):
+    """
+    Compare event search latency of the full-text index against the old
+    ``icontains`` OR-chain. Runs inside a transaction that is rolled back.
+    """
+
+    help = 'Benchmark event full-text search on a generated dataset.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--events', type=int, default=100000, help='Number of events to generate.')
+        parser.add_argument('--queries', type=int, default=50, help='Number of search queries to time.')
+        parser.add_argument('--seed', type=int, default=42)
+
+    def handle(self, *args, **options):
+        rng = random.Random(options['seed'])
+        # A long-tailed vocabulary keeps term selectivity realistic
+        self.vocabulary = WORDS + [
+            ''.join(rng.choices(SYLLABLES, k=rng.randint(2, 4))) for _ in range(20000)
+        ]
+        terms = [rng.choice(WORDS) for _ in range(options['queries'])]
+
+        with transaction.atomic():
+            self.stdout.write(f"Generating {options['events']} events...")
+            self.generate(rng, options['events'])
+
+            substring = self.time_queries(terms, self.substring_search)
+            full_text = self.time_queries(terms, self.ranked_search)
+
+            transaction.set_rollback(True)
+
+        self.report('icontains OR-chain', substring)
+        self.report('full-text index', full_text)
+        self.stdout.write(f'Speed-up (median): {statistics.median(substring) / statistics.median(full_text):.1f}x')
+
+    def generate(self, rng, count):
+        now = timezone.now()
+        batch = []
+        for i in range(count):
+            batch.append(Event(
+                name=' '.join(rng.choices(self.vocabulary[:2000], k=3)).title(),
+                description=' '.join(rng.choices(self.vocabulary, k=30)),
+                location=' '.join(rng.choices(self.vocabulary[:500], k=2)).title(),
+                start_time=now + timedelta(minutes=i),
+                end_time=now + timedelta(minutes=i + 90),
+            ))
+            if len(batch) == 5000:
+                Event.objects.bulk_create(batch)
+                batch = []
+        Event.objects.bulk_create(batch)
+
+    @staticmethod
+    def substring_search(queryset, term):
+        # What DRF's SearchFilter produced, with the list view's default ordering
+        return queryset.filter(
+            Q(name__icontains=term) | Q(description__icontains=term) | Q(location__icontains=term)
+        ).order_by('start_time')
+
+    @staticmethod
+    def ranked_search(queryset, term):
+        # What EventSearchFilter produces without an explicit ordering
+        return search_events(queryset, term).order_by('-search_rank', 'start_time', 'id')
+
+    def time_queries(self, terms, search):
+        timings = []
+        for term in terms:
+            started = time.perf_counter()
+            # A list page: the first 10 rows plus the pagination count
+            queryset = search(Event.objects.all(), term)
+            list(queryset[:10])
+            queryset.count()
+            timings.append(time.perf_counter() - started)
+        return timings
+
+    def report(self, label, timings):
+        timings = sorted(timings)
+        p95 = timings[min(len(timings) - 1, int(len(timings) * 0.95))]
+        self.stdout.write(
+            f'{label:<20} median {statistics.median(timings) * 1000:>8.1f}ms  '
+            f'p95 {p95 * 1000:>8.1f}ms'
+        )
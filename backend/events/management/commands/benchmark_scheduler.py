@@ -0,0 +1,89 @@
+import time
+import uuid
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.utils import timezone
+
+from events.models import Event
+from events.scheduler import BATCH_SIZE, rotate_qr_codes, send_reminders
+
+
+class Command(BaseCommand):
+    """
+    Time scheduler ticks over many concurrent events.
+
+    Generates running events whose QR codes are due for rotation and
+    upcoming events due a reminder, then runs a tick with work to do, an
+    idle tick, and, on a sample, ``generate_qr_code()`` one event at a time
+    for comparison. Rotation is measured with stored UUID codes, the only
+    ones that need it. Everything runs inside a transaction that is rolled
+    back.
+    """
+
+    help = 'Benchmark QR code rotation and reminder scheduling per tick.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--events', type=int, default=5000, help='Running events, and again upcoming events.')
+        parser.add_argument('--baseline-events', type=int, default=200, help='Events rotated one at a time.')
+        parser.add_argument('--batch-size', type=int, default=BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        count = options['events']
+        batch_size = options['batch_size']
+
+        with override_settings(EVENT_QR_CODE_MODE='uuid'), transaction.atomic():
+            self.create_events(count)
+            now = timezone.now()
+
+            results = []
+            for label in ('tick with work', 'idle tick'):
+                with CaptureQueriesContext(connection) as queries:
+                    started = time.perf_counter()
+                    rotated = rotate_qr_codes(now, batch_size)
+                    reminded = send_reminders(now, batch_size)
+                    elapsed = time.perf_counter() - started
+                results.append((label, rotated, reminded, elapsed, len(queries)))
+
+            baseline = list(Event.objects.filter(name__startswith='Scheduler benchmark running')[
+                :options['baseline_events']
+            ])
+            with CaptureQueriesContext(connection) as queries:
+                started = time.perf_counter()
+                for event in baseline:
+                    event.generate_qr_code()
+                baseline_time = time.perf_counter() - started
+            baseline_queries = len(queries)
+
+            transaction.set_rollback(True)
+
+        self.stdout.write(f"{'':<16} {'rotated':>8} {'reminded':>9} {'ms':>9} {'queries':>8}")
+        for label, rotated, reminded, elapsed, queries in results:
+            self.stdout.write(f'{label:<16} {rotated:>8} {reminded:>9} {elapsed * 1000:>9.0f} {queries:>8}')
+        if baseline:
+            per_event = baseline_time / len(baseline)
+            self.stdout.write(
+                f'one at a time: {per_event * 1000:.2f} ms and {baseline_queries / len(baseline):.1f} queries '
+                f'per event (~{per_event * count:.1f}s for {count} events, extrapolated)'
+            )
+
+    def create_events(self, count):
+        now = timezone.now()
+        stale = now - Event.QR_CODE_LIFETIME + Event.QR_CODE_ROTATION_LEAD / 2
+        Event.objects.bulk_create([
+            Event(
+                name=f'Scheduler benchmark running {i}', location='Benchmark hall',
+                start_time=now - timedelta(hours=1), end_time=now + timedelta(hours=1),
+                qr_code=str(uuid.uuid4()), qr_code_generated_at=stale,
+            )
+            for i in range(count)
+        ], batch_size=1000)
+        Event.objects.bulk_create([
+            Event(
+                name=f'Scheduler benchmark upcoming {i}', location='Benchmark hall',
+                start_time=now + timedelta(hours=2), end_time=now + timedelta(hours=4),
+            )
+            for i in range(count)
+        ], batch_size=1000)
@@ -0,0 +1,125 @@
+import json
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from campus_connect.loadtest import build_request, format_results, run_load, serve
+from events.models import Event
+from registrations.models import Registration
+from users.tokens import ClaimsAccessToken
+
+User = get_user_model()
+
+SERVERS = {
+    'wsgi': {
+        'label': 'sync WSGI (gthread)',
+        'app': 'campus_connect.wsgi:application',
+        # Serve the synchronous views the async ones replaced
+        'urlconf': 'events.benchmark_urls',
+    },
+    'asgi': {
+        'label': 'async ASGI (uvicorn)',
+        'app': 'campus_connect.asgi:application',
+        'urlconf': None,
+    },
+}
+
+
+class Command(BaseCommand):
+    """
+    Load-test the hot read paths and attendance confirmation under a sync
+    WSGI server and under the async ASGI application.
+
+    Both servers run as gunicorn subprocesses with the same number of
+    workers against the configured database. The WSGI server gets the
+    synchronous versions of the views (``events.benchmark_urls``); the ASGI
+    server gets the project's async views. Load comes from client
+    processes holding ``--connections`` keep-alive connections open in
+    total, each sending requests back to back. The benchmark data is
+    deleted afterwards.
+    """
+
+    help = 'Compare throughput and p99 latency of sync WSGI and async ASGI serving.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--connections', type=int, default=500, help='Concurrent connections.')
+        parser.add_argument('--duration', type=float, default=15, help='Seconds of load per endpoint.')
+        parser.add_argument('--workers', type=int, default=2, help='Server worker processes.')
+        parser.add_argument('--threads', type=int, default=32, help='Threads per WSGI worker.')
+        parser.add_argument('--client-processes', type=int, default=2, help='Load generator processes.')
+        parser.add_argument('--port', type=int, default=8799)
+        parser.add_argument('--attendees', type=int, default=500, help='Users confirming attendance.')
+        parser.add_argument(
+            '--server', choices=sorted(SERVERS), action='append', dest='servers',
+            help='Only run the given server (may be repeated).'
+        )
+
+    def handle(self, *args, **options):
+        event, users = self.seed(options['attendees'])
+        try:
+            endpoints = self.build_requests(event, users)
+            results = []
+            for name in options['servers'] or ['wsgi', 'asgi']:
+                # A fresh QR code keeps check-ins valid for the whole run
+                qr_code = event.generate_qr_code().code
+                endpoints['confirm'] = self.confirm_requests(qr_code, users)
+                results.extend(self.run_server(name, endpoints, options))
+        finally:
+            Registration.objects.filter(event=event).delete()
+            User.objects.filter(pk__in=[user.pk for user in users]).delete()
+            event.delete()
+
+        self.stdout.write('')
+        self.stdout.write(format_results(results))
+
+    def seed(self, attendees):
+        # Leftovers from an interrupted run would collide on email
+        User.objects.filter(email__startswith='server-bench-').delete()
+        now = timezone.now()
+        event = Event.objects.create(
+            name='Benchmark event', location='Benchmark hall',
+            start_time=now + timedelta(hours=1), end_time=now + timedelta(hours=3)
+        )
+        users = User.objects.bulk_create([
+            User(email=f'server-bench-{i}@example.com', name=f'Bench {i}') for i in range(attendees)
+        ])
+        Registration.objects.bulk_create([Registration(admin_user=user, event=event) for user in users])
+        Event.shift_registration_count(event.pk, to_status='registered', count=len(users))
+        return event, users
+
+    def build_requests(self, event, users):
+        return {
+            'list': [build_request('GET', '/api/v1/events/')],
+            'detail': [build_request('GET', f'/api/v1/events/{event.pk}/')],
+        }
+
+    def confirm_requests(self, qr_code, users):
+        # Each user checks in once; later requests take the "already checked in" path
+        body = json.dumps({'event_qr_code': qr_code})
+        return [
+            build_request('POST', '/api/v1/registrations/confirm-attendance/', body, ClaimsAccessToken.for_user(user))
+            for user in users
+        ]
+
+    def run_server(self, name, endpoints, options):
+        server = SERVERS[name]
+        overrides = {'DEBUG': False}
+        if server['urlconf']:
+            overrides['ROOT_URLCONF'] = server['urlconf']
+        if name == 'asgi':
+            worker_args = ['--worker-class', 'uvicorn.workers.UvicornWorker']
+        else:
+            worker_args = ['--worker-class', 'gthread', '--threads', str(options['threads'])]
+
+        results = []
+        with serve(server['app'], options['port'], ['--workers', str(options['workers']), *worker_args], overrides):
+            for endpoint, requests in endpoints.items():
+                self.stdout.write(f"{server['label']}: {endpoint}...")
+                stats = run_load(
+                    requests, options['port'], options['connections'], options['duration'],
+                    options['client_processes'],
+                )
+                results.append({'server': server['label'], 'endpoint': endpoint, **stats})
+        return results
@@ -0,0 +1,45 @@
+from django.core.management.base import BaseCommand
+
+from events.images import generate_image_variants
+from events.models import Event
+
+
+class Command(BaseCommand):
+    """
+    Render the resized variants of event background images in the foreground.
+
+    Uploads are rendered in the background as they are saved; this command
+    backfills events stored before then, or re-renders after the variant
+    sizes change.
+    """
+
+    help = 'Render resized WebP and JPEG variants of event background images.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--event', type=int, action='append', dest='event_ids',
+            help='Only render the given event id (may be repeated).'
+        )
+        parser.add_argument(
+            '--all', action='store_true',
+            help='Re-render events whose variants already exist.'
+        )
+
+    def handle(self, *args, **options):
+        events = Event.objects.exclude(background_image='').exclude(background_image__isnull=True)
+        if options['event_ids']:
+            events = events.filter(pk__in=options['event_ids'])
+
+        rendered = failed = 0
+        for event in events.only('id', 'background_image', 'image_variants').order_by('id').iterator():
+            if not options['all'] and event.image_variants.get('source') == event.background_image.name:
+                continue
+            try:
+                generate_image_variants(event.pk)
+            except (OSError, ValueError) as exc:
+                failed += 1
+                self.stderr.write(f'Event {event.pk}: {exc}')
+            else:
+                rendered += 1
+
+        self.stdout.write(self.style.SUCCESS(f'Rendered image variants for {rendered} events ({failed} failed).'))
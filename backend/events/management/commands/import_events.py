@@ -0,0 +1,58 @@
+import json
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from campus_connect.imports import detect_format
+from events.imports import BATCH_SIZE, OPERATIONS, EventImport
+
+
+class Command(BaseCommand):
+    """
+    Import events from a CSV, JSON or NDJSON file.
+
+    Rows are streamed from the file and written in batches, exactly as the
+    bulk import endpoints do; invalid rows are listed with their position.
+    """
+
+    help = 'Create, update or deactivate events in bulk from a file.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help="File to import, or '-' for standard input.")
+        parser.add_argument('--operation', choices=OPERATIONS, default='create')
+        parser.add_argument('--format', dest='import_format', choices=['csv', 'json', 'ndjson'],
+                            help='File format (detected from the extension by default).')
+        parser.add_argument('--batch-size', type=int, default=BATCH_SIZE)
+        parser.add_argument('--dry-run', action='store_true', help='Validate without writing.')
+        parser.add_argument('--atomic', action='store_true', help='Write nothing unless every row is valid.')
+
+    def handle(self, *args, **options):
+        path = options['path']
+        import_format = options['import_format'] or detect_format(filename=path)
+        if import_format is None:
+            raise CommandError('Cannot detect the file format; pass --format.')
+
+        event_import = EventImport(
+            options['operation'], dry_run=options['dry_run'], atomic=options['atomic'],
+            batch_size=options['batch_size'],
+        )
+        if path == '-':
+            result = event_import.run(sys.stdin.buffer, import_format)
+        else:
+            try:
+                with open(path, 'rb') as stream:
+                    result = event_import.run(stream, import_format)
+            except OSError as exc:
+                raise CommandError(str(exc))
+
+        for error in result['errors']:
+            self.stderr.write(f"Row {error['row']}: {json.dumps(error['errors'])}")
+        if result['error_count'] > len(result['errors']):
+            self.stderr.write(f"... and {result['error_count'] - len(result['errors'])} more errors")
+
+        written = result.get('created', result.get('updated', result.get('deactivated')))
+        verb = 'Would write' if options['dry_run'] else 'Wrote'
+        summary = f"{verb} {written} of {result['rows']} rows, {result['error_count']} errors."
+        if result['error_count'] and options['atomic']:
+            raise CommandError(f'{summary} Nothing was imported.')
+        self.stdout.write(self.style.SUCCESS(summary) if not result['error_count'] else summary)
@@ -0,0 +1,60 @@
+from collections import defaultdict
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count
+
+from events.models import Event
+from registrations.models import Registration
+
+
+class Command(BaseCommand):
+    """Recompute the denormalized registration counters on events."""
+
+    help = 'Rebuild registered/checked-in/cancelled counters from the registrations table.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--event', type=int, action='append', dest='event_ids',
+            help='Only rebuild the given event id (may be repeated).'
+        )
+        parser.add_argument(
+            '--batch-size', type=int, default=500,
+            help='Number of events written per UPDATE batch.'
+        )
+
+    def handle(self, *args, **options):
+        event_ids = options['event_ids']
+        counter_fields = list(Event.REGISTRATION_COUNTERS.values())
+
+        events = Event.objects.only('id', *counter_fields).order_by('id')
+        registrations = Registration.objects.all()
+        if event_ids:
+            events = events.filter(pk__in=event_ids)
+            registrations = registrations.filter(event_id__in=event_ids)
+
+        with transaction.atomic():
+            # Lock the events first so concurrent registrations wait for the rebuild
+            events = list(events.select_for_update())
+
+            counts = defaultdict(dict)
+            rows = registrations.values('event_id', 'status').annotate(total=Count('id')).order_by()
+            for row in rows:
+                counts[row['event_id']][row['status']] = row['total']
+
+            changed = []
+            for event in events:
+                dirty = False
+                for status, field in Event.REGISTRATION_COUNTERS.items():
+                    value = counts[event.pk].get(status, 0)
+                    if getattr(event, field) != value:
+                        setattr(event, field, value)
+                        dirty = True
+                if dirty:
+                    changed.append(event)
+
+            Event.objects.bulk_update(changed, counter_fields, batch_size=options['batch_size'])
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Rebuilt registration counters for {len(events)} events ({len(changed)} updated).'
+        ))
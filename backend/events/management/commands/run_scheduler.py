@@ -0,0 +1,50 @@
+import signal
+import threading
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from events.models import Event
+from events.scheduler import tick
+
+
+class Command(BaseCommand):
+    """
+    Run the periodic event jobs (QR code rotation, reminders) until stopped.
+
+    Several schedulers may run at once; each job locks the events it
+    handles. The interval must stay below ``Event.QR_CODE_ROTATION_LEAD``
+    so stored UUID codes are replaced before they expire.
+    """
+
+    help = 'Rotate running events\' QR codes and queue reminder emails on a fixed interval.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--interval', type=float, default=60, help='Seconds between ticks.')
+        parser.add_argument('--once', action='store_true', help='Run a single tick and exit.')
+
+    def handle(self, *args, **options):
+        interval = options['interval']
+        if interval >= Event.QR_CODE_ROTATION_LEAD.total_seconds():
+            self.stderr.write(self.style.WARNING(
+                f'An interval of {interval:.0f}s lets QR codes expire before they are rotated.'
+            ))
+
+        stopping = threading.Event()
+        for signum in (signal.SIGTERM, signal.SIGINT):
+            signal.signal(signum, lambda *_: stopping.set())
+
+        while not stopping.is_set():
+            started = time.monotonic()
+            close_old_connections()
+            result = tick()
+            elapsed = time.monotonic() - started
+            if any(result.values()) or options['once']:
+                self.stdout.write(
+                    f"Rotated {result['rotated']} QR codes, queued reminders for "
+                    f"{result['reminded']} events in {elapsed * 1000:.0f} ms."
+                )
+            if options['once']:
+                break
+            stopping.wait(max(0, interval - elapsed))
@@ -0,0 +1,27 @@
+# Generated by Django 4.2.10 on 2026-10-17 04:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='event',
+            name='qr_code',
+            field=models.CharField(blank=True, max_length=255, null=True, unique=True, verbose_name='QR code'),
+        ),
+        migrations.AddField(
+            model_name='event',
+            name='qr_code_generated_at',
+            field=models.DateTimeField(blank=True, null=True, verbose_name='QR code generated at'),
+        ),
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['qr_code'], name='events_even_qr_code_1cf5fc_idx'),
+        ),
+    ]
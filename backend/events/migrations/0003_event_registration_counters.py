@@ -0,0 +1,49 @@
+# Generated by Django 4.2.10 on 2026-10-17 04:24
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+COUNTERS = {
+    'registered': 'registered_count',
+    'checked_in': 'checked_in_count',
+    'cancelled': 'cancelled_count',
+}
+
+
+def backfill_counters(apps, schema_editor):
+    Event = apps.get_model('events', 'Event')
+    Registration = apps.get_model('registrations', 'Registration')
+
+    rows = Registration.objects.values('event_id', 'status').annotate(total=Count('id')).order_by()
+    for row in rows:
+        field = COUNTERS.get(row['status'])
+        if field:
+            Event.objects.filter(pk=row['event_id']).update(**{field: row['total']})
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0002_event_qr_code'),
+        ('registrations', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='event',
+            name='cancelled_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='cancelled count'),
+        ),
+        migrations.AddField(
+            model_name='event',
+            name='checked_in_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='checked in count'),
+        ),
+        migrations.AddField(
+            model_name='event',
+            name='registered_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='registered count'),
+        ),
+        migrations.RunPython(backfill_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 4.2.10 on 2026-10-17 05:27
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0006_event_image_variants'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='event',
+            name='previous_qr_code',
+            field=models.CharField(blank=True, editable=False, max_length=255, null=True, verbose_name='previous QR code'),
+        ),
+        migrations.AddField(
+            model_name='event',
+            name='reminder_sent_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True, verbose_name='reminder sent at'),
+        ),
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['previous_qr_code'], name='events_even_previou_7dc40e_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(condition=models.Q(('active', True)), fields=['end_time'], name='event_active_end_time_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(condition=models.Q(('active', True), ('reminder_sent_at__isnull', True)), fields=['start_time'], name='event_reminder_due_idx'),
+        ),
+    ]
@@ -1,5 +1,7 @@
 import uuid
-from django.db import models
+from django.db import models, transaction
+from django.db.models import F, Q
+from django.db.models.functions import Greatest
 from django.utils.translation import gettext_lazy as _
 from django.utils import timezone
 from datetime import timedelta
@@ -16,56 +18,221 @@ class Event(models.Model):
     capacity = models.PositiveIntegerField(_('capacity'), blank=True, null=True)
     active = models.BooleanField(_('active'), default=True)
     background_image = models.ImageField(_('background image'), upload_to='events/', blank=True, null=True)
+    # Resized copies of background_image, see events.images
+    image_variants = models.JSONField(_('image variants'), default=dict, blank=True, editable=False)
     qr_code = models.CharField(_('QR code'), max_length=255, unique=True, blank=True, null=True)
     qr_code_generated_at = models.DateTimeField(_('QR code generated at'), blank=True, null=True)
+    # The code replaced by the last rotation, accepted for QR_CODE_ROTATION_LEAD after it
+    previous_qr_code = models.CharField(_('previous QR code'), max_length=255, blank=True, null=True, editable=False)
+    reminder_sent_at = models.DateTimeField(_('reminder sent at'), blank=True, null=True, editable=False)
+    registered_count = models.PositiveIntegerField(_('registered count'), default=0, editable=False)
+    checked_in_count = models.PositiveIntegerField(_('checked in count'), default=0, editable=False)
+    cancelled_count = models.PositiveIntegerField(_('cancelled count'), default=0, editable=False)
     created_at = models.DateTimeField(_('created at'), auto_now_add=True)
     updated_at = models.DateTimeField(_('updated at'), auto_now=True)
 
+    # QR codes expire after 10 minutes
+    QR_CODE_LIFETIME = timedelta(minutes=10)
+    
+    # The scheduler replaces codes this long before they expire; the
+    # replaced code stays valid this long, for screens still showing it
+    QR_CODE_ROTATION_LEAD = timedelta(minutes=2)
+    
+    # Maps a registration status to the counter column that tracks it.
+    REGISTRATION_COUNTERS = {
+        'registered': 'registered_count',
+        'checked_in': 'checked_in_count',
+        'cancelled': 'cancelled_count',
+    }
+
     class Meta:
         verbose_name = _('event')
         verbose_name_plural = _('events')
         ordering = ['-start_time']
         indexes = [
-            models.Index(fields=['start_time']),
+            # Also backs keyset pagination on (start_time, id)
+            models.Index(fields=['start_time', 'id']),
             models.Index(fields=['active']),
             models.Index(fields=['qr_code']),
+            models.Index(fields=['previous_qr_code']),
+            # Running events, for QR code rotation
+            models.Index(fields=['end_time'], condition=Q(active=True), name='event_active_end_time_idx'),
+            # Events still owed a reminder
+            models.Index(
+                fields=['start_time'], condition=Q(active=True, reminder_sent_at__isnull=True),
+                name='event_reminder_due_idx'
+            ),
         ]
 
     def __str__(self):
         return self.name
     
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the stored image so save() can tell when it is replaced,
+        # and the capacity so it can tell when spots open up
+        if 'background_image' in instance.__dict__:
+            instance._stored_background_image = instance.background_image.name or ''
+        if 'capacity' in instance.__dict__:
+            instance._stored_capacity = instance.capacity
+        return instance
+    
+    def _capacity_raised(self):
+        stored = getattr(self, '_stored_capacity', None)
+        return stored is not None and (self.capacity is None or self.capacity > stored)
+    
+    def save(self, *args, **kwargs):
+        from .caching import invalidate_event_cache
+        from .images import schedule_image_variants
+        from .live import announce_capacity
+        
+        update_fields = kwargs.get('update_fields')
+        image_changed = (
+            (update_fields is None or 'background_image' in update_fields)
+            and (self.background_image.name or '') != getattr(self, '_stored_background_image', '')
+        )
+        capacity_raised = (update_fields is None or 'capacity' in update_fields) and self._capacity_raised()
+        
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            if capacity_raised:
+                from registrations.models import WaitlistEntry
+                
+                # Hand the new spots to the waitlist
+                WaitlistEntry.promote_all(self.pk)
+        self._stored_capacity = self.capacity
+        invalidate_event_cache(self.pk)
+        if image_changed:
+            self._stored_background_image = self.background_image.name or ''
+            schedule_image_variants(self.pk)
+        if update_fields is None or 'capacity' in update_fields:
+            announce_capacity(self.pk)
+    
+    def delete(self, *args, **kwargs):
+        from .caching import invalidate_event_cache
+        
+        event_id = self.pk
+        result = super().delete(*args, **kwargs)
+        invalidate_event_cache(event_id)
+        return result
+    
     @property
     def is_past(self):
         """Check if the event is in the past."""
         from django.utils import timezone
         return self.end_time < timezone.now()
     
+    @property
+    def registration_count(self):
+        """Number of registrations holding a spot (cancelled ones excluded)."""
+        return self.registered_count + self.checked_in_count
+    
     @property
     def is_full(self):
         """Check if the event is at full capacity."""
         if self.capacity is None:
             return False
-        return self.registrations.count() >= self.capacity
+        return self.registration_count >= self.capacity
     
     @property
     def available_spots(self):
         """Calculate the number of available spots."""
         if self.capacity is None:
             return None
-        return max(0, self.capacity - self.registrations.count())
+        return max(0, self.capacity - self.registration_count)
+    
+    @property
+    def qr_code_expires_at(self):
+        """When the current QR code stops being accepted."""
+        if not self.qr_code_generated_at:
+            return None
+        return self.qr_code_generated_at + self.QR_CODE_LIFETIME
     
     @property
     def is_qr_code_valid(self):
         """Check if the QR code is still valid (not expired)."""
         if not self.qr_code_generated_at:
             return False
-        # QR codes expire after 10 minutes
-        expiration_time = self.qr_code_generated_at + timedelta(minutes=10)
-        return timezone.now() < expiration_time
+        return timezone.now() < self.qr_code_expires_at
     
-    def generate_qr_code(self):
-        """Generate a new QR code for the event."""
+    def accepts_qr_code(self, code):
+        """Check if ``code`` is this event's current code, or the one it just replaced, and unexpired."""
+        if code == self.qr_code:
+            return self.is_qr_code_valid
+        if code and code == self.previous_qr_code and self.qr_code_generated_at:
+            return timezone.now() < self.qr_code_generated_at + self.QR_CODE_ROTATION_LEAD
+        return False
+    
+    def get_qr_code(self, now=None):
+        """
+        The code check-in screens should show, as a ``qr_tokens.QRCode``.
+        
+        Signed tokens are derived on the spot; a stored UUID code is returned
+        while it is valid, and None once it has expired.
+        """
+        from . import qr_tokens
+        
+        if qr_tokens.signed_mode():
+            return qr_tokens.issue(self.pk, now)
+        if not self.is_qr_code_valid:
+            return None
+        return qr_tokens.QRCode(
+            self.qr_code, self.qr_code_generated_at, self.qr_code_expires_at, self.qr_code_expires_at
+        )
+    
+    def assign_new_qr_code(self, now):
+        """Replace the QR code in memory, keeping the old one for the grace period if still valid."""
+        self.previous_qr_code = self.qr_code if self.is_qr_code_valid else None
         self.qr_code = str(uuid.uuid4())
-        self.qr_code_generated_at = timezone.now()
-        self.save(update_fields=['qr_code', 'qr_code_generated_at'])
-        return self.qr_code 
\ No newline at end of file
+        self.qr_code_generated_at = now
+    
+    def generate_qr_code(self):
+        """
+        Start check-in: issue a QR code for the event and return it as a
+        ``qr_tokens.QRCode``.
+        
+        Signed tokens rotate by themselves, so only UUID codes are stored.
+        """
+        from . import qr_tokens
+        
+        signed = qr_tokens.signed_mode()
+        if not signed:
+            self.assign_new_qr_code(timezone.now())
+            self.save(update_fields=['qr_code', 'previous_qr_code', 'qr_code_generated_at', 'updated_at'])
+        
+        # Check-in is about to start, so warm the attendance code verifier
+        from registrations.verifier import attendance_codes
+        attendance_codes.load(self.pk)
+        
+        if not signed:
+            # and render the code before the kiosks ask for it
+            from .tasks import render_qr_code_images
+            render_qr_code_images.enqueue(self.pk)
+        return self.get_qr_code()
+    
+    @classmethod
+    def shift_registration_count(cls, event_id, from_status=None, to_status=None, count=1):
+        """
+        Move registrations between status counters with a single UPDATE.
+        
+        Pass only ``to_status`` for a new registration and only ``from_status``
+        for a deleted one. Callers are expected to run this inside the same
+        transaction as the registration write.
+        """
+        updates = {}
+        if from_status in cls.REGISTRATION_COUNTERS:
+            field = cls.REGISTRATION_COUNTERS[from_status]
+            updates[field] = Greatest(F(field) - count, 0)
+        if to_status in cls.REGISTRATION_COUNTERS:
+            field = cls.REGISTRATION_COUNTERS[to_status]
+            updates[field] = F(field) + count
+        if updates:
+            from .caching import invalidate_event_cache
+            from .live import announce_capacity
+            
+            # The counters feed serialized fields, so they count as a modification
+            updates['updated_at'] = timezone.now()
+            cls.objects.filter(pk=event_id).update(**updates)
+            invalidate_event_cache(event_id)
+            announce_capacity(event_id)
@@ -0,0 +1,91 @@
+import hashlib
+import io
+
+import qrcode
+import qrcode.image.svg
+from django.core.cache import cache
+from django.utils import timezone
+
+# Supported output formats and their content types
+QR_IMAGE_FORMATS = {
+    'png': 'image/png',
+    'svg': 'image/svg+xml',
+}
+
+DEFAULT_BOX_SIZE = 10
+MIN_BOX_SIZE = 1
+MAX_BOX_SIZE = 40
+
+
+def render_qr_code(data, image_format='png', box_size=DEFAULT_BOX_SIZE):
+    """Render ``data`` as a QR code image and return the encoded bytes."""
+    qr = qrcode.QRCode(
+        version=1,
+        error_correction=qrcode.constants.ERROR_CORRECT_L,
+        box_size=box_size,
+        border=4,
+    )
+    qr.add_data(data)
+    qr.make(fit=True)
+
+    buffer = io.BytesIO()
+    if image_format == 'svg':
+        img = qr.make_image(image_factory=qrcode.image.svg.SvgPathImage)
+        img.save(buffer)
+    else:
+        img = qr.make_image(fill_color="black", back_color="white")
+        img.save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def _rendering_digest(data, image_format, box_size):
+    return hashlib.sha256(f'{data}:{image_format}:{box_size}'.encode()).hexdigest()[:32]
+
+
+def qr_code_etag(data, image_format, box_size):
+    """Strong ETag for a rendering; computable without rendering the image."""
+    return f'"{_rendering_digest(data, image_format, box_size)}"'
+
+
+def _cache_key(data, image_format, box_size):
+    return f'qr-code:{_rendering_digest(data, image_format, box_size)}'
+
+
+def _cache_timeout(expires_at):
+    return int((expires_at - timezone.now()).total_seconds())
+
+
+def get_qr_code_image(data, image_format, box_size, expires_at):
+    """
+    Return the rendered QR code, rendering it only on a cache miss.
+
+    Entries are keyed on the encoded data and rendering options and expire
+    together with the code itself.
+    """
+    key = _cache_key(data, image_format, box_size)
+    image = cache.get(key)
+    if image is None:
+        image = render_qr_code(data, image_format, box_size)
+        timeout = _cache_timeout(expires_at)
+        if timeout > 0:
+            cache.set(key, image, timeout)
+    return image
+
+
+def get_qr_code_images(data_list, image_format, box_size, expires_at):
+    """
+    ``get_qr_code_image`` for many codes sharing an expiry, with one cache
+    read for the lot and one write for whatever had to be rendered.
+    Returns the images in the order of ``data_list``.
+    """
+    keys = [_cache_key(data, image_format, box_size) for data in data_list]
+    cached = cache.get_many(keys)
+    rendered = {}
+    for key, data in zip(keys, data_list):
+        if key not in cached and key not in rendered:
+            rendered[key] = render_qr_code(data, image_format, box_size)
+
+    timeout = _cache_timeout(expires_at)
+    if rendered and timeout > 0:
+        cache.set_many(rendered, timeout)
+    return [cached.get(key) or rendered[key] for key in keys]
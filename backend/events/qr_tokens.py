@@ -0,0 +1,114 @@
+"""
+Signed, time-windowed event QR codes.
+
+A token names the event and a time step, and carries an HMAC of both keyed
+on ``SECRET_KEY``, in the manner of TOTP. The code on screen changes every
+``EVENT_QR_TOKEN_STEP`` seconds without anything being written, and a scan
+is verified by recomputing the HMAC, with no database lookup. A token stays
+accepted for ``EVENT_QR_TOKEN_WINDOWS`` steps after it is replaced, for
+screens that have not refreshed yet.
+
+Tokens look like ``e1.<event id>.<step>.<mac>`` and cannot be mistaken for
+the stored UUID codes used when ``EVENT_QR_CODE_MODE`` is ``uuid``; scans of
+those are still accepted in either mode.
+"""
+
+import base64
+import time
+from collections import namedtuple
+from datetime import datetime, timezone as dt_timezone
+
+from django.conf import settings
+from django.utils import timezone
+from django.utils.crypto import constant_time_compare, salted_hmac
+
+PREFIX = 'e1'
+
+KEY_SALT = 'events.qr_tokens'
+
+DEFAULT_STEP = 300
+
+DEFAULT_WINDOWS = 1
+
+# A code to show: when it was issued, when the next one replaces it, and
+# when it stops being accepted
+QRCode = namedtuple('QRCode', ['code', 'issued_at', 'replaced_at', 'expires_at'])
+
+
+def signed_mode():
+    """Whether events show signed tokens rather than stored UUID codes."""
+    return getattr(settings, 'EVENT_QR_CODE_MODE', 'signed') == 'signed'
+
+
+def _step():
+    return getattr(settings, 'EVENT_QR_TOKEN_STEP', DEFAULT_STEP)
+
+
+def _windows():
+    return getattr(settings, 'EVENT_QR_TOKEN_WINDOWS', DEFAULT_WINDOWS)
+
+
+def _counter(now):
+    timestamp = now.timestamp() if now is not None else time.time()
+    return int(timestamp // _step())
+
+
+def _at(counter):
+    return datetime.fromtimestamp(counter * _step(), tz=dt_timezone.utc)
+
+
+def _mac(event_id, counter, secret=None):
+    digest = salted_hmac(KEY_SALT, f'{event_id}.{counter}', secret=secret, algorithm='sha256').digest()
+    return base64.urlsafe_b64encode(digest[:16]).rstrip(b'=').decode()
+
+
+def is_token(code):
+    return isinstance(code, str) and code.startswith(PREFIX + '.')
+
+
+def issue(event_id, now=None):
+    """The event's token for the current step."""
+    counter = _counter(now)
+    return QRCode(
+        code=f'{PREFIX}.{event_id}.{counter}.{_mac(event_id, counter)}',
+        issued_at=_at(counter),
+        replaced_at=_at(counter + 1),
+        expires_at=_at(counter + 1 + _windows()),
+    )
+
+
+def verify(code, now=None):
+    """
+    Check a scanned token without touching the database.
+
+    Returns ``(event_id, error)``; ``error`` is None for an accepted token.
+    """
+    try:
+        prefix, event_id, counter, mac = code.split('.')
+        event_id, counter = int(event_id), int(counter)
+    except (AttributeError, ValueError):
+        return None, "Invalid event QR code"
+    if prefix != PREFIX:
+        return None, "Invalid event QR code"
+
+    secrets = [settings.SECRET_KEY, *getattr(settings, 'SECRET_KEY_FALLBACKS', [])]
+    if not any(constant_time_compare(mac, _mac(event_id, counter, secret)) for secret in secrets):
+        return None, "Invalid event QR code"
+
+    current = _counter(now)
+    # One step ahead allows for clock skew between servers
+    if not current - _windows() <= counter <= current + 1:
+        return None, "Event QR code has expired"
+    return event_id, None
+
+
+def expires_in(qr_code, now=None):
+    """Seconds until ``qr_code`` is replaced, for client caching."""
+    now = now or timezone.now()
+    return max(0, int((qr_code.replaced_at - now).total_seconds()))
+
+
+def accepted_for(qr_code, now=None):
+    """Seconds ``qr_code`` is still accepted at check-in."""
+    now = now or timezone.now()
+    return max(0, int((qr_code.expires_at - now).total_seconds()))
@@ -0,0 +1,114 @@
+"""
+Periodic event jobs: QR code rotation and reminder emails.
+
+``tick()`` runs every job once; ``manage.py run_scheduler`` calls it about
+once a minute. Each job selects its events with an indexed range query and
+handles them in batches, one SELECT and a couple of writes per batch however many
+events are due. Rows are locked with ``SKIP LOCKED`` while a batch is
+written, so several schedulers can run side by side without doing a job
+twice.
+"""
+
+import uuid
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Case, F, Q, Value, When
+from django.utils import timezone
+
+from . import qr_tokens
+from .caching import invalidate_event_caches
+from .models import Event
+
+BATCH_SIZE = 1000
+
+DEFAULT_REMINDER_HOURS = 24
+
+
+def _claim(queryset, fields, batch_size):
+    """Lock and return the next batch of ``queryset``; call inside a transaction."""
+    queryset = queryset.order_by('pk').only(*fields)
+    if connection.features.has_select_for_update_skip_locked:
+        queryset = queryset.select_for_update(skip_locked=True)
+    return list(queryset[:batch_size])
+
+
+def rotate_qr_codes(now=None, batch_size=BATCH_SIZE):
+    """
+    Give every running event a QR code, replacing codes within
+    ``Event.QR_CODE_ROTATION_LEAD`` of expiring. Returns how many rotated.
+
+    Only stored UUID codes need this; signed tokens rotate by themselves.
+    """
+    from .tasks import render_qr_code_images
+
+    if qr_tokens.signed_mode():
+        return 0
+
+    now = now or timezone.now()
+    rotate_before = now - (Event.QR_CODE_LIFETIME - Event.QR_CODE_ROTATION_LEAD)
+    due = Event.objects.filter(active=True, end_time__gte=now, start_time__lte=now).filter(
+        Q(qr_code_generated_at__isnull=True) | Q(qr_code_generated_at__lte=rotate_before)
+    )
+
+    rotated = 0
+    while True:
+        with transaction.atomic():
+            events = _claim(due, ['qr_code'], batch_size)
+            event_ids = [event.pk for event in events]
+            if event_ids:
+                # One UPDATE for the columns every event gets the same way; the
+                # old code is kept as previous only while it is still valid
+                Event.objects.filter(pk__in=event_ids).update(
+                    previous_qr_code=Case(
+                        When(qr_code_generated_at__gt=now - Event.QR_CODE_LIFETIME, then=F('qr_code')),
+                        default=Value(None),
+                    ),
+                    qr_code_generated_at=now,
+                    updated_at=now,
+                )
+                for event in events:
+                    event.qr_code = str(uuid.uuid4())
+                Event.objects.bulk_update(events, ['qr_code'])
+                invalidate_event_caches(event_ids)
+                render_qr_code_images.enqueue_many((event_id,) for event_id in event_ids)
+        rotated += len(events)
+        # Rotated events no longer match, so the next batch is new ones
+        if len(events) < batch_size:
+            return rotated
+
+
+def send_reminders(now=None, batch_size=BATCH_SIZE):
+    """
+    Queue reminder emails for events starting within ``EVENT_REMINDER_HOURS``
+    that have not had them yet. Returns how many events were queued.
+    """
+    from registrations.tasks import send_event_reminders
+
+    now = now or timezone.now()
+    hours = getattr(settings, 'EVENT_REMINDER_HOURS', DEFAULT_REMINDER_HOURS)
+    due = Event.objects.filter(
+        active=True, reminder_sent_at__isnull=True,
+        start_time__gt=now, start_time__lte=now + timedelta(hours=hours),
+    )
+
+    reminded = 0
+    while True:
+        with transaction.atomic():
+            event_ids = [event.pk for event in _claim(due, ['id'], batch_size)]
+            if event_ids:
+                Event.objects.filter(pk__in=event_ids).update(reminder_sent_at=now)
+                send_event_reminders.enqueue_many((event_id,) for event_id in event_ids)
+        reminded += len(event_ids)
+        if len(event_ids) < batch_size:
+            return reminded
+
+
+def tick(now=None):
+    """Run every scheduled job once; return what each did."""
+    now = now or timezone.now()
+    return {
+        'rotated': rotate_qr_codes(now),
+        'reminded': send_reminders(now),
+    }
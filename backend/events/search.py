@@ -0,0 +1,229 @@
+"""
+Full-text search over events.
+
+PostgreSQL keeps a weighted ``search_vector`` tsvector as a generated column
+with a GIN index. SQLite (local development and testing) keeps an FTS5
+table that triggers sync with ``events_event``. Both live in the database,
+so every write path, including ``bulk_create`` and ``update()``, keeps the
+index current. Other backends fall back to ``icontains`` matching.
+"""
+
+import re
+
+from django.db import connections
+from django.db.models import Case, F, FloatField, IntegerField, Q, Value, When
+from django.db.models.expressions import RawSQL
+from rest_framework.filters import BaseFilterBackend
+from rest_framework.settings import api_settings
+
+TABLE = 'events_event'
+FTS_TABLE = 'events_event_fts'
+
+# Field weights: name matches rank above location, above description
+POSTGRES_SEARCH_VECTOR = (
+    "setweight(to_tsvector('english', coalesce(name, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(location, '')), 'B') || "
+    "setweight(to_tsvector('english', coalesce(description, '')), 'C')"
+)
+SQLITE_RANK = 'bm25(10.0, 5.0, 1.0)'
+
+POSTGRES_INSTALL = [
+    f"ALTER TABLE {TABLE} ADD COLUMN IF NOT EXISTS search_vector tsvector "
+    f"GENERATED ALWAYS AS ({POSTGRES_SEARCH_VECTOR}) STORED",
+    f"CREATE INDEX IF NOT EXISTS events_event_search_vector_gin ON {TABLE} USING GIN (search_vector)",
+]
+POSTGRES_UNINSTALL = [
+    "DROP INDEX IF EXISTS events_event_search_vector_gin",
+    f"ALTER TABLE {TABLE} DROP COLUMN IF EXISTS search_vector",
+]
+
+SQLITE_COLUMNS = 'name, location, description'
+SQLITE_INSTALL = [
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+    f"{SQLITE_COLUMNS}, content='{TABLE}', content_rowid='id')",
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rank) VALUES ('rank', '{SQLITE_RANK}')",
+]
+# The update trigger only fires for the indexed columns, so counter and QR
+# code writes never touch the index
+SQLITE_TRIGGERS = {
+    f'{FTS_TABLE}_ai': (
+        f"CREATE TRIGGER {FTS_TABLE}_ai AFTER INSERT ON {TABLE} BEGIN "
+        f"INSERT INTO {FTS_TABLE}(rowid, {SQLITE_COLUMNS}) "
+        f"VALUES (new.id, new.name, new.location, new.description); END"
+    ),
+    f'{FTS_TABLE}_ad': (
+        f"CREATE TRIGGER {FTS_TABLE}_ad AFTER DELETE ON {TABLE} BEGIN "
+        f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, {SQLITE_COLUMNS}) "
+        f"VALUES ('delete', old.id, old.name, old.location, old.description); END"
+    ),
+    f'{FTS_TABLE}_au': (
+        f"CREATE TRIGGER {FTS_TABLE}_au AFTER UPDATE OF {SQLITE_COLUMNS} ON {TABLE} BEGIN "
+        f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, {SQLITE_COLUMNS}) "
+        f"VALUES ('delete', old.id, old.name, old.location, old.description); "
+        f"INSERT INTO {FTS_TABLE}(rowid, {SQLITE_COLUMNS}) "
+        f"VALUES (new.id, new.name, new.location, new.description); END"
+    ),
+}
+SQLITE_REBUILD = f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')"
+SQLITE_UNINSTALL = [
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_ai",
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_ad",
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_au",
+    f"DROP TABLE IF EXISTS {FTS_TABLE}",
+]
+
+FALLBACK_FIELDS = ('name', 'description', 'location')
+
+
+def _execute(connection, statements):
+    with connection.cursor() as cursor:
+        for statement in statements:
+            cursor.execute(statement)
+
+
+def _sqlite_has_fts5(connection):
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT sqlite_compileoption_used('ENABLE_FTS5')")
+        enabled = cursor.fetchone()[0]
+    if enabled:
+        return True
+    # Builds may ship FTS5 without reporting the compile option
+    try:
+        _execute(connection, ["CREATE VIRTUAL TABLE temp.fts5_probe USING fts5(probe)"])
+        _execute(connection, ["DROP TABLE temp.fts5_probe"])
+    except Exception:
+        return False
+    return True
+
+
+def _install_sqlite_triggers(connection):
+    """
+    Create missing triggers and replace outdated ones; returns whether any
+    were missing, in which case the index may have drifted from the table.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT name, sql FROM sqlite_master WHERE type = 'trigger' AND tbl_name = %s", [TABLE])
+        existing = dict(cursor.fetchall())
+
+    statements, missing = [], False
+    for name, sql in SQLITE_TRIGGERS.items():
+        if name not in existing:
+            missing = True
+        elif existing[name] == sql:
+            continue
+        else:
+            statements.append(f"DROP TRIGGER {name}")
+        statements.append(sql)
+    _execute(connection, statements)
+    return missing
+
+
+def install_search_index(connection):
+    """
+    Create (or repair) the search index for the connection's backend.
+
+    On SQLite the FTS index is only rebuilt when triggers had gone missing,
+    so running this after every migration costs a catalogue read.
+    """
+    if connection.vendor == 'postgresql':
+        _execute(connection, POSTGRES_INSTALL)
+    elif connection.vendor == 'sqlite' and _sqlite_has_fts5(connection):
+        _execute(connection, SQLITE_INSTALL)
+        if _install_sqlite_triggers(connection):
+            _execute(connection, [SQLITE_REBUILD])
+
+
+def uninstall_search_index(connection):
+    """Drop the search index for the connection's backend."""
+    if connection.vendor == 'postgresql':
+        _execute(connection, POSTGRES_UNINSTALL)
+    elif connection.vendor == 'sqlite':
+        _execute(connection, SQLITE_UNINSTALL)
+
+
+_fts_ready_aliases = set()
+
+
+def _sqlite_fts_ready(connection):
+    """Whether the FTS5 table exists; positive answers are remembered."""
+    if connection.alias in _fts_ready_aliases:
+        return True
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = %s", [FTS_TABLE]
+        )
+        ready = cursor.fetchone() is not None
+    if ready:
+        _fts_ready_aliases.add(connection.alias)
+    return ready
+
+
+def _sqlite_match_expression(terms):
+    """Turn free text into an FTS5 query of quoted prefix terms."""
+    tokens = re.findall(r'\w+', terms)
+    return ' '.join(f'"{token}"*' for token in tokens)
+
+
+def search_events(queryset, terms):
+    """
+    Filter ``queryset`` to events matching ``terms``.
+
+    Matches are annotated with ``search_rank`` (higher is better) so callers
+    can order by relevance.
+    """
+    connection = connections[queryset.db]
+
+    if connection.vendor == 'postgresql':
+        from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVectorField
+        
+        query = SearchQuery(terms, config='english', search_type='websearch')
+        # search_vector is a generated column the ORM does not manage
+        vector = RawSQL(f'{TABLE}.search_vector', [], output_field=SearchVectorField())
+        return queryset.annotate(search_vector=vector).filter(
+            search_vector=query
+        ).annotate(search_rank=SearchRank(F('search_vector'), query, cover_density=True))
+
+    if connection.vendor == 'sqlite' and _sqlite_fts_ready(connection):
+        match = _sqlite_match_expression(terms)
+        if not match:
+            return queryset.annotate(search_rank=Value(0.0, output_field=FloatField())).none()
+        # Drive the query from the FTS table; its rank column is bm25 (lower is better)
+        return queryset.extra(
+            tables=[FTS_TABLE],
+            where=[f"{FTS_TABLE}.rowid = {TABLE}.id", f"{FTS_TABLE} MATCH %s"],
+            params=[match],
+            select={'search_rank': f"-{FTS_TABLE}.rank"},
+        )
+
+    # No full-text support: plain substring matching, weighted like the index
+    condition = Q()
+    for field in FALLBACK_FIELDS:
+        condition |= Q(**{f'{field}__icontains': terms})
+    return queryset.filter(condition).annotate(search_rank=Case(
+        When(name__icontains=terms, then=Value(3)),
+        When(location__icontains=terms, then=Value(2)),
+        default=Value(1),
+        output_field=IntegerField(),
+    ))
+
+
+class EventSearchFilter(BaseFilterBackend):
+    """
+    Full-text search filter for event lists.
+
+    Uses the ``search`` query parameter like DRF's ``SearchFilter``. Results
+    are ordered by relevance unless the client asks for an explicit ordering.
+    """
+
+    search_param = api_settings.SEARCH_PARAM
+    ordering_param = api_settings.ORDERING_PARAM
+
+    def filter_queryset(self, request, queryset, view):
+        terms = request.query_params.get(self.search_param, '').strip()
+        if not terms:
+            return queryset
+
+        queryset = search_events(queryset, terms)
+        if not request.query_params.get(self.ordering_param):
+            queryset = queryset.order_by('-search_rank', 'start_time', 'id')
+        return queryset
@@ -1,7 +1,16 @@
 from rest_framework import serializers
+from . import qr_tokens
+from .images import IMAGE_ENCODINGS, IMAGE_VARIANTS, get_variant_url
 from .models import Event
 
 
+def _absolute_url(serializer, url):
+    request = serializer.context.get('request')
+    if url and request is not None:
+        return request.build_absolute_uri(url)
+    return url
+
+
 class EventSerializer(serializers.ModelSerializer):
     """Serializer for the Event model."""
     
@@ -9,19 +18,30 @@ class EventSerializer(serializers.ModelSerializer):
     is_full = serializers.BooleanField(read_only=True)
     available_spots = serializers.IntegerField(read_only=True)
     is_qr_code_valid = serializers.BooleanField(read_only=True)
+    image_variants = serializers.SerializerMethodField()
     
     class Meta:
         model = Event
         fields = [
             'id', 'name', 'description', 'location', 'start_time', 'end_time',
-            'capacity', 'active', 'background_image', 'created_at', 'updated_at',
+            'capacity', 'active', 'background_image', 'image_variants', 'created_at', 'updated_at',
             'is_past', 'is_full', 'available_spots', 'qr_code', 'qr_code_generated_at',
-            'is_qr_code_valid'
+            'is_qr_code_valid', 'registered_count', 'checked_in_count', 'cancelled_count'
         ]
         read_only_fields = [
-            'id', 'created_at', 'updated_at', 'qr_code', 'qr_code_generated_at'
+            'id', 'created_at', 'updated_at', 'qr_code', 'qr_code_generated_at',
+            'registered_count', 'checked_in_count', 'cancelled_count'
         ]
     
+    def get_fields(self):
+        fields = super().get_fields()
+        if qr_tokens.signed_mode():
+            # Signed codes are issued by EventQRCodeView and never stored,
+            # so the stored code and its validity mean nothing
+            for name in ('qr_code', 'qr_code_generated_at', 'is_qr_code_valid'):
+                fields.pop(name, None)
+        return fields
+    
     def validate(self, attrs):
         # Validate that end_time is after start_time
         if 'start_time' in attrs and 'end_time' in attrs:
@@ -35,6 +55,15 @@ class EventSerializer(serializers.ModelSerializer):
                 raise serializers.ValidationError({"end_time": "End time must be after start time."})
         
         return attrs
+    
+    def get_image_variants(self, obj):
+        """URLs of each background image variant by encoding; the original's while they are pending."""
+        if not obj.background_image:
+            return None
+        return {
+            name: {encoding: _absolute_url(self, get_variant_url(obj, name, encoding)) for encoding in IMAGE_ENCODINGS}
+            for name in IMAGE_VARIANTS
+        }
 
 
 class EventListSerializer(serializers.ModelSerializer):
@@ -42,10 +71,35 @@ class EventListSerializer(serializers.ModelSerializer):
     
     is_past = serializers.BooleanField(read_only=True)
     is_full = serializers.BooleanField(read_only=True)
+    # Card-sized variants: a JPEG, and the smaller WebP for browsers that take it
+    background_image = serializers.SerializerMethodField()
+    background_image_webp = serializers.SerializerMethodField()
     
     class Meta:
         model = Event
         fields = [
             'id', 'name', 'location', 'start_time', 'end_time',
-            'active', 'background_image', 'is_past', 'is_full'
-        ] 
\ No newline at end of file
+            'active', 'background_image', 'background_image_webp', 'is_past', 'is_full'
+        ]
+    
+    def get_background_image(self, obj):
+        return _absolute_url(self, get_variant_url(obj, 'card', 'jpeg'))
+    
+    def get_background_image_webp(self, obj):
+        return _absolute_url(self, get_variant_url(obj, 'card', 'webp'))
+
+
+class EventImportSerializer(EventSerializer):
+    """Serializer for one row of a bulk event import."""
+    
+    class Meta(EventSerializer.Meta):
+        fields = ['name', 'description', 'location', 'start_time', 'end_time', 'capacity', 'active']
+        read_only_fields = []
+
+
+class EventImportOptionsSerializer(serializers.Serializer):
+    """Serializer for the query parameters of a bulk event import."""
+    
+    import_format = serializers.ChoiceField(choices=['csv', 'json', 'ndjson'], required=False)
+    dry_run = serializers.BooleanField(default=False)
+    atomic = serializers.BooleanField(default=False)
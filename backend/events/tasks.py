@@ -0,0 +1,25 @@
+"""Background tasks for events: image variants and QR code pre-rendering."""
+
+from taskqueue.queue import task
+from . import images
+from .models import Event
+from .qr import DEFAULT_BOX_SIZE, QR_IMAGE_FORMATS, get_qr_code_image
+
+
+@task
+def render_image_variants(event_id):
+    """Render the resized variants of an event's background image."""
+    images.generate_image_variants(event_id)
+
+
+@task(max_attempts=1)
+def render_qr_code_images(event_id):
+    """
+    Render an event's new QR code into the cache in every format, so the
+    first kiosk request does not pay for it. Needs a shared cache to help
+    other processes.
+    """
+    event = Event.objects.filter(pk=event_id).only('qr_code', 'qr_code_generated_at').first()
+    if event is not None and event.is_qr_code_valid:
+        for image_format in QR_IMAGE_FORMATS:
+            get_qr_code_image(event.qr_code, image_format, DEFAULT_BOX_SIZE, event.qr_code_expires_at)
@@ -0,0 +1,16 @@
+from datetime import timedelta
+
+import factory
+from django.utils import timezone
+
+from events.models import Event
+
+
+class EventFactory(factory.django.DjangoModelFactory):
+    class Meta:
+        model = Event
+
+    name = factory.Sequence(lambda n: f'Event {n}')
+    location = 'Main hall'
+    start_time = factory.LazyFunction(lambda: timezone.now() + timedelta(days=1))
+    end_time = factory.LazyAttribute(lambda event: event.start_time + timedelta(hours=2))
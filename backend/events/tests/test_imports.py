@@ -0,0 +1,40 @@
+import io
+import json
+
+import pytest
+
+from events.imports import EventImport
+from events.models import Event
+from .factories import EventFactory
+
+
+class ConcurrentEditImport(EventImport):
+    """Lets another admin edit the events after the import has loaded them."""
+
+    def load_events(self, batch):
+        found = super().load_events(batch)
+        Event.objects.filter(pk__in=[event.pk for _, _, event in found]).update(
+            location='Edited', description='Edited'
+        )
+        return found
+
+
+def ndjson(rows):
+    return io.BytesIO(''.join(json.dumps(row) + '\n' for row in rows).encode())
+
+
+@pytest.mark.django_db
+def test_update_only_writes_the_columns_each_row_sets():
+    renamed, moved = EventFactory(), EventFactory()
+    rows = [
+        {'id': renamed.pk, 'name': 'Renamed'},
+        {'id': moved.pk, 'location': 'Moved'},
+    ]
+
+    result = ConcurrentEditImport('update').run(ndjson(rows), 'ndjson')
+
+    assert result['updated'] == 2
+    renamed.refresh_from_db()
+    moved.refresh_from_db()
+    assert (renamed.name, renamed.location, renamed.description) == ('Renamed', 'Edited', 'Edited')
+    assert (moved.location, moved.description) == ('Moved', 'Edited')
@@ -0,0 +1,59 @@
+import re
+
+import pytest
+from django.urls import reverse
+from django.utils import timezone
+
+from users.tests.factories import UserFactory
+from .factories import EventFactory
+
+QR_CODE_FIELDS = ('qr_code', 'qr_code_generated_at', 'is_qr_code_valid')
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('mode, hidden', [('signed', True), ('uuid', False)])
+def test_event_detail_only_shows_stored_codes_in_uuid_mode(api_client, settings, mode, hidden):
+    settings.EVENT_QR_CODE_MODE = mode
+    event = EventFactory()
+
+    response = api_client.get(reverse('event-detail', kwargs={'pk': event.pk}))
+
+    assert response.status_code == 200
+    assert all((name in response.data) != hidden for name in QR_CODE_FIELDS)
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('mode', ['signed', 'uuid'])
+def test_generated_code_message_gives_its_lifetime(api_client, settings, mode):
+    settings.EVENT_QR_CODE_MODE = mode
+    api_client.force_authenticate(UserFactory(role='admin'))
+
+    response = api_client.post(reverse('event-qr-code', kwargs={'pk': EventFactory().pk}))
+
+    assert response.status_code == 200
+    minutes = int(re.search(r'expire in (\d+) minute', response.data['message']).group(1))
+    lifetime = (response.data['qr_code_expires_at'] - timezone.now()).total_seconds() / 60
+    assert abs(minutes - lifetime) <= 1
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('name', ['event-detail', 'admin-event-list'])
+def test_replacing_a_code_changes_the_etag(api_client, settings, name, django_capture_on_commit_callbacks):
+    settings.EVENT_QR_CODE_MODE = 'uuid'
+    api_client.force_authenticate(UserFactory(role='admin'))
+    event = EventFactory()
+    url = reverse(name, kwargs={'pk': event.pk} if name == 'event-detail' else {})
+    qr_code_url = reverse('event-qr-code', kwargs={'pk': event.pk})
+    # Cached responses are invalidated once the write commits
+    with django_capture_on_commit_callbacks(execute=True):
+        api_client.post(qr_code_url)
+    etag = api_client.get(url)['ETag']
+
+    # Replacing a code that is still valid
+    with django_capture_on_commit_callbacks(execute=True):
+        api_client.post(qr_code_url)
+
+    response = api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 200
+    event.refresh_from_db()
+    assert str(event.qr_code) in response.content.decode()
@@ -6,8 +6,11 @@ from .views import (
     EventUpdateView,
     EventDeleteView,
     AdminEventListView,
-    EventQRCodeView
+    EventBulkImportView,
+    EventQRCodeView,
+    LiveTicketView
 )
+from .live import event_feed
 
 urlpatterns = [
     path('', EventListView.as_view(), name='event-list'),
@@ -16,5 +19,10 @@ urlpatterns = [
     path('<int:pk>/update/', EventUpdateView.as_view(), name='event-update'),
     path('<int:pk>/delete/', EventDeleteView.as_view(), name='event-delete'),
     path('admin/', AdminEventListView.as_view(), name='admin-event-list'),
+    path('bulk/create/', EventBulkImportView.as_view(operation='create'), name='event-bulk-create'),
+    path('bulk/update/', EventBulkImportView.as_view(operation='update'), name='event-bulk-update'),
+    path('bulk/deactivate/', EventBulkImportView.as_view(operation='deactivate'), name='event-bulk-deactivate'),
     path('<int:pk>/qr-code/', EventQRCodeView.as_view(), name='event-qr-code'),
+    path('<int:pk>/live/', event_feed, name='event-live'),
+    path('<int:pk>/live/ticket/', LiveTicketView.as_view(), name='event-live-ticket'),
 ] 
\ No newline at end of file
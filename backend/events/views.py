@@ -1,13 +1,35 @@
 from rest_framework import generics, permissions, filters, status
 from rest_framework.response import Response
 from rest_framework.views import APIView
+from rest_framework.exceptions import ValidationError
+from rest_framework.parsers import MultiPartParser
 from django_filters.rest_framework import DjangoFilterBackend
+from django.db.models import Count, Q
 from django.shortcuts import get_object_or_404
-import qrcode
-import io
-from django.http import HttpResponse
+from django.template.defaultfilters import pluralize
+from django.http import HttpResponse, HttpResponseNotModified
+from django.utils import timezone
+from django.utils.http import parse_etags
+from campus_connect.async_views import AsyncListAPIView, AsyncRetrieveAPIView
+from campus_connect.caching import AsyncCachedResponseMixin
+from campus_connect.conditional import AsyncConditionalGetMixin, ConditionalGetMixin
+from campus_connect.pagination import EventPagination, AdminEventPagination
+from .caching import LIST_VERSION_KEY, event_version_key
 from .models import Event
-from .serializers import EventSerializer, EventListSerializer
+from .serializers import EventSerializer, EventListSerializer, EventImportOptionsSerializer
+from campus_connect.imports import detect_format, get_import_stream
+from .imports import EventImport
+from .search import EventSearchFilter
+from .qr import (
+    QR_IMAGE_FORMATS,
+    DEFAULT_BOX_SIZE,
+    MIN_BOX_SIZE,
+    MAX_BOX_SIZE,
+    qr_code_etag,
+    get_qr_code_image
+)
+from .qr_tokens import accepted_for, expires_in
+from .live import issue_ticket, ticket_max_age
 
 
 class IsAdminUser(permissions.BasePermission):
@@ -17,16 +39,34 @@ class IsAdminUser(permissions.BasePermission):
         return request.user and request.user.role == 'admin'
 
 
-class EventListView(generics.ListAPIView):
-    """View for listing events."""
+def event_clock_aggregates(prefix=''):
+    """
+    Aggregates that track event fields derived from the current time
+    (``is_past``, ``is_qr_code_valid``), for conditional GET validators.
     
+    Args:
+        prefix: Lookup path to the event, e.g. ``'event__'``
+    """
+    now = timezone.now()
+    return {
+        'past': Count('pk', filter=Q(**{f'{prefix}end_time__lt': now})),
+        'qr_code_valid': Count('pk', filter=Q(**{
+            f'{prefix}qr_code_generated_at__gt': now - Event.QR_CODE_LIFETIME
+        })),
+    }
+
+
+class EventListView(AsyncConditionalGetMixin, AsyncCachedResponseMixin, AsyncListAPIView):
+    """View for listing events (async)."""
+    
+    cache_prefix = 'event-list'
     queryset = Event.objects.filter(active=True)
     serializer_class = EventListSerializer
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
+    filter_backends = [DjangoFilterBackend, filters.OrderingFilter, EventSearchFilter]
     filterset_fields = ['active']
-    search_fields = ['name', 'description', 'location']
     ordering_fields = ['start_time', 'end_time', 'name']
     ordering = ['start_time']
+    pagination_class = EventPagination
     permission_classes = [permissions.AllowAny]
     
     def get_queryset(self):
@@ -35,18 +75,30 @@ class EventListView(generics.ListAPIView):
         # Filter by upcoming events
         upcoming = self.request.query_params.get('upcoming')
         if upcoming and upcoming.lower() == 'true':
-            from django.utils import timezone
             queryset = queryset.filter(start_time__gt=timezone.now())
         
         return queryset
+    
+    def get_cache_version_keys(self):
+        return [LIST_VERSION_KEY]
+    
+    def get_etag_aggregates(self):
+        return event_clock_aggregates()
 
 
-class EventDetailView(generics.RetrieveAPIView):
-    """View for retrieving event details."""
+class EventDetailView(AsyncConditionalGetMixin, AsyncCachedResponseMixin, AsyncRetrieveAPIView):
+    """View for retrieving event details (async)."""
     
+    cache_prefix = 'event-detail'
     queryset = Event.objects.all()
     serializer_class = EventSerializer
     permission_classes = [permissions.AllowAny]
+    
+    def get_cache_version_keys(self):
+        return [event_version_key(self.kwargs['pk'])]
+    
+    def get_etag_aggregates(self):
+        return event_clock_aggregates()
 
 
 class EventCreateView(generics.CreateAPIView):
@@ -73,20 +125,79 @@ class EventDeleteView(generics.DestroyAPIView):
     permission_classes = [permissions.IsAuthenticated, IsAdminUser]
 
 
-class AdminEventListView(generics.ListAPIView):
+class EventBulkImportView(APIView):
+    """
+    View for creating, updating or deactivating events in bulk (admin only).
+    
+    Takes a CSV, JSON or NDJSON file, either as the raw request body or as
+    the ``file`` field of a multipart upload, and reports errors per row.
+    """
+    
+    permission_classes = [permissions.IsAuthenticated, IsAdminUser]
+    parser_classes = [MultiPartParser]
+    operation = None
+    
+    def post(self, request):
+        options = EventImportOptionsSerializer(data=request.query_params)
+        options.is_valid(raise_exception=True)
+        options = options.validated_data
+        
+        upload = get_import_stream(request)
+        if upload is None:
+            raise ValidationError({"file": "No file was submitted."})
+        stream, filename, content_type = upload
+        
+        import_format = options.get('import_format') or detect_format(content_type, filename)
+        if import_format is None:
+            raise ValidationError({"import_format": "Pass csv, json or ndjson, or send a matching content type."})
+        
+        event_import = EventImport(self.operation, dry_run=options['dry_run'], atomic=options['atomic'])
+        result = event_import.run(stream, import_format)
+        
+        rejected = options['atomic'] and result['error_count']
+        return Response(result, status=status.HTTP_400_BAD_REQUEST if rejected else status.HTTP_200_OK)
+
+
+class AdminEventListView(ConditionalGetMixin, generics.ListAPIView):
     """View for listing all events (admin only)."""
     
     queryset = Event.objects.all()
     serializer_class = EventSerializer
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
+    filter_backends = [DjangoFilterBackend, filters.OrderingFilter, EventSearchFilter]
     filterset_fields = ['active']
-    search_fields = ['name', 'description', 'location']
     ordering_fields = ['start_time', 'end_time', 'name', 'created_at']
     ordering = ['-created_at']
+    pagination_class = AdminEventPagination
     permission_classes = [permissions.IsAuthenticated, IsAdminUser]
+    
+    def get_etag_aggregates(self):
+        return event_clock_aggregates()
+
+
+class QRCodeImageMixin:
+    """Reads the rendering options of QR code image endpoints."""
+    
+    def _image_options(self, request):
+        """Read the optional image_format and size query parameters."""
+        image_format = request.query_params.get('image_format', 'png').lower()
+        if image_format not in QR_IMAGE_FORMATS:
+            raise ValidationError({
+                "image_format": f"Must be one of: {', '.join(QR_IMAGE_FORMATS)}."
+            })
+        
+        try:
+            box_size = int(request.query_params.get('size', DEFAULT_BOX_SIZE))
+        except ValueError:
+            raise ValidationError({"size": "Must be an integer."})
+        if not MIN_BOX_SIZE <= box_size <= MAX_BOX_SIZE:
+            raise ValidationError({
+                "size": f"Must be between {MIN_BOX_SIZE} and {MAX_BOX_SIZE}."
+            })
+        
+        return image_format, box_size
 
 
-class EventQRCodeView(APIView):
+class EventQRCodeView(QRCodeImageMixin, APIView):
     """View for generating a QR code for an event (admin only)."""
     
     permission_classes = [permissions.IsAuthenticated, IsAdminUser]
@@ -96,48 +207,65 @@ class EventQRCodeView(APIView):
         event = get_object_or_404(Event, pk=pk)
         
         # Generate a new QR code
-        event.generate_qr_code()
+        qr_code = event.generate_qr_code()
+        minutes = max(1, round(accepted_for(qr_code) / 60))
         
         return Response({
-            'qr_code': event.qr_code,
-            'qr_code_generated_at': event.qr_code_generated_at,
-            'message': 'QR code generated successfully. It will expire in 10 minutes.'
+            'qr_code': qr_code.code,
+            'qr_code_generated_at': qr_code.issued_at,
+            'qr_code_expires_at': qr_code.expires_at,
+            'message': f'QR code generated successfully. It will expire in {minutes} minute{pluralize(minutes)}.'
         })
     
     def get(self, request, pk):
         """Get the QR code image for the event."""
         event = get_object_or_404(Event, pk=pk)
+        qr_code = event.get_qr_code()
         
-        # Check if QR code exists
-        if not event.qr_code:
+        # Check if QR code exists (signed tokens always do)
+        if qr_code is None and not event.qr_code:
             return Response(
                 {"detail": "No QR code has been generated for this event."},
                 status=status.HTTP_404_NOT_FOUND
             )
         
         # Check if QR code is valid
-        if not event.is_qr_code_valid:
+        if qr_code is None:
             return Response(
                 {"detail": "QR code has expired. Please generate a new one."},
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        # Generate QR code image
-        qr = qrcode.QRCode(
-            version=1,
-            error_correction=qrcode.constants.ERROR_CORRECT_L,
-            box_size=10,
-            border=4,
-        )
-        qr.add_data(event.qr_code)
-        qr.make(fit=True)
+        image_format, box_size = self._image_options(request)
+        etag = qr_code_etag(qr_code.code, image_format, box_size)
         
-        img = qr.make_image(fill_color="black", back_color="white")
+        # Kiosks poll this endpoint, so answer repeat requests without rendering
+        if etag in parse_etags(request.headers.get('If-None-Match', '')):
+            response = HttpResponseNotModified()
+        else:
+            image = get_qr_code_image(qr_code.code, image_format, box_size, qr_code.expires_at)
+            response = HttpResponse(image, content_type=QR_IMAGE_FORMATS[image_format])
         
-        # Save QR code to buffer
-        buffer = io.BytesIO()
-        img.save(buffer, format="PNG")
-        buffer.seek(0)
-        
-        # Return QR code as image
-        return HttpResponse(buffer, content_type="image/png") 
\ No newline at end of file
+        # Until the screen should show the next code
+        response['ETag'] = etag
+        response['Cache-Control'] = f'private, max-age={expires_in(qr_code)}'
+        return response
+
+
+class LiveTicketView(APIView):
+    """
+    View for a stream ticket to an event's live feed (admin only).
+    
+    Browsers open the feed with ``?ticket=`` because EventSource cannot
+    send an ``Authorization`` header; a ticket is fetched for every
+    (re)connection.
+    """
+    
+    permission_classes = [permissions.IsAuthenticated, IsAdminUser]
+    
+    def post(self, request, pk):
+        get_object_or_404(Event.objects.only('id'), pk=pk)
+        return Response({
+            'ticket': issue_ticket(request.user, pk),
+            'expires_in': ticket_max_age(),
+        })
@@ -0,0 +1,33 @@
+"""
+Gunicorn configuration for production.
+
+Every value can be overridden from the environment, so the same image runs
+on machines of any size.
+"""
+
+import multiprocessing
+import os
+
+bind = os.environ.get('GUNICORN_BIND', '0.0.0.0:8000')
+
+# Uvicorn workers serve the ASGI application, async views and live streams
+worker_class = os.environ.get('GUNICORN_WORKER_CLASS', 'uvicorn.workers.UvicornWorker')
+workers = int(os.environ.get('WEB_CONCURRENCY', multiprocessing.cpu_count() * 2 + 1))
+# Only used by the threaded sync worker class (gthread)
+threads = int(os.environ.get('GUNICORN_THREADS', 1))
+
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 30))
+graceful_timeout = int(os.environ.get('GUNICORN_GRACEFUL_TIMEOUT', 30))
+keepalive = int(os.environ.get('GUNICORN_KEEPALIVE', 5))
+
+# Recycle workers periodically to bound slow memory growth; the jitter keeps
+# them from restarting at the same time
+max_requests = int(os.environ.get('GUNICORN_MAX_REQUESTS', 10000))
+max_requests_jitter = int(os.environ.get('GUNICORN_MAX_REQUESTS_JITTER', 1000))
+
+accesslog = os.environ.get('GUNICORN_ACCESS_LOG', '-')
+errorlog = '-'
+loglevel = os.environ.get('LOG_LEVEL', 'info').lower()
+
+# Share the application code between workers
+preload_app = os.environ.get('GUNICORN_PRELOAD', 'True') == 'True'
@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Registration
+from .models import Registration, WaitlistEntry
 
 
 @admin.register(Registration)
@@ -8,9 +8,10 @@ class RegistrationAdmin(admin.ModelAdmin):
     
     list_display = ('admin_user', 'event', 'status', 'checked_in_at', 'created_at')
     list_filter = ('status',)
-    search_fields = ('admin_user__email', 'admin_user__name', 'event__name', 'qr_code')
+    list_select_related = ('admin_user', 'event')
+    search_fields = ('admin_user__email', 'admin_user__name', 'event__name', 'attendance_code')
     date_hierarchy = 'created_at'
-    readonly_fields = ('qr_code', 'qr_code_expires_at', 'created_at', 'updated_at')
+    readonly_fields = ('ticket', 'created_at', 'updated_at')
     
     fieldsets = (
         (None, {
@@ -19,11 +20,21 @@ class RegistrationAdmin(admin.ModelAdmin):
         ('Status', {
             'fields': ('status', 'checked_in_at')
         }),
-        ('QR Code', {
-            'fields': ('qr_code', 'qr_code_expires_at')
+        ('Ticket', {
+            'fields': ('attendance_code', 'ticket')
         }),
         ('Metadata', {
             'fields': ('created_at', 'updated_at'),
             'classes': ('collapse',)
         }),
-    ) 
\ No newline at end of file
+    ) 
+
+
+@admin.register(WaitlistEntry)
+class WaitlistEntryAdmin(admin.ModelAdmin):
+    """Admin interface for the WaitlistEntry model."""
+    
+    list_display = ('admin_user', 'event', 'created_at')
+    search_fields = ('admin_user__email', 'admin_user__name', 'event__name')
+    list_select_related = ('admin_user', 'event')
+    readonly_fields = ('created_at',)
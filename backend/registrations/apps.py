@@ -3,4 +3,30 @@ from django.apps import AppConfig
 
 class RegistrationsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
-    name = 'registrations' 
\ No newline at end of file
+    name = 'registrations'
+
+    def ready(self):
+        from django.db.models.signals import post_delete
+        from .models import Registration
+        post_delete.connect(release_deleted_registration, sender=Registration)
+
+
+def release_deleted_registration(sender, instance, origin=None, **kwargs):
+    """
+    Uncount a deleted registration and hand its spot to the waitlist.
+
+    A signal also covers queryset and cascade deletes, which skip
+    ``delete()``. Registrations deleted along with their event are skipped.
+    """
+    from django.db.models import QuerySet
+    from events.models import Event
+    from .models import WaitlistEntry
+
+    origin_model = origin.model if isinstance(origin, QuerySet) else type(origin)
+    if issubclass(origin_model, Event):
+        return
+
+    status = getattr(instance, '_counted_status', instance.status)
+    Event.shift_registration_count(instance.event_id, status)
+    if status in ('registered', 'checked_in'):
+        WaitlistEntry.promote_next(instance.event_id)
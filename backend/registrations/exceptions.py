@@ -0,0 +1,44 @@
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+
+class RegistrationError(Exception):
+    """Base class for registration failures raised by the model layer."""
+
+    default_message = "Registration failed."
+
+    def __init__(self, message=None):
+        self.message = message or self.default_message
+        super().__init__(self.message)
+
+
+class EventUnavailable(RegistrationError):
+    """The event does not exist or no longer accepts registrations."""
+
+    default_message = "Event is not open for registration."
+
+
+class EventFull(RegistrationError):
+    """The event has no spots left."""
+
+    default_message = "Event is at full capacity."
+
+
+class AlreadyRegistered(RegistrationError):
+    """The user already holds a registration for the event."""
+
+    default_message = "You are already registered for this event."
+
+
+class AlreadyWaitlisted(RegistrationError):
+    """The user is already on the event's waitlist."""
+
+    default_message = "You are already on the waitlist for this event."
+
+
+class RegistrationConflict(APIException):
+    """API error returned when a registration loses a race for a spot."""
+
+    status_code = status.HTTP_409_CONFLICT
+    default_detail = "Registration conflicts with the current state of the event."
+    default_code = 'conflict'
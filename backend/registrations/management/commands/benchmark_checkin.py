@@ -0,0 +1,108 @@
+import time
+from datetime import timedelta
+
+from asgiref.sync import async_to_sync
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.utils import timezone
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from events.models import Event
+from registrations.models import Registration
+from registrations.views import AttendanceConfirmView, BulkCheckInView
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    """
+    Compare check-in throughput of the single-scan endpoint, with signed and
+    with stored UUID event QR codes, against the bulk sync endpoint. Runs
+    inside a transaction that is rolled back.
+    """
+
+    help = 'Benchmark single-scan vs bulk check-in.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--attendees', type=int, default=2000, help='Registrations per event.')
+        parser.add_argument('--batch-size', type=int, default=500, help='Scans per bulk request.')
+
+    def handle(self, *args, **options):
+        attendees = options['attendees']
+        batch_size = options['batch_size']
+
+        with transaction.atomic():
+            admin = User.objects.create_user(email='bench-admin@example.com', name='Bench', role='admin')
+            users = User.objects.bulk_create([
+                User(email=f'bench-{i}@example.com', name=f'Bench {i}') for i in range(attendees)
+            ])
+            bulk_event = self.create_event('bulk', users)
+
+            factory = APIRequestFactory()
+
+            # The single-scan endpoint is an async view; it is timed with both
+            # kinds of event QR code
+            single_view = async_to_sync(AttendanceConfirmView.as_view())
+            single_runs = []
+            for mode in ('signed', 'uuid'):
+                with override_settings(EVENT_QR_CODE_MODE=mode):
+                    event = self.create_event(f'single, {mode}', users)
+                    qr_code = event.generate_qr_code().code
+                with CaptureQueriesContext(connection) as queries:
+                    started = time.perf_counter()
+                    for user in users:
+                        request = factory.post(
+                            '/api/v1/registrations/confirm-attendance/',
+                            {'event_qr_code': qr_code}, format='json'
+                        )
+                        force_authenticate(request, user=user)
+                        single_view(request)
+                    duration = time.perf_counter() - started
+                single_runs.append((f'Single-scan ({mode} QR)', event, duration, len(queries.captured_queries)))
+
+            bulk_view = BulkCheckInView.as_view()
+            scans = [{'user_id': user.pk, 'scanned_at': timezone.now().isoformat()} for user in users]
+            with CaptureQueriesContext(connection) as bulk_queries:
+                started = time.perf_counter()
+                for offset in range(0, len(scans), batch_size):
+                    request = factory.post(
+                        f'/api/v1/registrations/admin/event/{bulk_event.pk}/check-in/',
+                        {'scans': scans[offset:offset + batch_size]}, format='json'
+                    )
+                    force_authenticate(request, user=admin)
+                    bulk_view(request, event_id=bulk_event.pk)
+                bulk_duration = time.perf_counter() - started
+
+            for label, event, *_ in [*single_runs, ('Bulk', bulk_event)]:
+                checked_in = Registration.objects.filter(event=event, status='checked_in').count()
+                if checked_in != attendees:
+                    self.stderr.write(f'{label}: only {checked_in} of {attendees} checked in')
+
+            transaction.set_rollback(True)
+
+        for label, event, duration, queries in single_runs:
+            self.report(label, attendees, duration, queries)
+        self.report(f'Bulk ({batch_size}/request)', attendees, bulk_duration, len(bulk_queries.captured_queries))
+        self.stdout.write(f'Speed-up: {single_runs[0][2] / bulk_duration:.1f}x')
+
+    def create_event(self, label, users):
+        now = timezone.now()
+        event = Event.objects.create(
+            name=f'Check-in benchmark ({label})',
+            location='Lecture hall',
+            start_time=now,
+            end_time=now + timedelta(hours=2),
+            registered_count=len(users),
+        )
+        Registration.objects.bulk_create(
+            [Registration(admin_user=user, event=event) for user in users], batch_size=1000
+        )
+        return event
+
+    def report(self, label, scans, duration, queries):
+        self.stdout.write(
+            f'{label:<24} {scans / duration:>9.0f} scans/s  '
+            f'{duration:>7.2f}s  {queries / scans:>5.2f} queries/scan'
+        )
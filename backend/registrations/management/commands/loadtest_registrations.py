@@ -0,0 +1,116 @@
+import threading
+import time
+import uuid
+from collections import Counter
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.utils import timezone
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from events.models import Event
+from registrations.models import Registration
+from registrations.views import RegistrationCreateView
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    """
+    Fire concurrent registration requests at a single event and verify
+    that capacity is never exceeded.
+
+    Runs against the configured database (use a local Postgres or a file
+    based SQLite database). All rows it creates are removed afterwards
+    unless --keep is given.
+    """
+
+    help = 'Concurrent load test for the registration endpoint.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--threads', type=int, default=50, help='Number of concurrent clients.')
+        parser.add_argument('--requests', type=int, default=4, help='Requests per client.')
+        parser.add_argument('--capacity', type=int, default=20, help='Capacity of the test event.')
+        parser.add_argument('--keep', action='store_true', help='Keep the generated event and users.')
+
+    def handle(self, *args, **options):
+        threads = options['threads']
+        per_thread = options['requests']
+        capacity = options['capacity']
+
+        run_id = uuid.uuid4().hex[:8]
+        now = timezone.now()
+        event = Event.objects.create(
+            name=f'Load test {run_id}',
+            location='Load test',
+            start_time=now + timedelta(days=1),
+            end_time=now + timedelta(days=1, hours=2),
+            capacity=capacity,
+        )
+        User.objects.bulk_create([
+            User(email=f'loadtest-{run_id}-{i}@example.com', name=f'Load test {i}')
+            for i in range(threads)
+        ])
+        users = list(User.objects.filter(email__startswith=f'loadtest-{run_id}-'))
+
+        factory = APIRequestFactory()
+        view = RegistrationCreateView.as_view()
+        barrier = threading.Barrier(len(users))
+        results = Counter()
+        latencies = []
+        lock = threading.Lock()
+
+        def client(user):
+            try:
+                barrier.wait()
+                for _ in range(per_thread):
+                    request = factory.post('/api/v1/registrations/create/', {'event_id': event.pk}, format='json')
+                    force_authenticate(request, user=user)
+                    started = time.perf_counter()
+                    try:
+                        outcome = view(request).status_code
+                    except Exception as exc:
+                        outcome = type(exc).__name__
+                    elapsed = time.perf_counter() - started
+                    with lock:
+                        results[outcome] += 1
+                        latencies.append(elapsed)
+            finally:
+                connection.close()
+
+        workers = [threading.Thread(target=client, args=(user,)) for user in users]
+        started = time.perf_counter()
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        duration = time.perf_counter() - started
+
+        event.refresh_from_db()
+        stored = Registration.objects.filter(event=event).exclude(status='cancelled').count()
+        latencies.sort()
+
+        self.stdout.write(f'Requests:   {sum(results.values())} in {duration:.2f}s')
+        self.stdout.write(f'Outcomes:   {dict(results)}')
+        if latencies:
+            p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+            self.stdout.write(f'Latency:    p50={latencies[len(latencies) // 2] * 1000:.1f}ms p99={p99 * 1000:.1f}ms')
+        self.stdout.write(f'Capacity:   {capacity}')
+        self.stdout.write(f'Stored:     {stored}')
+        self.stdout.write(f'Counter:    {event.registration_count}')
+
+        if not options['keep']:
+            event.delete()
+            User.objects.filter(email__startswith=f'loadtest-{run_id}-').delete()
+
+        if stored > capacity:
+            raise CommandError(f'Event oversold: {stored} registrations for {capacity} spots.')
+        if stored != event.registration_count:
+            raise CommandError(f'Counter drifted: stored {stored}, counter {event.registration_count}.')
+        failures = sum(total for outcome, total in results.items() if outcome not in (201, 409))
+        if failures:
+            raise CommandError(f'{failures} requests did not end in 201 or 409.')
+
+        self.stdout.write(self.style.SUCCESS('No overselling detected.'))
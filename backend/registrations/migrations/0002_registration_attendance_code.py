@@ -0,0 +1,34 @@
+# Generated by Django 4.2.10 on 2026-10-17 04:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('registrations', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='registration',
+            name='registratio_qr_code_235e8f_idx',
+        ),
+        migrations.RemoveField(
+            model_name='registration',
+            name='qr_code',
+        ),
+        migrations.RemoveField(
+            model_name='registration',
+            name='qr_code_expires_at',
+        ),
+        migrations.AddField(
+            model_name='registration',
+            name='attendance_code',
+            field=models.CharField(blank=True, max_length=10, null=True, verbose_name='attendance code'),
+        ),
+        migrations.AddIndex(
+            model_name='registration',
+            index=models.Index(fields=['attendance_code'], name='registratio_attenda_831024_idx'),
+        ),
+    ]
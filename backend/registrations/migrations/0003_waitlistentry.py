@@ -0,0 +1,33 @@
+# Generated by Django 4.2.10 on 2026-10-17 04:27
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('events', '0003_event_registration_counters'),
+        ('registrations', '0002_registration_attendance_code'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='WaitlistEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='created at')),
+                ('admin_user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='waitlist_entries', to=settings.AUTH_USER_MODEL, verbose_name='user')),
+                ('event', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='waitlist_entries', to='events.event', verbose_name='event')),
+            ],
+            options={
+                'verbose_name': 'waitlist entry',
+                'verbose_name_plural': 'waitlist entries',
+                'ordering': ['event', 'id'],
+                'indexes': [models.Index(fields=['event', 'id'], name='registratio_event_i_1a217f_idx')],
+                'unique_together': {('admin_user', 'event')},
+            },
+        ),
+    ]
@@ -0,0 +1,47 @@
+# Generated by Django 4.2.10 on 2026-10-17 04:30
+
+import uuid
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def reissue_duplicate_codes(apps, schema_editor):
+    Registration = apps.get_model('registrations', 'Registration')
+
+    duplicates = Registration.objects.exclude(attendance_code__isnull=True).values(
+        'event_id', 'attendance_code'
+    ).annotate(total=Count('id')).filter(total__gt=1).order_by()
+
+    for duplicate in duplicates:
+        clashing = Registration.objects.filter(
+            event_id=duplicate['event_id'], attendance_code=duplicate['attendance_code']
+        ).order_by('id')[1:]
+        for registration in clashing:
+            while True:
+                code = uuid.uuid4().hex[:6].upper()
+                if not Registration.objects.filter(
+                    event_id=registration.event_id, attendance_code=code
+                ).exists():
+                    break
+            registration.attendance_code = code
+            registration.save(update_fields=['attendance_code'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('registrations', '0003_waitlistentry'),
+    ]
+
+    operations = [
+        migrations.RunPython(reissue_duplicate_codes, migrations.RunPython.noop),
+        migrations.RemoveIndex(
+            model_name='registration',
+            name='registratio_attenda_831024_idx',
+        ),
+        migrations.AddConstraint(
+            model_name='registration',
+            constraint=models.UniqueConstraint(fields=('event', 'attendance_code'), name='unique_attendance_code_per_event'),
+        ),
+    ]
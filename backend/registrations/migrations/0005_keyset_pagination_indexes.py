@@ -0,0 +1,21 @@
+# Generated by Django 4.2.10 on 2026-10-17 04:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('registrations', '0004_attendance_code_per_event'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='registration',
+            options={'ordering': ['-created_at', '-id'], 'verbose_name': 'registration', 'verbose_name_plural': 'registrations'},
+        ),
+        migrations.AddIndex(
+            model_name='registration',
+            index=models.Index(fields=['created_at', 'id'], name='registratio_created_350d3f_idx'),
+        ),
+    ]
@@ -1,9 +1,14 @@
 import uuid
-from django.db import models
+from asgiref.sync import sync_to_async
+from django.db import models, transaction, connection, IntegrityError
+from django.db.models import F, Q
 from django.utils.translation import gettext_lazy as _
 from django.conf import settings
 from django.utils import timezone
 from datetime import timedelta
+from .exceptions import AlreadyRegistered, AlreadyWaitlisted, EventFull, EventUnavailable
+from . import tickets
+from .verifier import attendance_codes
 
 
 class Registration(models.Model):
@@ -35,6 +40,8 @@ class Registration(models.Model):
     )
     checked_in_at = models.DateTimeField(_('checked in at'), blank=True, null=True)
     attendance_code = models.CharField(_('attendance code'), max_length=10, blank=True, null=True)
+    # Set once the reminder email is out, so a retried reminder run skips it
+    reminder_sent_at = models.DateTimeField(_('reminder sent at'), blank=True, null=True, editable=False)
     created_at = models.DateTimeField(_('created at'), auto_now_add=True)
     updated_at = models.DateTimeField(_('updated at'), auto_now=True)
 
@@ -42,34 +49,250 @@ class Registration(models.Model):
         verbose_name = _('registration')
         verbose_name_plural = _('registrations')
         unique_together = ('admin_user', 'event')
+        ordering = ['-created_at', '-id']
         indexes = [
-            models.Index(fields=['attendance_code']),
+            # Backs keyset pagination on (created_at, id)
+            models.Index(fields=['created_at', 'id']),
+        ]
+        constraints = [
+            # Guest check-in looks codes up per event, so they must be unique there
+            models.UniqueConstraint(
+                fields=['event', 'attendance_code'],
+                name='unique_attendance_code_per_event'
+            ),
         ]
 
     def __str__(self):
         return f"{self.admin_user.email} - {self.event.name}"
     
+    @classmethod
+    def generate_attendance_code(cls, event_id):
+        """Generate a random 6-character code that is unused for the event."""
+        while True:
+            code = uuid.uuid4().hex[:6].upper()
+            if not cls.objects.filter(event_id=event_id, attendance_code=code).exists():
+                return code
+    
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember which status the event counters reflect so save() can move them
+        if 'status' in instance.__dict__:
+            instance._counted_status = instance.status
+        return instance
+    
     def save(self, *args, **kwargs):
+        from analytics.models import CheckInBucket
+        from events.live import announce_check_ins
+        from events.models import Event
+        
         # Generate attendance code for guest users if not provided
+        issued_code = False
         if not self.attendance_code and self.admin_user.role == 'guest':
-            # Generate a random 6-character alphanumeric code
-            self.attendance_code = ''.join(
-                [uuid.uuid4().hex[:6].upper()]
-            )
-        super().save(*args, **kwargs)
+            self.attendance_code = self.generate_attendance_code(self.event_id)
+            issued_code = True
+        
+        previous_status = getattr(
+            self, '_counted_status', None if self._state.adding else self.status
+        )
+        
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            if previous_status != self.status:
+                Event.shift_registration_count(self.event_id, previous_status, self.status)
+                if self.status == 'checked_in':
+                    CheckInBucket.record(self.event_id, [self.checked_in_at])
+                    announce_check_ins(self.event_id, [self])
+            if issued_code:
+                event_id = self.event_id
+                transaction.on_commit(lambda: attendance_codes.invalidate(event_id))
+        self._counted_status = self.status
+    
+    @property
+    def ticket(self):
+        """Signed check-in ticket for the registration; see ``tickets``."""
+        return tickets.issue(self.pk, self.event_id)
     
     def check_in(self):
         """Mark the registration as checked in."""
         if self.status != 'checked_in':
             self.status = 'checked_in'
             self.checked_in_at = timezone.now()
-            self.save()
+            self.save(update_fields=['status', 'checked_in_at', 'updated_at'])
     
     def cancel(self):
-        """Cancel the registration."""
+        """
+        Cancel the registration and hand the freed spot to the waitlist.
+        
+        Returns:
+            The registration created for the promoted user, or None
+        """
         if self.status != 'cancelled':
-            self.status = 'cancelled'
-            self.save()
+            with transaction.atomic():
+                self.status = 'cancelled'
+                self.save()
+                return WaitlistEntry.promote_next(self.event_id)
+        return None
+    
+    @classmethod
+    def reserve(cls, event_id, user):
+        """
+        Atomically claim a spot on an event and create the registration.
+        
+        The capacity check and the counter increment happen in one conditional
+        UPDATE, which row-locks the event, so concurrent requests can never
+        oversell it. The happy path costs that UPDATE plus the INSERT.
+        
+        Raises:
+            EventUnavailable: The event does not exist, is inactive or has ended
+            EventFull: No spots are left
+            AlreadyRegistered: The user already holds a registration
+        """
+        from events.caching import invalidate_event_cache
+        from events.live import announce_capacity
+        from events.models import Event
+        
+        now = timezone.now()
+        has_spots = (
+            Q(capacity__isnull=True) |
+            Q(capacity__gt=F('registered_count') + F('checked_in_count'))
+        )
+        
+        try:
+            with transaction.atomic():
+                reserved = Event.objects.filter(
+                    has_spots, pk=event_id, active=True, end_time__gte=now
+                ).update(registered_count=F('registered_count') + 1, updated_at=now)
+                if not reserved:
+                    raise cls._reservation_error(event_id, user, now)
+                invalidate_event_cache(event_id)
+                announce_capacity(event_id)
+                
+                registration = cls(admin_user=user, event_id=event_id)
+                # The UPDATE above already counted this registration
+                registration._counted_status = 'registered'
+                registration.save()
+                
+                from .tasks import send_registration_confirmation
+                send_registration_confirmation.enqueue(registration.pk)
+        except IntegrityError:
+            raise AlreadyRegistered()
+        
+        return registration
+    
+    @classmethod
+    def _reservation_error(cls, event_id, user, now):
+        """Work out why a reservation was refused (slow path only)."""
+        from events.models import Event
+        
+        event = Event.objects.filter(pk=event_id).first()
+        if event is None:
+            return EventUnavailable("Event does not exist.")
+        if not event.active:
+            return EventUnavailable("Event is not active.")
+        if event.end_time < now:
+            return EventUnavailable("Event has already ended.")
+        if cls.objects.filter(admin_user=user, event_id=event_id).exists():
+            return AlreadyRegistered()
+        return EventFull()
+    
+    @classmethod
+    def bulk_check_in(cls, event_id, scans):
+        """
+        Check in a batch of buffered scans for one event.
+        
+        Matching registrations are loaded with one locked SELECT, written
+        with one bulk UPDATE and the event counters are moved with another;
+        the check-in buckets take one upsert. All of it runs in a single
+        transaction.
+        
+        Args:
+            event_id: The event the scanner is working
+            scans: Dicts with ``user_id``, ``attendance_code`` or a printed
+                ``ticket``, and an optional ``scanned_at`` timestamp
+            
+        Returns:
+            List of per-scan result dicts, in the order of ``scans``
+        """
+        from analytics.models import CheckInBucket
+        from events.live import announce_check_ins
+        from events.models import Event
+        
+        user_ids = {scan['user_id'] for scan in scans if scan.get('user_id')}
+        codes = {
+            scan['attendance_code'] for scan in scans
+            if scan.get('attendance_code') and attendance_codes.is_valid(event_id, scan['attendance_code'])
+        }
+        # Tickets are checked by signature, so forged ones never reach the query
+        ticket_ids = {}
+        for scan in scans:
+            if scan.get('ticket'):
+                verified = tickets.verify(scan['ticket'])
+                if verified and verified[1] == event_id:
+                    ticket_ids[scan['ticket']] = verified[0]
+        now = timezone.now()
+        
+        with transaction.atomic():
+            registrations = cls.objects.filter(event_id=event_id).filter(
+                Q(admin_user_id__in=user_ids) | Q(attendance_code__in=codes) | Q(pk__in=ticket_ids.values())
+            ).only('id', 'admin_user_id', 'attendance_code', 'status', 'checked_in_at')
+            registrations = list(registrations.select_for_update())
+            by_user = {registration.admin_user_id: registration for registration in registrations}
+            by_code = {
+                registration.attendance_code: registration
+                for registration in registrations if registration.attendance_code
+            }
+            by_pk = {registration.pk: registration for registration in registrations}
+            
+            results = []
+            to_check_in = {}
+            for index, scan in enumerate(scans):
+                if scan.get('ticket'):
+                    registration = by_pk.get(ticket_ids.get(scan['ticket']))
+                elif scan.get('attendance_code'):
+                    registration = by_code.get(scan['attendance_code'])
+                else:
+                    registration = by_user.get(scan.get('user_id'))
+                
+                if scan.get('ticket') and scan['ticket'] not in ticket_ids:
+                    outcome = 'invalid_ticket'
+                elif registration is None:
+                    outcome = 'not_registered'
+                elif registration.pk in to_check_in:
+                    outcome = 'duplicate'
+                elif registration.status == 'checked_in':
+                    outcome = 'already_checked_in'
+                elif registration.status == 'cancelled':
+                    outcome = 'cancelled'
+                else:
+                    outcome = 'checked_in'
+                    registration.status = 'checked_in'
+                    registration.checked_in_at = min(scan.get('scanned_at') or now, now)
+                    registration.updated_at = now
+                    to_check_in[registration.pk] = registration
+                
+                results.append({
+                    'index': index,
+                    'registration_id': registration.pk if registration else None,
+                    'status': outcome,
+                    'checked_in_at': registration.checked_in_at if registration else None,
+                })
+            
+            if to_check_in:
+                cls.objects.bulk_update(
+                    to_check_in.values(),
+                    ['status', 'checked_in_at', 'updated_at'],
+                    batch_size=500
+                )
+                Event.shift_registration_count(
+                    event_id, 'registered', 'checked_in', count=len(to_check_in)
+                )
+                CheckInBucket.record(
+                    event_id, [registration.checked_in_at for registration in to_check_in.values()]
+                )
+                announce_check_ins(event_id, to_check_in.values())
+        
+        return results
     
     @classmethod
     def confirm_attendance(cls, event_qr_code, user, attendance_code=None):
@@ -84,51 +307,254 @@ class Registration(models.Model):
         Returns:
             Registration object if successful, None otherwise
         """
+        from events import qr_tokens
         from events.models import Event
         
-        try:
-            # Find the event by QR code
-            event = Event.objects.get(qr_code=event_qr_code)
+        # Find the event by QR code; signed tokens name it themselves
+        if qr_tokens.is_token(event_qr_code):
+            event_id, error = qr_tokens.verify(event_qr_code)
+        else:
+            event = Event.objects.filter(cls._event_qr_code_lookup(event_qr_code)).first()
+            event_id, error = cls._stored_qr_code_result(event, event_qr_code)
+        error = error or cls._attendance_user_error(user, attendance_code)
+        if error:
+            return None, error
+        
+        # Reject unknown guest codes without touching the registrations
+        if user.role == 'guest' and not attendance_codes.is_valid(event_id, attendance_code):
+            return None, "Invalid attendance code"
+        
+        registrations, missing_message = cls._attendance_lookup(event_id, user, attendance_code)
+        registration = registrations.first()
+        if not registration:
+            return None, missing_message
+        
+        if registration.status != 'registered':
+            return cls._attendance_status_result(registration)
+        
+        # Mark as checked in
+        registration.check_in()
+        return registration, "Check-in successful"
+    
+    @classmethod
+    async def aconfirm_attendance(cls, event_qr_code, user, attendance_code=None):
+        """
+        Async version of ``confirm_attendance``.
+        
+        Lookups go through the async ORM; the check-in itself runs in a
+        worker thread because it writes inside a transaction.
+        """
+        from events import qr_tokens
+        from events.models import Event
+        
+        if qr_tokens.is_token(event_qr_code):
+            event_id, error = qr_tokens.verify(event_qr_code)
+        else:
+            event = await Event.objects.filter(cls._event_qr_code_lookup(event_qr_code)).afirst()
+            event_id, error = cls._stored_qr_code_result(event, event_qr_code)
+        error = error or cls._attendance_user_error(user, attendance_code)
+        if error:
+            return None, error
+        
+        if user.role == 'guest':
+            # The verifier may have to load the event's codes
+            if not await sync_to_async(attendance_codes.is_valid)(event_id, attendance_code):
+                return None, "Invalid attendance code"
+        
+        registrations, missing_message = cls._attendance_lookup(event_id, user, attendance_code)
+        # Callers serialize the nested event and user, so fetch them now
+        registration = await registrations.select_related('event', 'admin_user').afirst()
+        if not registration:
+            return None, missing_message
+        
+        if registration.status != 'registered':
+            return cls._attendance_status_result(registration)
+        
+        await sync_to_async(registration.check_in)()
+        return registration, "Check-in successful"
+    
+    @staticmethod
+    def _event_qr_code_lookup(event_qr_code):
+        """Match the event showing the code, or that showed it before its last rotation."""
+        return Q(qr_code=event_qr_code) | Q(previous_qr_code=event_qr_code)
+    
+    @staticmethod
+    def _stored_qr_code_result(event, event_qr_code):
+        """``(event_id, error)`` for a scanned UUID code and the event it matched."""
+        if event is None:
+            return None, "Invalid event QR code"
+        
+        # Check if QR code is valid (not expired, or replaced too long ago)
+        if not event.accepts_qr_code(event_qr_code):
+            return None, "Event QR code has expired"
+        return event.pk, None
+    
+    @staticmethod
+    def _attendance_user_error(user, attendance_code):
+        """Why the request rules out a check-in, or None."""
+        # For guest users, require attendance code
+        if user.role == 'guest' and not attendance_code:
+            return "Attendance code is required for guest users"
+        return None
+    
+    @classmethod
+    def _attendance_lookup(cls, event_id, user, attendance_code):
+        """
+        The registration a check-in applies to, as a queryset, and the
+        message to give when it does not exist.
+        """
+        if user.role == 'guest':
+            # Find registration by user, event and attendance code
+            registrations = cls.objects.filter(
+                admin_user=user,
+                event_id=event_id,
+                attendance_code=attendance_code
+            )
+            return registrations, "Invalid attendance code"
+        
+        # For regular users, find registration by user and event
+        return cls.objects.filter(admin_user=user, event_id=event_id), "You are not registered for this event"
+    
+    @staticmethod
+    def _attendance_status_result(registration):
+        """Result for a registration that is already checked in or cancelled."""
+        if registration.status == 'checked_in':
+            return registration, "Already checked in"
+        return None, "Registration has been cancelled"
+
+
+class WaitlistQuerySet(models.QuerySet):
+    """QuerySet for waitlist entries."""
+    
+    def with_position(self):
+        """
+        Annotate each entry with its 1-based place in the event's queue.
+        
+        Promotion takes the head of the queue straight off the (event, id)
+        index; only this displayed place needs counting. Leaving and
+        promotion leave gaps in the ids, so the place is the number of
+        entries still ahead, an index-only range count per row. A stored
+        rank would instead have to be rewritten for everyone behind an
+        entry each time it leaves.
+        """
+        ahead = WaitlistEntry.objects.filter(
+            event_id=models.OuterRef('event_id'),
+            id__lte=models.OuterRef('id')
+        ).order_by().values('event_id').annotate(total=models.Count('id')).values('total')
+        return self.annotate(queue_position=models.Subquery(ahead))
+
+
+class WaitlistEntry(models.Model):
+    """FIFO queue of users waiting for a spot on a full event."""
+    
+    admin_user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='waitlist_entries',
+        verbose_name=_('user')
+    )
+    event = models.ForeignKey(
+        'events.Event',
+        on_delete=models.CASCADE,
+        related_name='waitlist_entries',
+        verbose_name=_('event')
+    )
+    created_at = models.DateTimeField(_('created at'), auto_now_add=True)
+
+    objects = WaitlistQuerySet.as_manager()
+
+    class Meta:
+        verbose_name = _('waitlist entry')
+        verbose_name_plural = _('waitlist entries')
+        unique_together = ('admin_user', 'event')
+        # The auto-incrementing id is the queue position
+        ordering = ['event', 'id']
+        indexes = [
+            models.Index(fields=['event', 'id']),
+        ]
+
+    def __str__(self):
+        return f"{self.admin_user.email} - {self.event.name} (waitlist)"
+    
+    @property
+    def position(self):
+        """1-based place in the event's queue (an indexed range count)."""
+        queue_position = getattr(self, 'queue_position', None)
+        if queue_position is not None:
+            return queue_position
+        return WaitlistEntry.objects.filter(event_id=self.event_id, id__lte=self.id).count()
+    
+    @classmethod
+    def join(cls, event_id, user):
+        """
+        Register the user if a spot is free, otherwise queue them.
+        
+        Returns:
+            Tuple of (registration, entry); exactly one of them is set
             
-            # Check if QR code is valid (not expired)
-            if not event.is_qr_code_valid:
-                return None, "Event QR code has expired"
-                
-            # For guest users, require attendance code
-            if user.role == 'guest':
-                if not attendance_code:
-                    return None, "Attendance code is required for guest users"
-                    
-                # Find registration by user, event and attendance code
-                registration = cls.objects.filter(
-                    admin_user=user,
-                    event=event,
-                    attendance_code=attendance_code
-                ).first()
-                
-                if not registration:
-                    return None, "Invalid attendance code"
-            else:
-                # For regular users, find registration by user and event
-                registration = cls.objects.filter(
-                    admin_user=user,
-                    event=event
-                ).first()
-                
-                if not registration:
-                    return None, "You are not registered for this event"
+        Raises:
+            EventUnavailable: The event does not exist, is inactive or has ended
+            AlreadyRegistered: The user already holds a registration
+            AlreadyWaitlisted: The user is already queued for the event
+        """
+        try:
+            return Registration.reserve(event_id, user), None
+        except EventFull:
+            pass
+        
+        try:
+            with transaction.atomic():
+                entry = cls.objects.create(admin_user=user, event_id=event_id)
+        except IntegrityError:
+            raise AlreadyWaitlisted()
+        return None, entry
+    
+    @classmethod
+    def promote_next(cls, event_id):
+        """
+        Move the head of the event's waitlist into a registration.
+        
+        Must run inside the transaction that freed the spot. Entries whose
+        user registered some other way are discarded along the way.
+        
+        Returns:
+            The new registration, or None if nobody could be promoted
+        """
+        queue = cls.objects.filter(event_id=event_id).select_related('admin_user').order_by('id')
+        if connection.features.has_select_for_update_skip_locked:
+            # Concurrent cancellations each promote a different user
+            queue = queue.select_for_update(skip_locked=True, of=('self',))
+        
+        while True:
+            entry = queue.first()
+            if entry is None:
+                return None
             
-            # Check if already checked in
-            if registration.status == 'checked_in':
-                return registration, "Already checked in"
-                
-            # Check if cancelled
-            if registration.status == 'cancelled':
-                return None, "Registration has been cancelled"
-                
-            # Mark as checked in
-            registration.check_in()
-            return registration, "Check-in successful"
+            try:
+                registration = Registration.reserve(event_id, entry.admin_user)
+            except AlreadyRegistered:
+                entry.delete()
+                continue
+            except (EventFull, EventUnavailable):
+                return None
             
-        except Event.DoesNotExist:
-            return None, "Invalid event QR code" 
\ No newline at end of file
+            entry.delete()
+            return registration
+    
+    @classmethod
+    def promote_all(cls, event_id):
+        """
+        Promote from the head of the event's waitlist, once per free spot.
+        
+        For spots freed in bulk, such as a capacity increase.
+        
+        Returns:
+            The registrations created for the promoted users
+        """
+        promoted = []
+        with transaction.atomic():
+            while True:
+                registration = cls.promote_next(event_id)
+                if registration is None:
+                    return promoted
+                promoted.append(registration)
@@ -1,6 +1,7 @@
 from rest_framework import serializers
-from .models import Registration
-from events.serializers import EventSerializer
+from .models import Registration, WaitlistEntry
+from .exceptions import AlreadyRegistered, EventFull, EventUnavailable, RegistrationConflict
+from events.serializers import EventSerializer, EventListSerializer
 from users.serializers import AdminUserSerializer
 from django.utils import timezone
 
@@ -32,46 +33,42 @@ class RegistrationCreateSerializer(serializers.ModelSerializer):
         model = Registration
         fields = ['event_id']
     
-    def validate_event_id(self, value):
-        from events.models import Event
-        
-        try:
-            event = Event.objects.get(pk=value)
-        except Event.DoesNotExist:
-            raise serializers.ValidationError("Event does not exist.")
-        
-        # Check if event is active
-        if not event.active:
-            raise serializers.ValidationError("Event is not active.")
-        
-        # Check if event is in the past
-        if event.is_past:
-            raise serializers.ValidationError("Event has already ended.")
-        
-        # Check if event is full
-        if event.is_full:
-            raise serializers.ValidationError("Event is at full capacity.")
-        
-        # Check if user is already registered
-        user = self.context['request'].user
-        if Registration.objects.filter(admin_user=user, event=event).exists():
-            raise serializers.ValidationError("You are already registered for this event.")
-        
-        return value
-    
     def create(self, validated_data):
-        event_id = validated_data.pop('event_id')
         user = self.context['request'].user
         
-        from events.models import Event
-        event = Event.objects.get(pk=event_id)
-        
-        registration = Registration.objects.create(
-            admin_user=user,
-            event=event
-        )
-        
-        return registration
+        # All checks happen inside the reservation so they cannot race each other
+        try:
+            return Registration.reserve(validated_data['event_id'], user)
+        except EventUnavailable as exc:
+            raise serializers.ValidationError({"event_id": [exc.message]})
+        except (EventFull, AlreadyRegistered) as exc:
+            raise RegistrationConflict(exc.message)
+
+
+class WaitlistEntrySerializer(serializers.ModelSerializer):
+    """Serializer for waitlist entries."""
+    
+    event = EventListSerializer(read_only=True)
+    position = serializers.IntegerField(read_only=True)
+    
+    class Meta:
+        model = WaitlistEntry
+        fields = ['id', 'event', 'position', 'created_at']
+
+
+class AdminWaitlistEntrySerializer(WaitlistEntrySerializer):
+    """Serializer for waitlist entries, including who is waiting."""
+    
+    admin_user = AdminUserSerializer(read_only=True)
+    
+    class Meta(WaitlistEntrySerializer.Meta):
+        fields = ['id', 'event', 'admin_user', 'position', 'created_at']
+
+
+class WaitlistJoinSerializer(serializers.Serializer):
+    """Serializer for joining an event's waitlist."""
+    
+    event_id = serializers.IntegerField(write_only=True)
 
 
 class RegistrationListSerializer(serializers.ModelSerializer):
@@ -102,4 +99,41 @@ class AttendanceConfirmSerializer(serializers.Serializer):
         if user.role == 'guest' and not attendance_code:
             raise serializers.ValidationError({"attendance_code": "Attendance code is required for guest users."})
         
-        return attrs 
\ No newline at end of file
+        return attrs 
+
+
+class CheckInScanSerializer(serializers.Serializer):
+    """Serializer for a single buffered door scan."""
+    
+    user_id = serializers.IntegerField(required=False)
+    attendance_code = serializers.CharField(required=False, allow_blank=True)
+    ticket = serializers.CharField(required=False, allow_blank=True, max_length=100)
+    scanned_at = serializers.DateTimeField(required=False)
+    
+    def validate(self, attrs):
+        if not attrs.get('user_id') and not attrs.get('attendance_code') and not attrs.get('ticket'):
+            raise serializers.ValidationError("One of user_id, attendance_code or ticket is required.")
+        return attrs
+
+
+class BulkCheckInSerializer(serializers.Serializer):
+    """Serializer for a batch of scans uploaded by a door scanner."""
+    
+    scans = CheckInScanSerializer(many=True, allow_empty=False, max_length=1000)
+
+
+class EventTicketsSerializer(serializers.Serializer):
+    """Serializer for the query parameters of an event's ticket batch."""
+    
+    ticket_format = serializers.ChoiceField(choices=['pdf', 'zip'], default='pdf')
+    status = serializers.ChoiceField(choices=['registered', 'checked_in'], required=False)
+
+
+class RegistrationExportSerializer(serializers.Serializer):
+    """Serializer for the query parameters of a registration export."""
+    
+    export_format = serializers.ChoiceField(choices=['csv', 'ndjson'], default='csv')
+    event_id = serializers.IntegerField(required=False)
+    status = serializers.ChoiceField(choices=Registration.STATUS_CHOICES, required=False)
+    created_after = serializers.DateTimeField(required=False)
+    created_before = serializers.DateTimeField(required=False)
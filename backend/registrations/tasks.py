@@ -0,0 +1,82 @@
+"""
+Background tasks for registrations: confirmation and reminder emails, and
+exports written to storage.
+"""
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.template.loader import render_to_string
+from django.utils import timezone
+
+from taskqueue.queue import task
+from .models import Registration
+
+# Registrations read, and marked as reminded, per round
+REMINDER_BATCH_SIZE = 100
+
+
+def _render_email(template, registration):
+    context = {'registration': registration, 'event': registration.event, 'user': registration.admin_user}
+    subject = render_to_string(f'registrations/email/{template}_subject.txt', context)
+    body = render_to_string(f'registrations/email/{template}_message.txt', context)
+    return EmailMessage(
+        ' '.join(subject.split()), body, settings.DEFAULT_FROM_EMAIL, [registration.admin_user.email]
+    )
+
+
+@task
+def send_registration_confirmation(registration_id):
+    """Email a new registration's confirmation, unless it was cancelled meanwhile."""
+    registration = Registration.objects.select_related('event', 'admin_user').filter(
+        pk=registration_id, status='registered'
+    ).first()
+    if registration is not None:
+        _render_email('confirmation', registration).send()
+
+
+@task
+def send_event_reminders(event_id):
+    """
+    Email a reminder to everyone still registered for an event who has not
+    had one yet; return how many were sent.
+
+    Registrations are marked as reminded once their email is out, including
+    when a later one fails, so a retried run only sends the rest.
+    """
+    registrations = Registration.objects.select_related('event', 'admin_user').filter(
+        event_id=event_id, status='registered', reminder_sent_at__isnull=True
+    ).order_by('id')
+
+    sent = 0
+    last_id = 0
+    with get_connection() as connection:
+        while True:
+            batch = list(registrations.filter(id__gt=last_id)[:REMINDER_BATCH_SIZE])
+            if not batch:
+                return sent
+            reminded = []
+            try:
+                for registration in batch:
+                    if connection.send_messages([_render_email('reminder', registration)]):
+                        reminded.append(registration.pk)
+            finally:
+                Registration.objects.filter(pk__in=reminded).update(reminder_sent_at=timezone.now())
+            sent += len(reminded)
+            last_id = batch[-1].pk
+
+
+@task(max_attempts=1)
+def export_registrations(filters):
+    """
+    Write a registration export to storage.
+
+    ``filters`` holds raw ``RegistrationExportSerializer`` input. Returns
+    the stored file's path and download filename.
+    """
+    from .exports import write_export
+    from .serializers import RegistrationExportSerializer
+
+    serializer = RegistrationExportSerializer(data=filters)
+    serializer.is_valid(raise_exception=True)
+    path, filename = write_export(serializer.validated_data)
+    return {'path': path, 'filename': filename}
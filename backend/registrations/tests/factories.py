@@ -0,0 +1,21 @@
+import factory
+
+from events.tests.factories import EventFactory
+from registrations.models import Registration, WaitlistEntry
+from users.tests.factories import UserFactory
+
+
+class RegistrationFactory(factory.django.DjangoModelFactory):
+    class Meta:
+        model = Registration
+
+    admin_user = factory.SubFactory(UserFactory)
+    event = factory.SubFactory(EventFactory)
+
+
+class WaitlistEntryFactory(factory.django.DjangoModelFactory):
+    class Meta:
+        model = WaitlistEntry
+
+    admin_user = factory.SubFactory(UserFactory)
+    event = factory.SubFactory(EventFactory)
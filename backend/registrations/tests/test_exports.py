@@ -0,0 +1,22 @@
+import json
+
+import pytest
+
+from events.tests.factories import EventFactory
+from registrations.exports import stream_export
+from .factories import RegistrationFactory
+
+
+@pytest.mark.django_db
+def test_ndjson_export_is_one_query_with_each_event_before_its_registrations(django_assert_num_queries):
+    events = EventFactory.create_batch(3)
+    for event in events:
+        RegistrationFactory.create_batch(2, event=event)
+
+    with django_assert_num_queries(1):
+        records = [json.loads(line) for line in stream_export({'export_format': 'ndjson'})]
+
+    assert [(record['type'], record.get('event_id', record['id'])) for record in records] == [
+        (kind, event.pk) for event in events for kind in ('event', 'registration', 'registration')
+    ]
+    assert records[0]['name'] == events[0].name
@@ -0,0 +1,142 @@
+"""
+Read endpoints run a fixed number of queries, whatever the amount of data.
+
+Every endpoint is requested against a small dataset and again after it has
+grown past a page: the query count must stay within the endpoint's budget
+and must not grow. Revalidating with an ETag must be a single-query 304,
+and a cached endpoint must run no query at all on a cache hit.
+"""
+
+from types import SimpleNamespace
+
+import pytest
+from django.urls import reverse
+
+from events.tests.factories import EventFactory
+from users.tests.factories import UserFactory
+from .factories import RegistrationFactory, WaitlistEntryFactory
+
+# Maximum number of queries each endpoint may run, whatever the page size.
+# List views get one COUNT for pagination plus one SELECT for the page;
+# views with conditional GET support add one aggregate for their ETag.
+QUERY_BUDGETS = {
+    'event-list': 3,
+    'event-detail': 2,
+    'admin-event-list': 3,
+    'registration-list': 3,
+    'registration-detail': 2,
+    # The ticket image comes from the cache once rendered
+    'registration-qr-code': 1,
+    'admin-registration-list': 3,
+    'event-registrations': 3,
+    'waitlist': 2,
+    'admin-waitlist': 2,
+    # Keyset pages skip the COUNT(*)
+    'event-list?pagination=keyset': 2,
+    'admin-registration-list?pagination=keyset': 2,
+}
+
+# Revalidating an unchanged response costs only the ETag aggregate
+NOT_MODIFIED_BUDGET = 1
+
+# Endpoints that send validators (waitlists do not)
+CONDITIONAL_ENDPOINTS = [name for name in QUERY_BUDGETS if name not in ('waitlist', 'admin-waitlist')]
+
+# Endpoints whose responses are cached
+CACHED_ENDPOINTS = ('event-list', 'event-detail', 'event-list?pagination=keyset')
+
+# Who requests each endpoint, and its URL arguments
+ENDPOINTS = {
+    'event-list': (None, lambda data: {}),
+    'event-detail': (None, lambda data: {'pk': data.event.pk}),
+    'admin-event-list': ('admin', lambda data: {}),
+    'registration-list': ('student', lambda data: {}),
+    'registration-detail': ('student', lambda data: {'pk': data.registration.pk}),
+    'registration-qr-code': ('student', lambda data: {'pk': data.registration.pk}),
+    'admin-registration-list': ('admin', lambda data: {}),
+    'event-registrations': ('admin', lambda data: {'event_id': data.event.pk}),
+    'waitlist': ('admin', lambda data: {}),
+    'admin-waitlist': ('admin', lambda data: {}),
+    'event-list?pagination=keyset': (None, lambda data: {}),
+    'admin-registration-list?pagination=keyset': ('admin', lambda data: {}),
+}
+
+
+@pytest.fixture(autouse=True)
+def uncached(settings):
+    # A zero cache timeout measures what cached views cost to build
+    settings.API_CACHE_TIMEOUT = 0
+
+
+@pytest.fixture
+def data(db):
+    admin = UserFactory(role='admin')
+    student = UserFactory()
+    event = EventFactory()
+    registration = RegistrationFactory(admin_user=student, event=event)
+    WaitlistEntryFactory(admin_user=admin, event=event)
+    return SimpleNamespace(admin=admin, student=student, event=event, registration=registration)
+
+
+def grow(data, rows=25):
+    """Add enough rows that every list spans more than one page."""
+    events = EventFactory.create_batch(rows)
+    users = UserFactory.create_batch(rows, role='guest')
+    for user in users:
+        RegistrationFactory(admin_user=user, event=data.event)
+    for user, other in zip(users, events):
+        RegistrationFactory(admin_user=data.student, event=other)
+        WaitlistEntryFactory(admin_user=user, event=other)
+
+
+@pytest.fixture
+def client(api_client, data, name):
+    """A client authenticated as the endpoint's user."""
+    user, _ = ENDPOINTS[name]
+    if user:
+        api_client.force_authenticate(getattr(data, user))
+    return api_client
+
+
+def get(client, data, name, **headers):
+    _, kwargs = ENDPOINTS[name]
+    url_name, _, query = name.partition('?')
+    url = reverse(url_name, kwargs=kwargs(data)) + (f'?{query}' if query else '')
+    return client.get(url, **headers)
+
+
+@pytest.mark.parametrize('name', QUERY_BUDGETS)
+def test_query_count_is_within_budget_and_fixed(client, data, name, django_assert_max_num_queries):
+    with django_assert_max_num_queries(QUERY_BUDGETS[name]) as small:
+        response = get(client, data, name)
+    assert response.status_code == 200
+
+    grow(data)
+    with django_assert_max_num_queries(QUERY_BUDGETS[name]) as large:
+        response = get(client, data, name)
+    assert response.status_code == 200
+    assert len(large.captured_queries) == len(small.captured_queries)
+
+
+@pytest.mark.parametrize('name', CONDITIONAL_ENDPOINTS)
+def test_revalidation_is_a_single_query(client, data, name, django_assert_max_num_queries):
+    etag = get(client, data, name)['ETag']
+
+    with django_assert_max_num_queries(NOT_MODIFIED_BUDGET):
+        response = get(client, data, name, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 304
+
+
+@pytest.mark.parametrize('name', CACHED_ENDPOINTS)
+def test_cache_hit_runs_no_query(client, data, name, settings, django_assert_num_queries):
+    settings.API_CACHE_TIMEOUT = 60
+    etag = get(client, data, name)['ETag']
+
+    with django_assert_num_queries(0):
+        response = get(client, data, name)
+    assert response.status_code == 200
+    assert response['X-Cache'] == 'HIT'
+
+    with django_assert_num_queries(0):
+        response = get(client, data, name, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 304
@@ -0,0 +1,45 @@
+import pytest
+from django.core import mail
+from django.core.mail.backends.locmem import EmailBackend
+
+from events.tests.factories import EventFactory
+from registrations.tasks import send_event_reminders
+from .factories import RegistrationFactory
+
+
+class FailingEmailBackend(EmailBackend):
+    """Accepts ``capacity`` messages, then fails like a dropped SMTP connection."""
+
+    capacity = None
+
+    def send_messages(self, messages):
+        if FailingEmailBackend.capacity is not None:
+            if len(mail.outbox) + len(messages) > FailingEmailBackend.capacity:
+                raise ConnectionError('SMTP connection lost')
+        return super().send_messages(messages)
+
+
+@pytest.fixture
+def failing_email(settings):
+    settings.EMAIL_BACKEND = f'{__name__}.FailingEmailBackend'
+    yield FailingEmailBackend
+    FailingEmailBackend.capacity = None
+
+
+@pytest.mark.django_db
+def test_retried_reminders_are_not_sent_twice(failing_email, monkeypatch):
+    monkeypatch.setattr('registrations.tasks.REMINDER_BATCH_SIZE', 2)
+    event = EventFactory()
+    registrations = RegistrationFactory.create_batch(5, event=event)
+    RegistrationFactory(event=event, status='cancelled')
+
+    # The connection drops part way through the second batch
+    failing_email.capacity = 3
+    with pytest.raises(ConnectionError):
+        send_event_reminders(event.pk)
+
+    failing_email.capacity = None
+    assert send_event_reminders(event.pk) == 2
+
+    recipients = sorted(message.to[0] for message in mail.outbox)
+    assert recipients == sorted(registration.admin_user.email for registration in registrations)
@@ -0,0 +1,48 @@
+import threading
+from collections import Counter
+
+import pytest
+from django.db import connection
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from events.tests.factories import EventFactory
+from registrations.models import Registration
+from users.tests.factories import UserFactory
+
+CLIENTS = 8
+
+
+@pytest.mark.django_db(transaction=True)
+def test_concurrent_registrations_for_the_last_spot_sell_it_once():
+    event = EventFactory(capacity=2)
+    Registration.reserve(event.pk, UserFactory())
+    users = UserFactory.create_batch(CLIENTS)
+
+    url = reverse('registration-create')
+    barrier = threading.Barrier(CLIENTS)
+    statuses = Counter()
+    lock = threading.Lock()
+
+    def register(user):
+        client = APIClient()
+        client.force_authenticate(user)
+        try:
+            # Release every request at once
+            barrier.wait()
+            status = client.post(url, {'event_id': event.pk}, format='json').status_code
+            with lock:
+                statuses[status] += 1
+        finally:
+            connection.close()
+
+    threads = [threading.Thread(target=register, args=(user,)) for user in users]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert statuses == {201: 1, 409: CLIENTS - 1}
+    assert Registration.objects.filter(event=event, status='registered').count() == 2
+    event.refresh_from_db()
+    assert event.registered_count == 2
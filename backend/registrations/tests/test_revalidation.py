@@ -0,0 +1,32 @@
+"""
+Responses that nest a registration's user change their ETag when the user does.
+"""
+
+import pytest
+from django.urls import reverse
+
+from events.tests.factories import EventFactory
+from users.tests.factories import UserFactory
+from .factories import RegistrationFactory
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('name', ['registration-detail', 'admin-registration-list', 'event-registrations'])
+def test_renaming_the_user_changes_the_etag(api_client, name):
+    api_client.force_authenticate(UserFactory(role='admin'))
+    student = UserFactory(name='Old Name')
+    registration = RegistrationFactory(admin_user=student, event=EventFactory())
+    kwargs = {
+        'registration-detail': {'pk': registration.pk},
+        'admin-registration-list': {},
+        'event-registrations': {'event_id': registration.event_id},
+    }[name]
+    url = reverse(name, kwargs=kwargs)
+    etag = api_client.get(url)['ETag']
+
+    student.name = 'New Name'
+    student.save()
+
+    response = api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 200
+    assert 'New Name' in response.content.decode()
@@ -0,0 +1,130 @@
+import io
+import re
+import zipfile
+
+import pytest
+from django.urls import reverse
+
+from events.tests.factories import EventFactory
+from registrations import tickets
+from registrations.models import Registration
+from users.tests.factories import UserFactory
+from .factories import RegistrationFactory
+
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+
+
+@pytest.fixture
+def registrations(db):
+    event = EventFactory()
+    return RegistrationFactory.create_batch(3, event=event)
+
+
+def ticket_queryset(event):
+    return Registration.objects.filter(event=event).select_related('admin_user').order_by('pk')
+
+
+def tampered(ticket, part, value):
+    parts = ticket.split('.')
+    parts[part] = value
+    return '.'.join(parts)
+
+
+def test_verify_accepts_genuine_tickets():
+    assert tickets.verify(tickets.issue(12, 34)) == (12, 34)
+
+
+@pytest.mark.parametrize('tamper', [
+    # Other ids under the original MAC
+    lambda ticket: tampered(ticket, 1, '13'),
+    lambda ticket: tampered(ticket, 2, '35'),
+    lambda ticket: tampered(ticket, 3, 'A' * len(ticket.split('.')[3])),
+    lambda ticket: tampered(ticket, 0, 't2'),
+    lambda ticket: ticket.rsplit('.', 1)[0],
+    lambda ticket: 'not a ticket',
+    lambda ticket: '',
+    lambda ticket: None,
+])
+def test_verify_rejects_tampered_tickets(tamper):
+    assert tickets.verify(tamper(tickets.issue(12, 34))) is None
+
+
+def test_verify_rejects_tickets_signed_with_another_key(settings):
+    settings.SECRET_KEY = 'another deployment'
+    foreign = tickets.issue(12, 34)
+    settings.SECRET_KEY = 'this deployment'
+
+    assert tickets.verify(foreign) is None
+
+
+def test_verify_accepts_tickets_signed_with_a_fallback_key(settings):
+    settings.SECRET_KEY = 'old key'
+    ticket = tickets.issue(12, 34)
+    settings.SECRET_KEY = 'new key'
+    settings.SECRET_KEY_FALLBACKS = ['old key']
+
+    assert tickets.verify(ticket) == (12, 34)
+
+
+def test_bulk_check_in_accepts_ticket_scans(api_client, registrations):
+    api_client.force_authenticate(UserFactory(role='admin'))
+    event = registrations[0].event
+    other = RegistrationFactory()
+    forged = tampered(registrations[1].ticket, 1, str(other.pk))
+    scans = [
+        {'ticket': registrations[0].ticket},
+        {'ticket': registrations[0].ticket},
+        # Genuine, but for another event
+        {'ticket': other.ticket},
+        {'ticket': forged},
+    ]
+
+    response = api_client.post(reverse('bulk-check-in', kwargs={'event_id': event.pk}), {'scans': scans}, format='json')
+
+    assert response.status_code == 200
+    assert [result['status'] for result in response.data['results']] == [
+        'checked_in', 'duplicate', 'invalid_ticket', 'invalid_ticket'
+    ]
+    assert response.data['results'][0]['registration_id'] == registrations[0].pk
+    assert list(Registration.objects.filter(status='checked_in').values_list('pk', flat=True)) == [registrations[0].pk]
+
+
+def test_ticket_pdf_is_well_formed(registrations):
+    event = registrations[0].event
+
+    pdf = b''.join(tickets.stream_ticket_pdf(ticket_queryset(event), event))
+
+    assert pdf.startswith(b'%PDF-1.4\n')
+    assert pdf.endswith(b'%%EOF\n')
+
+    # startxref points at the cross-reference table, and every entry in it
+    # at the object it names
+    xref_offset = int(re.search(rb'startxref\n(\d+)\n', pdf).group(1))
+    assert pdf[xref_offset:].startswith(b'xref\n')
+    size = int(re.match(rb'xref\n0 (\d+)\n', pdf[xref_offset:]).group(1))
+    entries = re.findall(rb'(\d{10}) 00000 n \n', pdf[xref_offset:])
+    assert len(entries) == size - 1
+    for object_id, offset in enumerate(entries, start=1):
+        assert pdf[int(offset):].startswith(b'%d 0 obj\n' % object_id)
+
+    # Every stream is exactly as long as its /Length says
+    streams = list(re.finditer(rb'/Length (\d+) >>\nstream\n', pdf))
+    assert len(streams) == 2 * len(registrations)
+    for match in streams:
+        end = match.end() + int(match.group(1))
+        assert pdf[end:end + len(b'\nendstream')] == b'\nendstream'
+
+    assert re.search(rb'/Type /Pages /Kids \[[^\]]*\] /Count (\d+)', pdf).group(1) == b'%d' % len(registrations)
+    assert len(re.findall(rb'/Type /Page /Parent', pdf)) == len(registrations)
+
+
+def test_ticket_zip_holds_one_png_per_ticket(registrations):
+    event = registrations[0].event
+
+    data = b''.join(tickets.stream_ticket_zip(ticket_queryset(event), event))
+
+    with zipfile.ZipFile(io.BytesIO(data)) as archive:
+        assert archive.testzip() is None
+        names = archive.namelist()
+        assert [name.split('-', 1)[0] for name in names] == [str(registration.pk) for registration in registrations]
+        assert all(archive.read(name).startswith(PNG_SIGNATURE) for name in names)
@@ -0,0 +1,72 @@
+"""
+The attendance code verifier keeps a bounded number of events in memory,
+and never rejects a code issued through another process.
+"""
+
+import pytest
+from django.core.cache.backends.locmem import LocMemCache
+
+from events.tests.factories import EventFactory
+from users.tests.factories import UserFactory
+from registrations import verifier as verifier_module
+from registrations.verifier import AttendanceCodeVerifier
+from .factories import RegistrationFactory
+
+
+@pytest.mark.django_db
+def test_least_recently_used_events_are_dropped():
+    verifier = AttendanceCodeVerifier(max_snapshots=2)
+    events = EventFactory.create_batch(3)
+    registrations = [
+        RegistrationFactory(admin_user=UserFactory(), event=event, attendance_code=f'CODE{event.pk}')
+        for event in events
+    ]
+
+    verifier.load(events[0].pk)
+    verifier.load(events[1].pk)
+    # A lookup keeps the first event, so the second is dropped next
+    assert verifier.is_valid(events[0].pk, registrations[0].attendance_code)
+    verifier.load(events[2].pk)
+
+    assert list(verifier._snapshots) == [events[0].pk, events[2].pk]
+    # A dropped event is reloaded on its next lookup
+    assert verifier.is_valid(events[1].pk, registrations[1].attendance_code)
+    assert len(verifier._snapshots) == 2
+
+
+@pytest.fixture
+def issued_elsewhere(db, monkeypatch):
+    """A code issued after the snapshot was taken, and invalidated by another process."""
+    def issue(verifier):
+        event = EventFactory()
+        verifier.load(event.pk)
+        registration = RegistrationFactory(admin_user=UserFactory(), event=event, attendance_code='LATE01')
+        # The other process bumps the version in its own cache
+        with monkeypatch.context() as patch:
+            patch.setattr(verifier_module, 'cache', LocMemCache('other-process', {}))
+            verifier.invalidate(event.pk)
+        return event, registration
+    return issue
+
+
+def test_code_issued_elsewhere_is_accepted_without_a_shared_cache(issued_elsewhere):
+    verifier = AttendanceCodeVerifier()
+    event, registration = issued_elsewhere(verifier)
+
+    assert verifier.is_valid(event.pk, registration.attendance_code)
+    assert not verifier.is_valid(event.pk, 'WRONG1')
+
+
+def test_miss_runs_no_query_with_a_shared_cache(db, settings, tmp_path, django_assert_num_queries):
+    settings.CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': str(tmp_path),
+        }
+    }
+    verifier = AttendanceCodeVerifier()
+    event = EventFactory()
+    verifier.load(event.pk)
+
+    with django_assert_num_queries(0):
+        assert not verifier.is_valid(event.pk, 'WRONG1')
@@ -0,0 +1,105 @@
+import io
+import json
+
+import pytest
+from django.urls import reverse
+
+from events.imports import EventImport
+from events.models import Event
+from events.tests.factories import EventFactory
+from registrations.models import Registration, WaitlistEntry
+from users.tests.factories import UserFactory
+from .factories import RegistrationFactory, WaitlistEntryFactory
+
+
+@pytest.fixture
+def full_event(db):
+    """An event whose one spot is taken, with three users waiting."""
+    event = EventFactory(capacity=1)
+    registration = RegistrationFactory(event=event)
+    waiting = [entry.admin_user for entry in WaitlistEntryFactory.create_batch(3, event=event)]
+    return event, registration, waiting
+
+
+def registered(event):
+    return set(
+        Registration.objects.filter(event=event, status='registered').values_list('admin_user', flat=True)
+    )
+
+
+def still_waiting(event):
+    return list(WaitlistEntry.objects.filter(event=event).values_list('admin_user', flat=True))
+
+
+@pytest.mark.django_db
+def test_admin_waitlist_shows_who_is_waiting(api_client):
+    api_client.force_authenticate(UserFactory(role='admin'))
+    event = EventFactory()
+    first, second = WaitlistEntryFactory.create_batch(2, event=event)
+
+    response = api_client.get(reverse('admin-waitlist'), {'event_id': event.pk})
+
+    assert response.status_code == 200
+    assert [
+        (entry['admin_user']['email'], entry['position']) for entry in response.data['results']
+    ] == [(first.admin_user.email, 1), (second.admin_user.email, 2)]
+
+
+def test_deleting_a_registration_promotes_the_next_user(full_event):
+    event, registration, waiting = full_event
+
+    registration.delete()
+
+    assert registered(event) == {waiting[0].pk}
+    assert still_waiting(event) == [waiting[1].pk, waiting[2].pk]
+
+
+def test_deleting_a_user_promotes_the_next_user(full_event):
+    event, registration, waiting = full_event
+
+    registration.admin_user.delete()
+
+    assert registered(event) == {waiting[0].pk}
+    event.refresh_from_db()
+    assert event.registered_count == 1
+
+
+def test_deleting_a_cancelled_registration_promotes_nobody(full_event):
+    event, registration, waiting = full_event
+    registration.cancel()
+
+    Registration.objects.get(admin_user=waiting[0]).delete()
+    Registration.objects.get(pk=registration.pk).delete()
+
+    assert registered(event) == {waiting[1].pk}
+    assert still_waiting(event) == [waiting[2].pk]
+
+
+def test_deleting_the_event_deletes_its_queue(full_event):
+    event, _, _ = full_event
+
+    event.delete()
+
+    assert not WaitlistEntry.objects.exists()
+    assert not Registration.objects.exists()
+
+
+def test_raising_capacity_promotes_once_per_new_spot(full_event, api_client):
+    event, registration, waiting = full_event
+    api_client.force_authenticate(UserFactory(role='admin'))
+
+    response = api_client.patch(reverse('event-update', kwargs={'pk': event.pk}), {'capacity': 3})
+
+    assert response.status_code == 200
+    assert registered(event) == {registration.admin_user_id, waiting[0].pk, waiting[1].pk}
+    assert still_waiting(event) == [waiting[2].pk]
+
+
+def test_raising_capacity_in_an_import_promotes_once_per_new_spot(full_event):
+    event, registration, waiting = full_event
+    rows = io.BytesIO(json.dumps({'id': event.pk, 'capacity': 2}).encode())
+
+    EventImport('update').run(rows, 'ndjson')
+
+    assert registered(event) == {registration.admin_user_id, waiting[0].pk}
+    assert still_waiting(event) == [waiting[1].pk, waiting[2].pk]
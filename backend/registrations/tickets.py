@@ -0,0 +1,262 @@
+"""
+Check-in tickets for registrations.
+
+A ticket names a registration and its event, and carries an HMAC of both
+keyed on ``SECRET_KEY``: ``t1.<registration id>.<event id>.<mac>``. It is
+derived on demand, so nothing is stored, and a door scanner can tell a
+forged or foreign ticket from a real one without a query. Whether the
+registration still holds its spot is checked at check-in as usual.
+
+Rendered ticket images are cached until the event ends. Batches for
+printing are streamed as one PDF page or one PNG per ticket, reading
+registrations in chunks and the cached images a chunk at a time.
+"""
+
+import base64
+import io
+import struct
+import zipfile
+import zlib
+from itertools import islice
+
+from django.conf import settings
+from django.utils.crypto import constant_time_compare, salted_hmac
+from django.utils import timezone
+from django.utils.text import slugify
+from PIL import Image
+
+PREFIX = 't1'
+
+KEY_SALT = 'registrations.tickets'
+
+TICKET_FORMATS = {
+    'pdf': 'application/pdf',
+    'zip': 'application/zip',
+}
+
+# Registrations read, and images fetched from the cache, per round
+CHUNK_SIZE = 200
+
+# A6 portrait, in points
+PAGE_WIDTH, PAGE_HEIGHT = 298, 420
+
+QR_SIZE = 220
+
+
+def _mac(registration_id, event_id, secret=None):
+    digest = salted_hmac(KEY_SALT, f'{registration_id}.{event_id}', secret=secret, algorithm='sha256').digest()
+    return base64.urlsafe_b64encode(digest[:16]).rstrip(b'=').decode()
+
+
+def issue(registration_id, event_id):
+    """The ticket for a registration."""
+    return f'{PREFIX}.{registration_id}.{event_id}.{_mac(registration_id, event_id)}'
+
+
+def verify(ticket):
+    """
+    Check a scanned ticket without touching the database.
+
+    Returns ``(registration_id, event_id)``, or None for anything that is
+    not a genuine ticket.
+    """
+    try:
+        prefix, registration_id, event_id, mac = ticket.split('.')
+        registration_id, event_id = int(registration_id), int(event_id)
+    except (AttributeError, ValueError):
+        return None
+    if prefix != PREFIX:
+        return None
+
+    secrets = [settings.SECRET_KEY, *getattr(settings, 'SECRET_KEY_FALLBACKS', [])]
+    if not any(constant_time_compare(mac, _mac(registration_id, event_id, secret)) for secret in secrets):
+        return None
+    return registration_id, event_id
+
+
+def get_ticket_image(registration, image_format, box_size):
+    """The registration's rendered ticket, cached until its event ends."""
+    from events.qr import get_qr_code_image
+
+    return get_qr_code_image(registration.ticket, image_format, box_size, registration.event.end_time)
+
+
+def _chunks(registrations):
+    registrations = registrations.iterator(chunk_size=CHUNK_SIZE)
+    while True:
+        chunk = list(islice(registrations, CHUNK_SIZE))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _with_images(registrations, event):
+    """Yield ``(registration, png)`` pairs, fetching images a chunk at a time."""
+    from events.qr import DEFAULT_BOX_SIZE, get_qr_code_images
+
+    for chunk in _chunks(registrations):
+        images = get_qr_code_images(
+            [registration.ticket for registration in chunk], 'png', DEFAULT_BOX_SIZE, event.end_time
+        )
+        yield from zip(chunk, images)
+
+
+def ticket_filename(event, ticket_format):
+    return f'tickets-event-{event.pk}.{ticket_format}'
+
+
+class _ZipStream:
+    """Write-only file object whose contents are collected with ``drain()``."""
+
+    def __init__(self):
+        self._chunks = []
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self):
+        data = b''.join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def stream_ticket_zip(registrations, event):
+    """Yield a ZIP archive holding one PNG per ticket."""
+    stream = _ZipStream()
+    # PNGs are compressed already
+    with zipfile.ZipFile(stream, 'w', zipfile.ZIP_STORED) as archive:
+        for registration, image in _with_images(registrations, event):
+            name = slugify(registration.admin_user.name) or 'ticket'
+            archive.writestr(f'{registration.pk}-{name}.png', image)
+            yield stream.drain()
+    yield stream.drain()
+
+
+def _png_image(png):
+    """
+    PDF image dictionary entries and data for a PNG.
+
+    Greyscale PNGs, which is what QR codes render to, are embedded without
+    decoding: PDF reads their compressed rows as they are.
+    """
+    position, idat = 8, []
+    while position < len(png):
+        length, chunk_type = struct.unpack('>I4s', png[position:position + 8])
+        data = png[position + 8:position + 8 + length]
+        if chunk_type == b'IHDR':
+            width, height, depth, color_type, _, _, interlace = struct.unpack('>IIBBBBB', data)
+        elif chunk_type == b'IDAT':
+            idat.append(data)
+        position += length + 12
+
+    if color_type == 0 and not interlace:
+        entries = (
+            f'/Width {width} /Height {height} /ColorSpace /DeviceGray /BitsPerComponent {depth} '
+            f'/Filter /FlateDecode /DecodeParms << /Predictor 15 /Colors 1 '
+            f'/BitsPerComponent {depth} /Columns {width} >>'
+        )
+        return entries, b''.join(idat)
+
+    with Image.open(io.BytesIO(png)) as image:
+        image = image.convert('L')
+        entries = (
+            f'/Width {image.width} /Height {image.height} /ColorSpace /DeviceGray '
+            f'/BitsPerComponent 8 /Filter /FlateDecode'
+        )
+        return entries, zlib.compress(image.tobytes())
+
+
+def _pdf_text(value, limit=40):
+    value = str(value or '')
+    if len(value) > limit:
+        value = value[:limit - 1] + '...'
+    text = value.encode('cp1252', errors='replace')
+    return b'(' + text.replace(b'\\', b'\\\\').replace(b'(', b'\\(').replace(b')', b'\\)') + b')'
+
+
+def _ticket_page(registration, event):
+    """Content stream of one ticket page."""
+    lines = [
+        (b'/F2 14', event.name),
+        (b'/F1 10', f'{timezone.localtime(event.start_time):%d %b %Y, %H:%M} - {event.location}'),
+        (b'/F2 13', registration.admin_user.name),
+        (b'/F1 10', registration.admin_user.email),
+    ]
+    if registration.attendance_code:
+        lines.append((b'/F2 12', f'Attendance code: {registration.attendance_code}'))
+    lines.append((b'/F1 8', f'Registration #{registration.pk}'))
+
+    left = (PAGE_WIDTH - QR_SIZE) // 2
+    top = PAGE_HEIGHT - 24 - QR_SIZE
+    content = [b'q %d 0 0 %d %d %d cm /Im0 Do Q' % (QR_SIZE, QR_SIZE, left, top), b'BT']
+    y = top - 22
+    for font, text in lines:
+        content.append(b'%s Tf 1 0 0 1 24 %d Tm %s Tj' % (font, y, _pdf_text(text)))
+        y -= 18
+    content.append(b'ET')
+    return b'\n'.join(content)
+
+
+class _PdfWriter:
+    """Serializes PDF objects one at a time, remembering their offsets."""
+
+    def __init__(self):
+        self.offsets = {}
+        self.position = 0
+
+    def _out(self, data):
+        self.position += len(data)
+        return data
+
+    def header(self):
+        return self._out(b'%PDF-1.4\n%\xe2\xe3\xcf\xd3\n')
+
+    def object(self, object_id, body, stream=None):
+        self.offsets[object_id] = self.position
+        if stream is not None:
+            body = b'%s /Length %d >>\nstream\n%s\nendstream' % (body, len(stream), stream)
+        return self._out(b'%d 0 obj\n%s\nendobj\n' % (object_id, body))
+
+    def trailer(self, root_id):
+        size = max(self.offsets) + 1
+        xref = [b'xref\n0 %d\n' % size, b'0000000000 65535 f \n']
+        xref.extend(b'%010d 00000 n \n' % self.offsets[object_id] for object_id in range(1, size))
+        start = self.position
+        return self._out(
+            b''.join(xref) + b'trailer\n<< /Size %d /Root %d 0 R >>\nstartxref\n%d\n%%%%EOF\n' % (size, root_id, start)
+        )
+
+
+def stream_ticket_pdf(registrations, event):
+    """Yield a PDF with one A6 page per ticket."""
+    writer = _PdfWriter()
+    catalog_id, pages_id, font_id, bold_font_id = 1, 2, 3, 4
+    yield writer.header()
+    yield writer.object(font_id, b'<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>')
+    yield writer.object(
+        bold_font_id, b'<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica-Bold /Encoding /WinAnsiEncoding >>'
+    )
+
+    page_ids = []
+    next_id = bold_font_id + 1
+    for registration, image in _with_images(registrations, event):
+        image_id, content_id, page_id = next_id, next_id + 1, next_id + 2
+        next_id += 3
+        entries, data = _png_image(image)
+        yield writer.object(image_id, b'<< /Type /XObject /Subtype /Image %s' % entries.encode(), data)
+        yield writer.object(content_id, b'<<', _ticket_page(registration, event))
+        yield writer.object(page_id, (
+            b'<< /Type /Page /Parent %d 0 R /MediaBox [0 0 %d %d] '
+            b'/Resources << /Font << /F1 %d 0 R /F2 %d 0 R >> /XObject << /Im0 %d 0 R >> >> '
+            b'/Contents %d 0 R >>'
+        ) % (pages_id, PAGE_WIDTH, PAGE_HEIGHT, font_id, bold_font_id, image_id, content_id))
+        page_ids.append(page_id)
+
+    kids = b' '.join(b'%d 0 R' % page_id for page_id in page_ids)
+    yield writer.object(pages_id, b'<< /Type /Pages /Kids [%s] /Count %d >>' % (kids, len(page_ids)))
+    yield writer.object(catalog_id, b'<< /Type /Catalog /Pages %d 0 R >>' % pages_id)
+    yield writer.trailer(catalog_id)
@@ -4,9 +4,17 @@ from .views import (
     RegistrationCreateView,
     RegistrationDetailView,
     RegistrationCancelView,
+    RegistrationQRCodeView,
     AttendanceConfirmView,
+    BulkCheckInView,
+    EventTicketsView,
+    RegistrationExportView,
+    RegistrationExportDownloadView,
     AdminRegistrationListView,
-    EventRegistrationsView
+    EventRegistrationsView,
+    WaitlistView,
+    WaitlistLeaveView,
+    AdminWaitlistView
 )
 
 urlpatterns = [
@@ -14,7 +22,15 @@ urlpatterns = [
     path('create/', RegistrationCreateView.as_view(), name='registration-create'),
     path('<int:pk>/', RegistrationDetailView.as_view(), name='registration-detail'),
     path('<int:pk>/cancel/', RegistrationCancelView.as_view(), name='registration-cancel'),
+    path('<int:pk>/qr-code/', RegistrationQRCodeView.as_view(), name='registration-qr-code'),
     path('confirm-attendance/', AttendanceConfirmView.as_view(), name='confirm-attendance'),
     path('admin/', AdminRegistrationListView.as_view(), name='admin-registration-list'),
     path('admin/event/<int:event_id>/', EventRegistrationsView.as_view(), name='event-registrations'),
+    path('admin/export/', RegistrationExportView.as_view(), name='registration-export'),
+    path('admin/export/<str:task_id>/', RegistrationExportDownloadView.as_view(), name='registration-export-download'),
+    path('admin/event/<int:event_id>/check-in/', BulkCheckInView.as_view(), name='bulk-check-in'),
+    path('admin/event/<int:event_id>/tickets/', EventTicketsView.as_view(), name='event-tickets'),
+    path('waitlist/', WaitlistView.as_view(), name='waitlist'),
+    path('waitlist/<int:pk>/', WaitlistLeaveView.as_view(), name='waitlist-leave'),
+    path('admin/waitlist/', AdminWaitlistView.as_view(), name='admin-waitlist'),
 ] 
\ No newline at end of file
@@ -0,0 +1,105 @@
+import threading
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import cache, caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+
+# Events whose attendance codes each process keeps in memory
+DEFAULT_MAX_SNAPSHOTS = 256
+
+
+class AttendanceCodeVerifier:
+    """
+    In-process registry of the attendance codes issued for each event.
+
+    Guest check-ins consult it before querying registrations, so mistyped
+    or brute-forced codes are rejected without a database hit. Each event's
+    code set is loaded once per process, either when the event's QR code is
+    generated or on the first lookup, and tagged with a version held in the
+    shared cache. Issuing a new code bumps that version, and a miss against
+    a stale snapshot reloads the set before answering. Only the
+    ``max_snapshots`` most recently used events are kept, so past events
+    do not accumulate in long-running processes.
+
+    A per-process cache never sees another process's version bumps, so
+    there a miss is confirmed with an indexed existence query instead.
+    """
+
+    def __init__(self, max_snapshots=None):
+        self.max_snapshots = max_snapshots or getattr(
+            settings, 'ATTENDANCE_CODE_SNAPSHOTS', DEFAULT_MAX_SNAPSHOTS
+        )
+        self._snapshots = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _version_key(event_id):
+        return f'attendance-codes-version:{event_id}'
+
+    def _current_version(self, event_id):
+        return cache.get(self._version_key(event_id), 0)
+
+    @staticmethod
+    def _cache_is_shared():
+        return not isinstance(caches['default'], (LocMemCache, DummyCache))
+
+    def load(self, event_id):
+        """Read the event's attendance codes from the database."""
+        from .models import Registration
+
+        version = self._current_version(event_id)
+        codes = frozenset(
+            Registration.objects.filter(
+                event_id=event_id, attendance_code__isnull=False
+            ).values_list('attendance_code', flat=True)
+        )
+        with self._lock:
+            self._snapshots[event_id] = (version, codes)
+            self._snapshots.move_to_end(event_id)
+            while len(self._snapshots) > self.max_snapshots:
+                self._snapshots.popitem(last=False)
+        return codes
+
+    def invalidate(self, event_id):
+        """Mark every process's snapshot of the event as stale."""
+        key = self._version_key(event_id)
+        if not cache.add(key, 1, timeout=None):
+            try:
+                cache.incr(key)
+            except ValueError:
+                cache.set(key, 1, timeout=None)
+
+    def forget(self, event_id):
+        """Drop this process's snapshot of the event."""
+        with self._lock:
+            self._snapshots.pop(event_id, None)
+
+    def is_valid(self, event_id, code):
+        """
+        Check whether ``code`` was issued for the event.
+
+        False means the code is definitely unknown. True means it was
+        issued; the registration itself still needs to be checked.
+        """
+        with self._lock:
+            snapshot = self._snapshots.get(event_id)
+            if snapshot is not None:
+                self._snapshots.move_to_end(event_id)
+        if snapshot is None:
+            return code in self.load(event_id)
+
+        version, codes = snapshot
+        if code in codes:
+            return True
+        if not self._cache_is_shared():
+            from .models import Registration
+
+            return Registration.objects.filter(event_id=event_id, attendance_code=code).exists()
+        if version != self._current_version(event_id):
+            return code in self.load(event_id)
+        return False
+
+
+attendance_codes = AttendanceCodeVerifier()
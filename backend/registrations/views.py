@@ -1,29 +1,66 @@
 from rest_framework import generics, permissions, status
 from rest_framework.response import Response
 from rest_framework.views import APIView
+from rest_framework.reverse import reverse
 from django.shortcuts import get_object_or_404
-import qrcode
-import io
-from django.http import HttpResponse
-from .models import Registration
+from django.core.files.storage import default_storage
+from django.http import FileResponse, Http404, HttpResponse, HttpResponseNotModified
+from django.utils.http import parse_etags
+from django.utils import timezone
+from .models import Registration, WaitlistEntry
 from .serializers import (
     RegistrationSerializer, 
     RegistrationCreateSerializer, 
     RegistrationListSerializer,
-    AttendanceConfirmSerializer
+    AttendanceConfirmSerializer,
+    BulkCheckInSerializer,
+    EventTicketsSerializer,
+    RegistrationExportSerializer,
+    WaitlistEntrySerializer,
+    AdminWaitlistEntrySerializer,
+    WaitlistJoinSerializer
+)
+from .exceptions import (
+    AlreadyRegistered,
+    AlreadyWaitlisted,
+    EventUnavailable,
+    RegistrationConflict
 )
 from events.models import Event
-from events.views import IsAdminUser
+from events.qr import QR_IMAGE_FORMATS, qr_code_etag
+from events.views import IsAdminUser, QRCodeImageMixin, event_clock_aggregates
+from campus_connect.async_views import AsyncAPIView
+from campus_connect.conditional import ConditionalGetMixin
+from campus_connect.pagination import RegistrationPagination
+from campus_connect.streaming import streaming_response
+from .exports import EXPORT_FORMATS, export_filename, stream_export
+from .tickets import TICKET_FORMATS, get_ticket_image, stream_ticket_pdf, stream_ticket_zip, ticket_filename
+
+
+class EventRegistrationValidatorsMixin(ConditionalGetMixin):
+    """Conditional GET for registration views that nest the full event."""
+    
+    last_modified_fields = ('updated_at', 'event__updated_at')
+    
+    def get_etag_aggregates(self):
+        return event_clock_aggregates('event__')
 
 
-class RegistrationListView(generics.ListAPIView):
+class RegistrationUserValidatorsMixin(EventRegistrationValidatorsMixin):
+    """Conditional GET for registration views that also nest the user."""
+    
+    last_modified_fields = ('updated_at', 'event__updated_at', 'admin_user__updated_at')
+
+
+class RegistrationListView(EventRegistrationValidatorsMixin, generics.ListAPIView):
     """View for listing user's registrations."""
     
     serializer_class = RegistrationListSerializer
+    pagination_class = RegistrationPagination
     permission_classes = [permissions.IsAuthenticated]
     
     def get_queryset(self):
-        return Registration.objects.filter(admin_user=self.request.user)
+        return Registration.objects.filter(admin_user=self.request.user).select_related('event')
 
 
 class RegistrationCreateView(generics.CreateAPIView):
@@ -33,16 +70,17 @@ class RegistrationCreateView(generics.CreateAPIView):
     permission_classes = [permissions.IsAuthenticated]
 
 
-class RegistrationDetailView(generics.RetrieveAPIView):
+class RegistrationDetailView(RegistrationUserValidatorsMixin, generics.RetrieveAPIView):
     """View for retrieving registration details."""
     
     serializer_class = RegistrationSerializer
     permission_classes = [permissions.IsAuthenticated]
     
     def get_queryset(self):
+        queryset = Registration.objects.select_related('event', 'admin_user')
         if self.request.user.role == 'admin':
-            return Registration.objects.all()
-        return Registration.objects.filter(admin_user=self.request.user)
+            return queryset
+        return queryset.filter(admin_user=self.request.user)
 
 
 class RegistrationCancelView(generics.UpdateAPIView):
@@ -52,7 +90,9 @@ class RegistrationCancelView(generics.UpdateAPIView):
     permission_classes = [permissions.IsAuthenticated]
     
     def get_queryset(self):
-        return Registration.objects.filter(admin_user=self.request.user)
+        return Registration.objects.filter(
+            admin_user=self.request.user
+        ).select_related('event', 'admin_user')
     
     def update(self, request, *args, **kwargs):
         registration = self.get_object()
@@ -60,59 +100,87 @@ class RegistrationCancelView(generics.UpdateAPIView):
         return Response(self.get_serializer(registration).data)
 
 
-class RegistrationQRCodeView(APIView):
-    """View for generating a QR code for a registration."""
+class RegistrationQRCodeView(QRCodeImageMixin, APIView):
+    """View for a registration's check-in ticket as a QR code image."""
     
     permission_classes = [permissions.IsAuthenticated]
     
     def get(self, request, pk):
         # Get the registration
+        registrations = Registration.objects.select_related('event')
         if request.user.role == 'admin':
-            registration = get_object_or_404(Registration, pk=pk)
+            registration = get_object_or_404(registrations, pk=pk)
         else:
-            registration = get_object_or_404(Registration, pk=pk, admin_user=request.user)
+            registration = get_object_or_404(registrations, pk=pk, admin_user=request.user)
         
-        # Check if QR code is valid
-        if not registration.is_qr_code_valid:
+        if registration.status == 'cancelled':
             return Response(
-                {"detail": "QR code has expired."},
+                {"detail": "Registration has been cancelled."},
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        # Generate QR code
-        qr = qrcode.QRCode(
-            version=1,
-            error_correction=qrcode.constants.ERROR_CORRECT_L,
-            box_size=10,
-            border=4,
-        )
-        qr.add_data(registration.qr_code)
-        qr.make(fit=True)
+        # A ticket never changes, so its rendering is cached and revalidated by ETag
+        image_format, box_size = self._image_options(request)
+        etag = qr_code_etag(registration.ticket, image_format, box_size)
+        if etag in parse_etags(request.headers.get('If-None-Match', '')):
+            response = HttpResponseNotModified()
+        else:
+            image = get_ticket_image(registration, image_format, box_size)
+            response = HttpResponse(image, content_type=QR_IMAGE_FORMATS[image_format])
+        
+        max_age = max(0, int((registration.event.end_time - timezone.now()).total_seconds()))
+        response['ETag'] = etag
+        response['Cache-Control'] = f'private, max-age={max_age}'
+        return response
+
+
+class EventTicketsView(APIView):
+    """
+    View for printing an event's tickets as one PDF or ZIP (admin only).
+    
+    The document is streamed, one ticket at a time, so its size does not
+    depend on memory; cancelled registrations are left out.
+    """
+    
+    permission_classes = [permissions.IsAuthenticated, IsAdminUser]
+    
+    def get(self, request, event_id):
+        event = get_object_or_404(Event, pk=event_id)
         
-        img = qr.make_image(fill_color="black", back_color="white")
+        serializer = EventTicketsSerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        ticket_format = serializer.validated_data['ticket_format']
         
-        # Save QR code to buffer
-        buffer = io.BytesIO()
-        img.save(buffer, format="PNG")
-        buffer.seek(0)
+        registrations = Registration.objects.filter(event=event).select_related('admin_user').only(
+            'id', 'event_id', 'attendance_code', 'admin_user__name', 'admin_user__email'
+        ).order_by('admin_user__name', 'id')
+        if serializer.validated_data.get('status'):
+            registrations = registrations.filter(status=serializer.validated_data['status'])
+        else:
+            registrations = registrations.exclude(status='cancelled')
         
-        # Return QR code as image
-        return HttpResponse(buffer, content_type="image/png")
+        stream = stream_ticket_pdf if ticket_format == 'pdf' else stream_ticket_zip
+        response = streaming_response(
+            request, stream(registrations, event), content_type=TICKET_FORMATS[ticket_format]
+        )
+        response['Content-Disposition'] = f'attachment; filename="{ticket_filename(event, ticket_format)}"'
+        response['Cache-Control'] = 'no-store'
+        return response
 
 
-class AttendanceConfirmView(APIView):
-    """View for confirming attendance using event QR code."""
+class AttendanceConfirmView(AsyncAPIView):
+    """View for confirming attendance using event QR code (async)."""
     
     permission_classes = [permissions.IsAuthenticated]
     
-    def post(self, request):
+    async def post(self, request):
         serializer = AttendanceConfirmSerializer(data=request.data, context={'request': request})
         serializer.is_valid(raise_exception=True)
         
         event_qr_code = serializer.validated_data['event_qr_code']
         attendance_code = serializer.validated_data.get('attendance_code', '')
         
-        registration, message = Registration.confirm_attendance(
+        registration, message = await Registration.aconfirm_attendance(
             event_qr_code=event_qr_code,
             user=request.user,
             attendance_code=attendance_code
@@ -130,11 +198,33 @@ class AttendanceConfirmView(APIView):
         })
 
 
-class AdminRegistrationListView(generics.ListAPIView):
+class BulkCheckInView(APIView):
+    """View for syncing a batch of offline door scans for an event (admin only)."""
+    
+    permission_classes = [permissions.IsAuthenticated, IsAdminUser]
+    
+    def post(self, request, event_id):
+        get_object_or_404(Event, pk=event_id)
+        
+        serializer = BulkCheckInSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        
+        results = Registration.bulk_check_in(event_id, serializer.validated_data['scans'])
+        checked_in = sum(1 for result in results if result['status'] == 'checked_in')
+        
+        return Response({
+            "results": results,
+            "checked_in": checked_in,
+            "message": f"Processed {len(results)} scans, {checked_in} new check-ins."
+        })
+
+
+class AdminRegistrationListView(RegistrationUserValidatorsMixin, generics.ListAPIView):
     """View for listing all registrations (admin only)."""
     
-    queryset = Registration.objects.all()
+    queryset = Registration.objects.select_related('event', 'admin_user')
     serializer_class = RegistrationSerializer
+    pagination_class = RegistrationPagination
     permission_classes = [permissions.IsAuthenticated, IsAdminUser]
     
     def get_queryset(self):
@@ -153,12 +243,143 @@ class AdminRegistrationListView(generics.ListAPIView):
         return queryset 
 
 
-class EventRegistrationsView(generics.ListAPIView):
+class RegistrationExportView(APIView):
+    """
+    View for registration exports as CSV or NDJSON (admin only).
+    
+    GET streams the export in the response. POST queues it for a background
+    task and answers at once with where to download it when it is ready.
+    """
+    
+    permission_classes = [permissions.IsAuthenticated, IsAdminUser]
+    
+    def get(self, request):
+        serializer = RegistrationExportSerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        filters = serializer.validated_data
+        
+        export_format = filters['export_format']
+        response = streaming_response(request, stream_export(filters), content_type=EXPORT_FORMATS[export_format])
+        response['Content-Disposition'] = f'attachment; filename="{export_filename(export_format)}"'
+        return response
+    
+    def post(self, request):
+        from .tasks import export_registrations
+        
+        serializer = RegistrationExportSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        # The task validates the raw values again; they are JSON safe
+        filters = {name: request.data[name] for name in serializer.fields if name in request.data}
+        
+        task_id = export_registrations.enqueue(filters)
+        return Response({
+            'task_id': task_id,
+            'status_url': reverse('task-detail', args=[task_id], request=request),
+            'download_url': reverse('registration-export-download', args=[task_id], request=request),
+        }, status=status.HTTP_202_ACCEPTED)
+
+
+class RegistrationExportDownloadView(APIView):
+    """View for downloading an export written by a background task (admin only)."""
+    
+    permission_classes = [permissions.IsAuthenticated, IsAdminUser]
+    
+    def get(self, request, task_id):
+        from taskqueue.queue import get_backend
+        from .tasks import export_registrations
+        
+        task = get_backend().get_status(task_id)
+        if task is None or task['name'] != export_registrations.name:
+            raise Http404
+        if task['status'] != 'succeeded':
+            return Response(
+                {"detail": f"The export is {task['status']}.", "status": task['status']},
+                status=status.HTTP_409_CONFLICT
+            )
+        
+        result = task['result']
+        export_format = result['path'].rsplit('.', 1)[-1]
+        try:
+            export = default_storage.open(result['path'], 'rb')
+        except FileNotFoundError:
+            raise Http404
+        return FileResponse(
+            export, as_attachment=True, filename=result['filename'],
+            content_type=EXPORT_FORMATS[export_format]
+        )
+
+
+class EventRegistrationsView(RegistrationUserValidatorsMixin, generics.ListAPIView):
     """View for listing registrations for a specific event (admin only)."""
     
     serializer_class = RegistrationSerializer
+    pagination_class = RegistrationPagination
     permission_classes = [permissions.IsAuthenticated, IsAdminUser]
     
     def get_queryset(self):
         event_id = self.kwargs.get('event_id')
-        return Registration.objects.filter(event_id=event_id).select_related('admin_user', 'event') 
\ No newline at end of file
+        return Registration.objects.filter(event_id=event_id).select_related('admin_user', 'event') 
+
+
+class WaitlistView(generics.ListCreateAPIView):
+    """View for listing the user's waitlist entries and joining a waitlist."""
+    
+    serializer_class = WaitlistEntrySerializer
+    permission_classes = [permissions.IsAuthenticated]
+    
+    def get_queryset(self):
+        return WaitlistEntry.objects.filter(
+            admin_user=self.request.user
+        ).select_related('event').with_position()
+    
+    def create(self, request, *args, **kwargs):
+        serializer = WaitlistJoinSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        
+        try:
+            registration, entry = WaitlistEntry.join(
+                serializer.validated_data['event_id'], request.user
+            )
+        except EventUnavailable as exc:
+            return Response({"event_id": [exc.message]}, status=status.HTTP_400_BAD_REQUEST)
+        except (AlreadyRegistered, AlreadyWaitlisted) as exc:
+            raise RegistrationConflict(exc.message)
+        
+        # A spot was free, so the user skipped the queue entirely
+        if registration:
+            return Response({
+                "registration": RegistrationSerializer(registration).data,
+                "message": "A spot was available. You are registered."
+            }, status=status.HTTP_201_CREATED)
+        
+        return Response({
+            "waitlist": WaitlistEntrySerializer(entry).data,
+            "message": "Event is full. You have been added to the waitlist."
+        }, status=status.HTTP_201_CREATED)
+
+
+class WaitlistLeaveView(generics.DestroyAPIView):
+    """View for leaving a waitlist."""
+    
+    serializer_class = WaitlistEntrySerializer
+    permission_classes = [permissions.IsAuthenticated]
+    
+    def get_queryset(self):
+        return WaitlistEntry.objects.filter(admin_user=self.request.user)
+
+
+class AdminWaitlistView(generics.ListAPIView):
+    """View for listing waitlist entries (admin only)."""
+    
+    serializer_class = AdminWaitlistEntrySerializer
+    permission_classes = [permissions.IsAuthenticated, IsAdminUser]
+    
+    def get_queryset(self):
+        queryset = WaitlistEntry.objects.select_related('event', 'admin_user').with_position()
+        
+        # Filter by event
+        event_id = self.request.query_params.get('event_id')
+        if event_id:
+            queryset = queryset.filter(event_id=event_id)
+        
+        return queryset
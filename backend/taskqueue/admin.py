@@ -0,0 +1,13 @@
+from django.contrib import admin
+from .models import Task
+
+
+@admin.register(Task)
+class TaskAdmin(admin.ModelAdmin):
+    """Admin interface for the Task model."""
+    
+    list_display = ('id', 'name', 'status', 'attempts', 'run_after', 'started_at', 'finished_at')
+    list_filter = ('status', 'name')
+    search_fields = ('name',)
+    readonly_fields = [field.name for field in Task._meta.fields]
+    ordering = ('-id',)
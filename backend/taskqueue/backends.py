@@ -0,0 +1,328 @@
+"""
+Task queue backends.
+
+``DatabaseBackend`` stores tasks in the ``Task`` table as part of the
+enqueuing transaction: workers (``manage.py run_tasks``) only see a task
+once the data it refers to is committed, and a rolled-back transaction
+takes its tasks with it. No broker is needed; workers claim rows with
+``SKIP LOCKED``.
+
+``ThreadBackend`` needs no worker process. Tasks run in a thread pool in
+the web process once the enqueuing transaction commits, and are lost if
+the process exits, so it suits development and single-process setups.
+"""
+
+import json
+import logging
+import statistics
+import threading
+import traceback
+import uuid
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import close_old_connections, connection, transaction
+from django.db.models import Count, F, Min, Q
+from django.utils import timezone
+
+from .queue import get_task
+
+logger = logging.getLogger(__name__)
+
+# Seconds of finished tasks that latency metrics cover
+DEFAULT_METRICS_WINDOW = 900
+
+# Most finished tasks sampled for latency percentiles
+METRICS_SAMPLE_SIZE = 10000
+
+STATUS_FIELDS = (
+    'id', 'name', 'status', 'attempts', 'max_attempts', 'run_after', 'created_at',
+    'started_at', 'finished_at', 'result', 'error',
+)
+
+
+def _to_json(value):
+    """Round-trip through JSON, the way stored arguments and results are."""
+    return json.loads(json.dumps(value, cls=DjangoJSONEncoder))
+
+
+def _percentiles(seconds):
+    if not seconds:
+        return {'count': 0, 'p50': None, 'p95': None, 'max': None}
+    seconds = sorted(seconds)
+    return {
+        'count': len(seconds),
+        'p50': round(statistics.median(seconds), 3),
+        'p95': round(seconds[min(len(seconds) - 1, int(len(seconds) * 0.95))], 3),
+        'max': round(seconds[-1], 3),
+    }
+
+
+def _run(name, args, kwargs):
+    """
+    Run a task by name and return ``(status, result, error, definition)``;
+    ``definition`` is None for unknown tasks, which are never retried.
+    """
+    try:
+        definition = get_task(name)
+    except KeyError:
+        return 'failed', None, f'Unknown task: {name}', None
+    try:
+        result = _to_json(definition(*args, **kwargs))
+    except Exception:
+        logger.exception('Task %s failed', name)
+        return 'failed', None, traceback.format_exc(), definition
+    return 'succeeded', result, '', definition
+
+
+class DatabaseBackend:
+    """
+    Tasks stored in the database and run by ``run_tasks`` workers.
+
+    Args:
+        visibility_timeout: Seconds after which a running task whose worker
+            has not finished it is assumed lost and run again
+        retention: Seconds finished tasks are kept for
+        metrics_window: Seconds of finished tasks latency metrics cover
+    """
+
+    def __init__(self, visibility_timeout=600, retention=7 * 24 * 3600, metrics_window=DEFAULT_METRICS_WINDOW):
+        self.visibility_timeout = visibility_timeout
+        self.retention = retention
+        self.metrics_window = metrics_window
+
+    def enqueue(self, definition, args, kwargs, run_after=None):
+        from .models import Task
+
+        task = Task.objects.create(
+            name=definition.name, args=list(args), kwargs=kwargs,
+            max_attempts=definition.max_attempts, run_after=run_after or timezone.now(),
+        )
+        return task.pk
+
+    def enqueue_many(self, definition, args_list):
+        from .models import Task
+
+        now = timezone.now()
+        tasks = Task.objects.bulk_create([
+            Task(name=definition.name, args=list(args), kwargs={}, max_attempts=definition.max_attempts, run_after=now)
+            for args in args_list
+        ])
+        return [task.pk for task in tasks]
+
+    def claim(self, worker, limit):
+        """Mark up to ``limit`` ready tasks as running on ``worker`` and return them."""
+        from .models import Task
+
+        now = timezone.now()
+        claimable = Q(status='queued', run_after__lte=now) | Q(
+            # Tasks whose worker died mid-run
+            status='running', started_at__lt=now - timedelta(seconds=self.visibility_timeout)
+        )
+        with transaction.atomic():
+            candidates = Task.objects.filter(claimable).order_by('run_after', 'id')
+            if connection.features.has_select_for_update_skip_locked:
+                candidates = candidates.select_for_update(skip_locked=True)
+            task_ids = list(candidates.values_list('pk', flat=True)[:limit])
+            if not task_ids:
+                return []
+            # Without row locks (SQLite) the status check keeps claims exclusive
+            Task.objects.filter(claimable, pk__in=task_ids).update(
+                status='running', started_at=now, finished_at=None,
+                attempts=F('attempts') + 1, worker=worker,
+            )
+        return list(Task.objects.filter(pk__in=task_ids, worker=worker, started_at=now, status='running'))
+
+    def execute(self, task):
+        """Run a claimed task and record the outcome."""
+        if task.attempts > task.max_attempts:
+            self._finish(task, status='failed', error='The worker was lost during the final attempt.')
+            return
+
+        status, result, error, definition = _run(task.name, task.args, task.kwargs)
+        if status == 'failed' and definition is not None and task.attempts < task.max_attempts:
+            delay = definition.retry_delay_for(task.attempts)
+            self._finish(
+                task, status='queued', error=error,
+                run_after=timezone.now() + timedelta(seconds=delay), finished_at=None,
+            )
+        else:
+            self._finish(task, status=status, result=result, error=error)
+
+    def _finish(self, task, **fields):
+        from .models import Task
+
+        fields.setdefault('finished_at', timezone.now())
+        # A task reclaimed by another worker after a timeout is no longer ours
+        Task.objects.filter(pk=task.pk, worker=task.worker, status='running').update(**fields)
+
+    def prune(self):
+        """Delete finished tasks older than the retention period; return how many."""
+        from .models import Task
+
+        cutoff = timezone.now() - timedelta(seconds=self.retention)
+        deleted, _ = Task.objects.filter(status__in=('succeeded', 'failed'), finished_at__lt=cutoff).delete()
+        return deleted
+
+    def get_status(self, task_id):
+        from .models import Task
+
+        try:
+            task = Task.objects.filter(pk=int(task_id)).values(*STATUS_FIELDS).first()
+        except (TypeError, ValueError):
+            return None
+        return task
+
+    def metrics(self):
+        from .models import Task
+
+        now = timezone.now()
+        ready = Q(status='queued', run_after__lte=now)
+        depth = Task.objects.filter(status__in=('queued', 'running')).aggregate(
+            ready=Count('pk', filter=ready),
+            scheduled=Count('pk', filter=Q(status='queued', run_after__gt=now)),
+            running=Count('pk', filter=Q(status='running')),
+            oldest_ready=Min('run_after', filter=ready),
+        )
+        oldest_ready = depth.pop('oldest_ready')
+        ready_by_task = dict(
+            Task.objects.filter(ready).values_list('name').annotate(count=Count('pk')).order_by()
+        )
+
+        finished = Task.objects.filter(
+            status__in=('succeeded', 'failed'), finished_at__gte=now - timedelta(seconds=self.metrics_window)
+        ).order_by('-finished_at').values_list('status', 'run_after', 'started_at', 'finished_at')
+        outcomes = {'succeeded': 0, 'failed': 0}
+        waits, runs = [], []
+        for status, run_after, started_at, finished_at in finished[:METRICS_SAMPLE_SIZE]:
+            outcomes[status] += 1
+            if started_at:
+                waits.append((started_at - run_after).total_seconds())
+                runs.append((finished_at - started_at).total_seconds())
+
+        return {
+            'backend': 'database',
+            'depth': depth,
+            'ready_by_task': ready_by_task,
+            'oldest_ready_age': (now - oldest_ready).total_seconds() if oldest_ready else None,
+            'window': self.metrics_window,
+            **outcomes,
+            'wait': _percentiles(waits),
+            'run': _percentiles(runs),
+        }
+
+
+class ThreadBackend:
+    """
+    Tasks run in a thread pool inside the enqueuing process.
+
+    Args:
+        workers: Threads running tasks
+        history: Finished tasks kept for status lookups
+        metrics_window: Seconds of finished tasks latency metrics cover
+    """
+
+    def __init__(self, workers=2, history=1000, metrics_window=DEFAULT_METRICS_WINDOW):
+        self.executor = ThreadPoolExecutor(workers, thread_name_prefix='tasks')
+        self.history = history
+        self.metrics_window = metrics_window
+        self.tasks = OrderedDict()
+        self.finished = deque(maxlen=METRICS_SAMPLE_SIZE)
+        self.lock = threading.Lock()
+
+    def enqueue(self, definition, args, kwargs, run_after=None):
+        task = {
+            'id': uuid.uuid4().hex, 'name': definition.name,
+            'args': _to_json(list(args)), 'kwargs': _to_json(kwargs),
+            'status': 'queued', 'attempts': 0, 'max_attempts': definition.max_attempts,
+            'run_after': run_after or timezone.now(), 'created_at': timezone.now(),
+            'started_at': None, 'finished_at': None, 'result': None, 'error': '',
+        }
+
+        def queue():
+            with self.lock:
+                self.tasks[task['id']] = task
+            self._schedule(task)
+
+        transaction.on_commit(queue)
+        return task['id']
+
+    def enqueue_many(self, definition, args_list):
+        return [self.enqueue(definition, args, {}) for args in args_list]
+
+    def _schedule(self, task):
+        delay = (task['run_after'] - timezone.now()).total_seconds()
+        if delay > 0:
+            timer = threading.Timer(delay, self.executor.submit, [self._execute, task])
+            timer.daemon = True
+            timer.start()
+        else:
+            self.executor.submit(self._execute, task)
+
+    def _execute(self, task):
+        close_old_connections()
+        try:
+            with self.lock:
+                task.update(status='running', started_at=timezone.now(), attempts=task['attempts'] + 1)
+            status, result, error, definition = _run(task['name'], task['args'], task['kwargs'])
+            now = timezone.now()
+            with self.lock:
+                if status == 'failed' and definition is not None and task['attempts'] < task['max_attempts']:
+                    delay = definition.retry_delay_for(task['attempts'])
+                    task.update(status='queued', error=error, run_after=now + timedelta(seconds=delay))
+                else:
+                    task.update(status=status, result=result, error=error, finished_at=now)
+                    self.finished.append((now, status, task['run_after'], task['started_at']))
+                    self._trim()
+            if task['status'] == 'queued':
+                self._schedule(task)
+        finally:
+            close_old_connections()
+
+    def _trim(self):
+        finished = [task_id for task_id, task in self.tasks.items() if task['finished_at']]
+        for task_id in finished[:max(0, len(finished) - self.history)]:
+            del self.tasks[task_id]
+
+    def get_status(self, task_id):
+        with self.lock:
+            task = self.tasks.get(task_id)
+            return {field: task[field] for field in STATUS_FIELDS} if task else None
+
+    def metrics(self):
+        now = timezone.now()
+        with self.lock:
+            unfinished = [task for task in self.tasks.values() if not task['finished_at']]
+            finished = list(self.finished)
+
+        ready = [task for task in unfinished if task['status'] == 'queued' and task['run_after'] <= now]
+        ready_by_task = {}
+        for task in ready:
+            ready_by_task[task['name']] = ready_by_task.get(task['name'], 0) + 1
+
+        since = now - timedelta(seconds=self.metrics_window)
+        outcomes = {'succeeded': 0, 'failed': 0}
+        waits, runs = [], []
+        for finished_at, status, run_after, started_at in finished:
+            if finished_at >= since:
+                outcomes[status] += 1
+                waits.append((started_at - run_after).total_seconds())
+                runs.append((finished_at - started_at).total_seconds())
+
+        oldest_ready = min((task['run_after'] for task in ready), default=None)
+        return {
+            'backend': 'thread',
+            'depth': {
+                'ready': len(ready),
+                'scheduled': sum(1 for task in unfinished if task['status'] == 'queued') - len(ready),
+                'running': sum(1 for task in unfinished if task['status'] == 'running'),
+            },
+            'ready_by_task': ready_by_task,
+            'oldest_ready_age': (now - oldest_ready).total_seconds() if oldest_ready else None,
+            'window': self.metrics_window,
+            **outcomes,
+            'wait': _percentiles(waits),
+            'run': _percentiles(runs),
+        }
@@ -0,0 +1,81 @@
+import os
+import signal
+import socket
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections
+
+from taskqueue.backends import DatabaseBackend
+from taskqueue.queue import get_backend
+
+# Seconds between prunes of old finished tasks
+PRUNE_INTERVAL = 3600
+
+
+class Command(BaseCommand):
+    """
+    Run queued background tasks until stopped.
+
+    Claims ready tasks from the database whenever a thread is free; any
+    number of workers can run against the same database. SIGTERM or SIGINT
+    stops claiming and waits for the running tasks to finish.
+    """
+
+    help = 'Run background tasks from the database queue.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--concurrency', type=int, default=4, help='Tasks run at the same time.')
+        parser.add_argument('--poll-interval', type=float, default=1.0,
+                            help='Seconds to wait before checking an empty queue again.')
+        parser.add_argument('--once', action='store_true', help='Exit once no task is ready.')
+
+    def handle(self, *args, **options):
+        backend = get_backend()
+        if not isinstance(backend, DatabaseBackend):
+            raise CommandError('run_tasks needs TASK_QUEUE to use taskqueue.backends.DatabaseBackend.')
+
+        worker = f'{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}'
+        concurrency = options['concurrency']
+        stopping = threading.Event()
+        for signum in (signal.SIGTERM, signal.SIGINT):
+            signal.signal(signum, lambda *_: stopping.set())
+
+        self.stdout.write(f'Worker {worker} running {concurrency} tasks at a time.')
+        executed = 0
+        last_prune = None
+        running = set()
+        with ThreadPoolExecutor(concurrency, thread_name_prefix='run-tasks') as executor:
+            while not stopping.is_set():
+                if last_prune is None or time.monotonic() - last_prune > PRUNE_INTERVAL:
+                    pruned = backend.prune()
+                    if pruned:
+                        self.stdout.write(f'Pruned {pruned} finished tasks.')
+                    last_prune = time.monotonic()
+
+                close_old_connections()
+                tasks = backend.claim(worker, concurrency - len(running))
+                for task in tasks:
+                    running.add(executor.submit(self.run_task, backend, task))
+                executed += len(tasks)
+
+                if running:
+                    running = wait(running, timeout=options['poll_interval'], return_when=FIRST_COMPLETED).not_done
+                elif options['once']:
+                    break
+                else:
+                    stopping.wait(options['poll_interval'])
+            wait(running)
+
+        self.stdout.write(self.style.SUCCESS(f'Worker {worker} stopped after {executed} tasks.'))
+
+    @staticmethod
+    def run_task(backend, task):
+        close_old_connections()
+        try:
+            backend.execute(task)
+        finally:
+            close_old_connections()
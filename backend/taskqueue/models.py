@@ -0,0 +1,49 @@
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+
+
+class Task(models.Model):
+    """
+    A queued run of a background task, stored by ``DatabaseBackend``.
+
+    Workers claim ready rows with ``SELECT ... FOR UPDATE SKIP LOCKED``, so
+    any number of them can share the table. Finished rows are kept for a
+    while for status lookups and metrics, then pruned.
+    """
+
+    STATUS_CHOICES = (
+        ('queued', 'Queued'),
+        ('running', 'Running'),
+        ('succeeded', 'Succeeded'),
+        ('failed', 'Failed'),
+    )
+
+    name = models.CharField(_('name'), max_length=255)
+    args = models.JSONField(_('arguments'), default=list, encoder=DjangoJSONEncoder)
+    kwargs = models.JSONField(_('keyword arguments'), default=dict, encoder=DjangoJSONEncoder)
+    status = models.CharField(_('status'), max_length=20, choices=STATUS_CHOICES, default='queued')
+    attempts = models.PositiveIntegerField(_('attempts'), default=0)
+    max_attempts = models.PositiveIntegerField(_('max attempts'), default=3)
+    run_after = models.DateTimeField(_('run after'), default=timezone.now)
+    started_at = models.DateTimeField(_('started at'), blank=True, null=True)
+    finished_at = models.DateTimeField(_('finished at'), blank=True, null=True)
+    worker = models.CharField(_('worker'), max_length=255, blank=True)
+    result = models.JSONField(_('result'), blank=True, null=True, encoder=DjangoJSONEncoder)
+    error = models.TextField(_('error'), blank=True)
+    created_at = models.DateTimeField(_('created at'), auto_now_add=True)
+
+    class Meta:
+        verbose_name = _('task')
+        verbose_name_plural = _('tasks')
+        ordering = ['run_after', 'id']
+        indexes = [
+            # Claiming ready tasks, and queue depth
+            models.Index(fields=['status', 'run_after']),
+            # Metrics over recently finished tasks, and pruning
+            models.Index(fields=['status', 'finished_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.name} #{self.pk} ({self.status})"
@@ -0,0 +1,94 @@
+"""
+Background tasks.
+
+Functions decorated with ``@task`` in an app's ``tasks`` module can be
+queued with ``.enqueue(*args, **kwargs)`` and run later by the backend
+configured in ``TASK_QUEUE``. Arguments and return values must be JSON
+serializable (dates and UUIDs become strings). Tasks run at least once, so
+they should be safe to repeat.
+"""
+
+import threading
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+DEFAULT_BACKEND = 'taskqueue.backends.DatabaseBackend'
+
+DEFAULT_MAX_ATTEMPTS = 3
+
+# Seconds before the first retry; doubled for each later one
+DEFAULT_RETRY_DELAY = 30
+
+_registry = {}
+
+
+class TaskDefinition:
+    """A function that can be queued; calling it still runs it inline."""
+
+    def __init__(self, func, name, max_attempts, retry_delay):
+        self.func = func
+        self.name = name
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        self.__doc__ = func.__doc__
+
+    def __call__(self, *args, **kwargs):
+        return self.func(*args, **kwargs)
+
+    def __repr__(self):
+        return f'<TaskDefinition {self.name}>'
+
+    def enqueue(self, *args, **kwargs):
+        """Queue a run and return its task id."""
+        return get_backend().enqueue(self, args, kwargs)
+
+    def enqueue_at(self, run_after, *args, **kwargs):
+        """Queue a run that starts no earlier than ``run_after``."""
+        return get_backend().enqueue(self, args, kwargs, run_after=run_after)
+
+    def enqueue_many(self, args_list):
+        """Queue one run per tuple of positional arguments; return their task ids."""
+        return get_backend().enqueue_many(self, [tuple(args) for args in args_list])
+
+    def retry_delay_for(self, attempt):
+        """Seconds to wait after failed attempt number ``attempt``."""
+        return self.retry_delay * 2 ** (attempt - 1)
+
+
+def task(func=None, *, name=None, max_attempts=DEFAULT_MAX_ATTEMPTS, retry_delay=DEFAULT_RETRY_DELAY):
+    """
+    Register a function as a background task.
+
+    Args:
+        name: Registry name, by default ``<module>.<function>``
+        max_attempts: Runs before a failing task is given up on
+        retry_delay: Seconds before the first retry
+    """
+    def register(func):
+        definition = TaskDefinition(func, name or f'{func.__module__}.{func.__name__}', max_attempts, retry_delay)
+        _registry[definition.name] = definition
+        return definition
+
+    return register(func) if func is not None else register
+
+
+def get_task(name):
+    """Return the registered task called ``name``; raises KeyError if there is none."""
+    return _registry[name]
+
+
+_backend = None
+_backend_lock = threading.Lock()
+
+
+def get_backend():
+    """Return the process-wide backend configured by ``TASK_QUEUE``."""
+    global _backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                config = getattr(settings, 'TASK_QUEUE', {})
+                backend = import_string(config.get('BACKEND', DEFAULT_BACKEND))
+                _backend = backend(**config.get('OPTIONS', {}))
+    return _backend
@@ -0,0 +1,7 @@
+from django.urls import path
+from .views import TaskMetricsView, TaskDetailView
+
+urlpatterns = [
+    path('metrics/', TaskMetricsView.as_view(), name='task-metrics'),
+    path('<str:task_id>/', TaskDetailView.as_view(), name='task-detail'),
+]
@@ -0,0 +1,28 @@
+from django.http import Http404
+from rest_framework import permissions
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from events.views import IsAdminUser
+from .queue import get_backend
+
+
+class TaskMetricsView(APIView):
+    """View for background task queue depth and latency (admin only)."""
+    
+    permission_classes = [permissions.IsAuthenticated, IsAdminUser]
+    
+    def get(self, request):
+        return Response(get_backend().metrics())
+
+
+class TaskDetailView(APIView):
+    """View for the status and result of one background task (admin only)."""
+    
+    permission_classes = [permissions.IsAuthenticated, IsAdminUser]
+    
+    def get(self, request, task_id):
+        task = get_backend().get_status(task_id)
+        if task is None:
+            raise Http404
+        return Response(task)
@@ -0,0 +1,20 @@
+from allauth.account.adapter import DefaultAccountAdapter
+
+
+class AccountAdapter(DefaultAccountAdapter):
+    """
+    Account adapter that sends allauth's email (verification, password
+    reset) from a background task, so requests never wait on SMTP.
+    
+    The message is rendered in the request, where its context is
+    available, and only sending is deferred.
+    """
+    
+    def send_mail(self, template_prefix, email, context):
+        from .tasks import send_email
+        
+        message = self.render_mail(template_prefix, email, context)
+        send_email.enqueue(
+            message.subject, message.body, message.from_email, message.to,
+            alternatives=list(getattr(message, 'alternatives', ())),
+        )
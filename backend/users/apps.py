@@ -3,4 +3,22 @@ from django.apps import AppConfig
 
 class UsersConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
-    name = 'users' 
\ No newline at end of file
+    name = 'users'
+
+    def ready(self):
+        from django.db.models.signals import post_delete
+        from .models import AdminUser
+        post_delete.connect(revoke_deleted_user_tokens, sender=AdminUser)
+
+
+def revoke_deleted_user_tokens(sender, instance, **kwargs):
+    """
+    Revoke a deleted user's tokens.
+
+    Authentication trusts token claims instead of loading the user, so a
+    token would otherwise outlive its user. A signal also covers queryset
+    deletes, which skip ``delete()``.
+    """
+    from .tokens import revoke_user_tokens
+
+    revoke_user_tokens(instance.pk)
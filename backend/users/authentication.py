@@ -0,0 +1,36 @@
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+
+from .models import ClaimsUser
+from .tokens import has_user_claims, is_revoked
+
+
+class ClaimsJWTAuthentication(JWTAuthentication):
+    """
+    JWT authentication that resolves the user from the token's claims.
+
+    Tokens are checked against the cached denylist instead of loading the
+    user. Tokens issued before claims were embedded fall back to a lookup.
+    """
+
+    def get_validated_token(self, raw_token):
+        validated_token = super().get_validated_token(raw_token)
+        if is_revoked(validated_token):
+            raise InvalidToken(_('Token has been revoked'))
+        return validated_token
+
+    def get_user(self, validated_token):
+        if not has_user_claims(validated_token):
+            return super().get_user(validated_token)
+
+        try:
+            user = ClaimsUser.from_claims(
+                validated_token, api_settings.USER_ID_FIELD, api_settings.USER_ID_CLAIM
+            )
+        except KeyError:
+            raise InvalidToken(_('Token contained no recognizable user identification'))
+        if not user.is_active:
+            raise AuthenticationFailed(_('User is inactive'), code='user_inactive')
+        return user
@@ -0,0 +1,66 @@
+import os
+import sys
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from campus_connect.imports import detect_format
+from users.provisioning import BATCH_SIZE, PASSWORD_MODES, UserProvisioning, stream_credentials_csv
+
+
+class Command(BaseCommand):
+    """
+    Create guest and student accounts in bulk from a CSV, JSON or NDJSON file.
+
+    Writes a CSV with one line per input row: its outcome, the account's
+    guest code and, with ``--passwords generate``, its password. The output
+    holds credentials; keep it somewhere safe.
+    """
+
+    help = 'Provision guest and student accounts in bulk and write their credentials as CSV.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help="File to import, or '-' for standard input.")
+        parser.add_argument('--format', dest='import_format', choices=['csv', 'json', 'ndjson'],
+                            help='File format (detected from the extension by default).')
+        parser.add_argument('--passwords', choices=PASSWORD_MODES, default='unusable',
+                            help='Give accounts unusable, generated or provided (password column) passwords.')
+        parser.add_argument('--role', choices=['guest', 'student'], default='guest',
+                            help='Role for rows without a role column.')
+        parser.add_argument('--hash-workers', type=int, default=os.cpu_count() or 1,
+                            help='Processes hashing passwords.')
+        parser.add_argument('--batch-size', type=int, default=BATCH_SIZE)
+        parser.add_argument('--output', help='Credentials file to write (standard output by default).')
+
+    def handle(self, *args, **options):
+        path = options['path']
+        import_format = options['import_format'] or detect_format(filename=path)
+        if import_format is None:
+            raise CommandError('Cannot detect the file format; pass --format.')
+
+        provisioning = UserProvisioning(
+            options['passwords'], role=options['role'], hash_workers=options['hash_workers'],
+            batch_size=options['batch_size'],
+        )
+        started = time.perf_counter()
+        try:
+            stream = sys.stdin.buffer if path == '-' else open(path, 'rb')
+            output = open(options['output'], 'w', newline='') if options['output'] else sys.stdout
+        except OSError as exc:
+            raise CommandError(str(exc))
+        try:
+            for line in stream_credentials_csv(provisioning.run(stream, import_format)):
+                output.write(line)
+        finally:
+            if stream is not sys.stdin.buffer:
+                stream.close()
+            if output is not sys.stdout:
+                output.close()
+        elapsed = time.perf_counter() - started
+
+        summary = (
+            f'Created {provisioning.created} of {provisioning.rows} users, '
+            f'{provisioning.error_count} errors, in {elapsed:.1f}s '
+            f'({provisioning.rows / elapsed if elapsed else 0:.0f} rows/s).'
+        )
+        self.stderr.write(self.style.SUCCESS(summary) if not provisioning.error_count else summary)
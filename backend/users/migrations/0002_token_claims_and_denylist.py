@@ -0,0 +1,43 @@
+# Generated by Django 4.2.10 on 2026-10-17 05:11
+
+from django.db import migrations, models
+import django.utils.timezone
+import users.models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RevokedToken',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('jti', models.CharField(blank=True, max_length=255, verbose_name='token id')),
+                ('user_id', models.BigIntegerField(verbose_name='user id')),
+                ('revoked_at', models.DateTimeField(default=django.utils.timezone.now, verbose_name='revoked at')),
+                ('expires_at', models.DateTimeField(db_index=True, verbose_name='expires at')),
+            ],
+            options={
+                'verbose_name': 'revoked token',
+                'verbose_name_plural': 'revoked tokens',
+            },
+        ),
+        migrations.CreateModel(
+            name='ClaimsUser',
+            fields=[
+            ],
+            options={
+                'proxy': True,
+                'indexes': [],
+                'constraints': [],
+            },
+            bases=('users.adminuser',),
+            managers=[
+                ('objects', users.models.AdminUserManager()),
+            ],
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.10 on 2026-10-17 06:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0002_token_claims_and_denylist'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='adminuser',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, verbose_name='updated at'),
+        ),
+    ]
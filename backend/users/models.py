@@ -1,5 +1,6 @@
 from django.db import models
 from django.contrib.auth.models import AbstractUser, BaseUserManager
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
 
@@ -58,10 +59,16 @@ class AdminUser(AbstractUser):
     reset_password_token = models.CharField(_('reset password token'), max_length=255, blank=True, null=True)
     reset_password_sent_at = models.DateTimeField(_('reset password sent at'), blank=True, null=True)
     remember_created_at = models.DateTimeField(_('remember created at'), blank=True, null=True)
+    # Nested in registration payloads, whose ETags include it
+    updated_at = models.DateTimeField(_('updated at'), auto_now=True)
 
     USERNAME_FIELD = 'email'
     REQUIRED_FIELDS = ['name']
 
+    # Fields copied into access tokens; permission checks read them from
+    # the token instead of loading the user
+    TOKEN_CLAIM_FIELDS = ('role', 'is_staff', 'is_superuser', 'is_active')
+
     objects = AdminUserManager()
 
     class Meta:
@@ -73,4 +80,92 @@ class AdminUser(AbstractUser):
         ]
 
     def __str__(self):
-        return self.email 
\ No newline at end of file
+        return self.email
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the claim values issued tokens may carry so save() can
+        # tell when they go stale
+        instance._token_claims = {
+            field: instance.__dict__[field] for field in cls.TOKEN_CLAIM_FIELDS if field in instance.__dict__
+        }
+        return instance
+
+    def save(self, *args, **kwargs):
+        from .tokens import revoke_user_tokens
+
+        # A new password or changed claims invalidate the tokens issued so far
+        stale_tokens = not self._state.adding and (
+            self._password is not None or any(
+                getattr(self, field) != value for field, value in getattr(self, '_token_claims', {}).items()
+            )
+        )
+        super().save(*args, **kwargs)
+        self._token_claims = {
+            field: self.__dict__[field] for field in self.TOKEN_CLAIM_FIELDS if field in self.__dict__
+        }
+        if stale_tokens:
+            revoke_user_tokens(self.pk)
+
+
+class ClaimsUser(AdminUser):
+    """
+    A user built from the claims of a validated access token.
+
+    Only the primary key and ``TOKEN_CLAIM_FIELDS`` are set; the other
+    fields are deferred. Reading any of them loads all of them in a single
+    query, so views that only check permissions never touch the database.
+    """
+
+    class Meta:
+        proxy = True
+
+    @classmethod
+    def from_claims(cls, token, user_id_field='id', user_id_claim='user_id'):
+        claims = {user_id_field: token[user_id_claim]}
+        claims.update((field, token[field]) for field in cls.TOKEN_CLAIM_FIELDS)
+        # from_db expects values in concrete field order
+        field_names = [field.attname for field in cls._meta.concrete_fields if field.attname in claims]
+        return cls.from_db(None, field_names, [claims[name] for name in field_names])
+
+    def save(self, *args, **kwargs):
+        # Claim values are a snapshot from when the token was issued; saving
+        # them would undo any change made since, such as a demotion
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None or set(update_fields) & set(self.TOKEN_CLAIM_FIELDS):
+            raise ValueError(
+                'A user built from token claims can only be saved with update_fields '
+                'that exclude the claim fields; load the user from the database instead.'
+            )
+        super().save(*args, **kwargs)
+
+    def refresh_from_db(self, using=None, fields=None):
+        deferred = self.get_deferred_fields()
+        if fields is not None and deferred and set(fields) <= deferred:
+            fields = list(deferred)
+        super().refresh_from_db(using=using, fields=fields)
+
+
+class RevokedToken(models.Model):
+    """
+    A denylist entry for JSON web tokens.
+
+    An entry with a ``jti`` revokes that one token; an entry without one
+    revokes every token issued to the user before ``revoked_at``. Entries
+    are only kept until the tokens they cover would have expired anyway,
+    so the table stays small enough to cache whole.
+    """
+
+    jti = models.CharField(_('token id'), max_length=255, blank=True)
+    # Not a foreign key: revocations must outlive deleted users
+    user_id = models.BigIntegerField(_('user id'))
+    revoked_at = models.DateTimeField(_('revoked at'), default=timezone.now)
+    expires_at = models.DateTimeField(_('expires at'), db_index=True)
+
+    class Meta:
+        verbose_name = _('revoked token')
+        verbose_name_plural = _('revoked tokens')
+
+    def __str__(self):
+        return self.jti or f'all tokens of user {self.user_id} before {self.revoked_at}' 
\ No newline at end of file
@@ -0,0 +1,257 @@
+"""
+Bulk provisioning of guest and student accounts.
+
+Rows are streamed from a CSV, JSON or NDJSON file and handled in batches.
+Email and guest code uniqueness is checked with one ``IN`` query per batch
+(plus a running set for duplicates within the file) instead of a
+``UniqueValidator`` query per field and row, and each batch is inserted
+with one ``bulk_create``.
+
+Password hashing dominates the cost of creating a user, so accounts get
+unusable passwords by default (guests check in with their guest code).
+Generated or provided passwords are hashed in a process pool.
+"""
+
+import csv
+import json
+import multiprocessing
+import secrets
+import tempfile
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+
+import django
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.db import IntegrityError, transaction
+from rest_framework import serializers
+
+from campus_connect.imports import PARSERS, ImportFormatError, batches
+from campus_connect.streaming import Echo
+from .serializers import ProvisionUserSerializer
+
+User = get_user_model()
+
+PASSWORD_MODES = ('unusable', 'generate', 'provided')
+
+BATCH_SIZE = 1000
+
+CREDENTIAL_COLUMNS = ('row', 'status', 'email', 'name', 'role', 'guest_code', 'password', 'errors')
+
+
+def generate_guest_codes(count, taken=frozenset()):
+    """Return ``count`` random guest codes not in ``taken`` and not in use."""
+    codes = set()
+    while len(codes) < count:
+        candidates = {uuid.uuid4().hex[:10].upper() for _ in range(count - len(codes))} - codes - taken
+        in_use = User.objects.filter(guest_code__in=candidates).values_list('guest_code', flat=True)
+        codes |= candidates - set(in_use)
+    return list(codes)
+
+
+def _hash_password(password):
+    return make_password(password)
+
+
+def stream_credentials_csv(results):
+    """Yield CSV lines: a header row, then one row per provisioning result."""
+    writer = csv.writer(Echo())
+    yield writer.writerow(CREDENTIAL_COLUMNS)
+    for result in results:
+        errors = result.get('errors')
+        yield writer.writerow([
+            result['row'], result['status'], result.get('email', ''), result.get('name', ''),
+            result.get('role', ''), result.get('guest_code') or '', result.get('password') or '',
+            json.dumps(errors) if errors else '',
+        ])
+
+
+def write_credentials_csv(results):
+    """
+    Run provisioning to the end and return its credentials CSV as a
+    rewound temporary file, spooled to disk past a few megabytes.
+
+    Serving the file only once every row is handled means a client that
+    goes away mid-download cannot stop provisioning part way.
+    """
+    spool = tempfile.SpooledTemporaryFile(max_size=4 * 1024 * 1024, mode='w+b')
+    try:
+        for line in stream_credentials_csv(results):
+            spool.write(line.encode())
+    except BaseException:
+        spool.close()
+        raise
+    spool.seek(0)
+    return spool
+
+
+def read_file(file, chunk_size=64 * 1024):
+    """Yield a file's contents in chunks, closing it at the end."""
+    with file:
+        while True:
+            chunk = file.read(chunk_size)
+            if not chunk:
+                return
+            yield chunk
+
+
+class UserProvisioning:
+    """
+    One bulk provisioning run.
+
+    ``run()`` yields a result per input row, in order, as each batch is
+    committed: ``status`` is ``created`` (with the account's guest code and
+    any generated password) or ``error`` (with the row's errors).
+
+    Args:
+        password_mode: ``unusable``, ``generate`` (random passwords, returned
+            in the results) or ``provided`` (a ``password`` column)
+        role: Role for rows without a ``role`` column
+        hash_workers: Processes hashing passwords; 1 hashes in-process
+        batch_size: Rows checked and inserted together
+    """
+
+    def __init__(self, password_mode='unusable', role='guest', hash_workers=1, batch_size=BATCH_SIZE):
+        if password_mode not in PASSWORD_MODES:
+            raise ValueError(f'Unknown password mode: {password_mode}')
+        self.password_mode = password_mode
+        self.role = role
+        self.hash_workers = hash_workers
+        self.batch_size = batch_size
+        self.serializer = ProvisionUserSerializer()
+        self.seen_emails = set()
+        self.seen_codes = set()
+        self.rows = 0
+        self.created = 0
+        self.error_count = 0
+        self.pool = None
+
+    def run(self, stream, import_format):
+        rows = PARSERS[import_format](stream)
+        try:
+            for batch in batches(rows, self.batch_size):
+                self.rows += len(batch)
+                yield from self._provision(batch)
+        except ImportFormatError as exc:
+            yield self.error(self.rows + 1, {'non_field_errors': [str(exc)]})
+        finally:
+            if self.pool is not None:
+                self.pool.shutdown()
+
+    def error(self, row_number, detail, data=None):
+        self.error_count += 1
+        result = {'row': row_number, 'status': 'error', 'errors': detail}
+        if data:
+            result.update(email=data.get('email', ''), name=data.get('name', ''))
+        return result
+
+    def validate(self, row_number, row):
+        if not isinstance(row, dict):
+            return None, self.error(row_number, {'non_field_errors': ['Expected an object.']})
+        row = {'role': self.role, **row}
+        try:
+            data = self.serializer.run_validation(row)
+        except serializers.ValidationError as exc:
+            return None, self.error(row_number, exc.detail, row)
+        if self.password_mode == 'provided' and not data.get('password'):
+            return None, self.error(row_number, {'password': ['This field is required.']}, row)
+        data['email'] = User.objects.normalize_email(data['email'])
+        return data, None
+
+    def _provision(self, batch):
+        results = {}
+        valid = []
+        for row_number, row in batch:
+            data, error = self.validate(row_number, row)
+            if error is not None:
+                results[row_number] = error
+            else:
+                valid.append((row_number, data))
+
+        # One query per column for the whole batch
+        emails = {data['email'] for _, data in valid}
+        codes = {data['guest_code'] for _, data in valid if data.get('guest_code')}
+        taken_emails = set(User.objects.filter(email__in=emails).values_list('email', flat=True))
+        taken_codes = set(User.objects.filter(guest_code__in=codes).values_list('guest_code', flat=True))
+
+        # Taken by earlier rows of this batch; they only join the seen sets
+        # once the batch is inserted, so rows of a failed batch can be retried
+        batch_emails, batch_codes = set(), set()
+        accepted = []
+        for row_number, data in valid:
+            email = data['email']
+            if email in taken_emails or email in self.seen_emails or email in batch_emails:
+                results[row_number] = self.error(
+                    row_number, {'email': ['A user with this email already exists.']}, data
+                )
+                continue
+            code = data.get('guest_code')
+            if code and (code in taken_codes or code in self.seen_codes or code in batch_codes):
+                results[row_number] = self.error(
+                    row_number, {'guest_code': ['This guest code is already in use.']}, data
+                )
+                continue
+            batch_emails.add(email)
+            if code:
+                batch_codes.add(code)
+            accepted.append((row_number, data))
+
+        needs_code = [data for _, data in accepted if data['role'] == 'guest' and not data.get('guest_code')]
+        for data, code in zip(needs_code, generate_guest_codes(len(needs_code), self.seen_codes | batch_codes)):
+            data['guest_code'] = code
+            batch_codes.add(code)
+
+        if accepted:
+            results.update(self._insert(accepted))
+        for row_number, _ in batch:
+            yield results[row_number]
+
+    def _insert(self, accepted):
+        if self.password_mode == 'generate':
+            for _, data in accepted:
+                data['password'] = secrets.token_urlsafe(12)
+        if self.password_mode == 'unusable':
+            hashes = [make_password(None) for _ in accepted]
+        else:
+            hashes = self.hash_passwords([data['password'] for _, data in accepted])
+
+        users = [
+            User(
+                email=data['email'], name=data['name'], role=data['role'], phone=data.get('phone'),
+                guest_code=data.get('guest_code'), password=password_hash,
+            )
+            for (_, data), password_hash in zip(accepted, hashes)
+        ]
+        try:
+            with transaction.atomic():
+                User.objects.bulk_create(users)
+        except IntegrityError:
+            # Someone else took an email or code since the check
+            return {
+                row_number: self.error(row_number, {'non_field_errors': ['Conflicts with an existing user.']}, data)
+                for row_number, data in accepted
+            }
+
+        self.created += len(users)
+        self.seen_emails.update(data['email'] for _, data in accepted)
+        self.seen_codes.update(data['guest_code'] for _, data in accepted if data.get('guest_code'))
+        return {
+            row_number: {
+                'row': row_number, 'status': 'created', 'email': data['email'], 'name': data['name'],
+                'role': data['role'], 'guest_code': data.get('guest_code'),
+                # Provided passwords are the caller's already; only echo generated ones
+                'password': data['password'] if self.password_mode == 'generate' else None,
+            }
+            for row_number, data in accepted
+        }
+
+    def hash_passwords(self, passwords):
+        if self.hash_workers <= 1 or len(passwords) < 2:
+            return [make_password(password) for password in passwords]
+        if self.pool is None:
+            # Spawned workers are safe to start from threaded servers
+            self.pool = ProcessPoolExecutor(
+                self.hash_workers, mp_context=multiprocessing.get_context('spawn'), initializer=django.setup
+            )
+        chunk_size = max(1, len(passwords) // (self.hash_workers * 4))
+        return list(self.pool.map(_hash_password, passwords, chunksize=chunk_size))
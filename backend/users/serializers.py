@@ -1,7 +1,13 @@
 from rest_framework import serializers
 from django.contrib.auth import get_user_model
 from django.contrib.auth.password_validation import validate_password
+from django.utils.translation import gettext_lazy as _
 from rest_framework.validators import UniqueValidator
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken, TokenError
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer, TokenRefreshSerializer
+from rest_framework_simplejwt.settings import api_settings
+
+from .tokens import ClaimsRefreshToken, add_user_claims, is_revoked
 
 User = get_user_model()
 
@@ -59,4 +65,58 @@ class UserProfileSerializer(serializers.ModelSerializer):
     class Meta:
         model = User
         fields = ['id', 'email', 'name', 'role', 'phone', 'guest_code']
-        read_only_fields = ['id', 'email', 'role', 'guest_code'] 
\ No newline at end of file
+        read_only_fields = ['id', 'email', 'role', 'guest_code'] 
+
+class ClaimsTokenObtainPairSerializer(TokenObtainPairSerializer):
+    """Issue token pairs whose access tokens carry the user's claims."""
+    
+    token_class = ClaimsRefreshToken
+
+
+class ClaimsTokenRefreshSerializer(TokenRefreshSerializer):
+    """Refuse revoked refresh tokens and issue access tokens with current claims."""
+    
+    token_class = ClaimsRefreshToken
+    
+    def validate(self, attrs):
+        refresh = self.token_class(attrs['refresh'])
+        if is_revoked(refresh):
+            raise InvalidToken(_('Token has been revoked'))
+        
+        user = User.objects.filter(pk=refresh[api_settings.USER_ID_CLAIM], is_active=True).first()
+        if user is None:
+            raise AuthenticationFailed(_('User is inactive'), code='user_inactive')
+        add_user_claims(refresh, user)
+        
+        return {'access': str(refresh.access_token)}
+
+
+class LogoutSerializer(serializers.Serializer):
+    """Serializer for revoking the caller's tokens."""
+    
+    refresh = serializers.CharField(required=False)
+    
+    def validate_refresh(self, value):
+        try:
+            return ClaimsRefreshToken(value)
+        except TokenError as exc:
+            raise serializers.ValidationError(str(exc))
+
+
+class ProvisionUserSerializer(serializers.Serializer):
+    """Serializer for one row of a bulk user provisioning file."""
+    
+    email = serializers.EmailField(max_length=254)
+    name = serializers.CharField(max_length=255)
+    role = serializers.ChoiceField(choices=['guest', 'student'])
+    phone = serializers.CharField(max_length=20, required=False)
+    guest_code = serializers.CharField(max_length=50, required=False)
+    password = serializers.CharField(required=False, validators=[validate_password])
+
+
+class ProvisionOptionsSerializer(serializers.Serializer):
+    """Serializer for the query parameters of a bulk user provisioning request."""
+    
+    import_format = serializers.ChoiceField(choices=['csv', 'json', 'ndjson'], required=False)
+    passwords = serializers.ChoiceField(choices=['unusable', 'generate', 'provided'], default='unusable')
+    role = serializers.ChoiceField(choices=['guest', 'student'], default='guest')
@@ -0,0 +1,19 @@
+"""Background tasks for users: sending already rendered email."""
+
+from django.core.mail import EmailMultiAlternatives
+
+from taskqueue.queue import task
+
+
+@task
+def send_email(subject, body, from_email, to, alternatives=()):
+    """
+    Send one email.
+
+    Args:
+        alternatives: ``(content, mimetype)`` pairs, e.g. an HTML body
+    """
+    message = EmailMultiAlternatives(subject, body, from_email, to)
+    for content, mimetype in alternatives:
+        message.attach_alternative(content, mimetype)
+    message.send()
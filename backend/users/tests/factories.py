@@ -0,0 +1,12 @@
+import factory
+from django.contrib.auth import get_user_model
+
+
+class UserFactory(factory.django.DjangoModelFactory):
+    class Meta:
+        model = get_user_model()
+
+    email = factory.Sequence(lambda n: f'user-{n}@example.com')
+    name = factory.Sequence(lambda n: f'User {n}')
+    role = 'student'
+    password = factory.django.Password(None)
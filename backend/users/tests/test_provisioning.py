@@ -0,0 +1,52 @@
+import io
+import json
+
+import pytest
+
+from users.provisioning import UserProvisioning
+from .factories import UserFactory
+
+
+class RacingProvisioning(UserProvisioning):
+    """Lets another request take an email between the batch's check and its insert."""
+
+    def __init__(self, racing_email, **kwargs):
+        super().__init__(**kwargs)
+        self.racing_email = racing_email
+
+    def hash_passwords(self, passwords):
+        if self.racing_email:
+            UserFactory(email=self.racing_email)
+            self.racing_email = None
+        return super().hash_passwords(passwords)
+
+
+def ndjson(rows):
+    return io.BytesIO(''.join(json.dumps(row) + '\n' for row in rows).encode())
+
+
+@pytest.mark.django_db
+def test_rows_of_a_conflicting_batch_can_be_retried():
+    rows = [
+        {'email': 'taken@example.com', 'name': 'Taken'},
+        {'email': 'retried@example.com', 'name': 'Retried'},
+        # The next batch
+        {'email': 'retried@example.com', 'name': 'Retried'},
+    ]
+    provisioning = RacingProvisioning('taken@example.com', password_mode='generate', batch_size=2)
+
+    results = list(provisioning.run(ndjson(rows), 'ndjson'))
+
+    assert [result['status'] for result in results] == ['error', 'error', 'created']
+    assert results[1]['errors'] == {'non_field_errors': ['Conflicts with an existing user.']}
+    assert results[2]['password']
+
+
+@pytest.mark.django_db
+def test_duplicate_rows_within_a_batch_are_rejected():
+    rows = [{'email': 'twice@example.com', 'name': 'Twice'}] * 2
+
+    results = list(UserProvisioning().run(ndjson(rows), 'ndjson'))
+
+    assert [result['status'] for result in results] == ['created', 'error']
+    assert results[1]['errors'] == {'email': ['A user with this email already exists.']}
@@ -0,0 +1,113 @@
+"""
+JSON web tokens that carry the user's authorization claims, and the
+denylist that revokes them.
+
+Access tokens embed ``AdminUser.TOKEN_CLAIM_FIELDS`` so authentication can
+build the user from the token alone. Whenever those fields or the password
+change, every token issued to the user before then is revoked. The denylist
+is small (entries expire with the tokens they cover) and is cached whole,
+so checking it costs no query on most requests.
+"""
+
+from datetime import datetime, timezone as dt_timezone
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import AccessToken, RefreshToken
+
+DENYLIST_CACHE_KEY = 'jwt-denylist'
+
+DEFAULT_DENYLIST_CACHE_TIMEOUT = 300
+
+
+def add_user_claims(token, user):
+    from .models import AdminUser
+
+    for field in AdminUser.TOKEN_CLAIM_FIELDS:
+        token[field] = getattr(user, field)
+    return token
+
+
+def has_user_claims(token):
+    from .models import AdminUser
+
+    return all(field in token for field in AdminUser.TOKEN_CLAIM_FIELDS)
+
+
+class ClaimsAccessToken(AccessToken):
+    """Access token that carries the user's authorization claims."""
+
+    @classmethod
+    def for_user(cls, user):
+        return add_user_claims(super().for_user(user), user)
+
+
+class ClaimsRefreshToken(RefreshToken):
+    """Refresh token whose access tokens carry the user's authorization claims."""
+
+    access_token_class = ClaimsAccessToken
+
+    @classmethod
+    def for_user(cls, user):
+        return add_user_claims(super().for_user(user), user)
+
+
+def get_denylist():
+    """
+    Return ``(jtis, users)``: the revoked token ids, and for each user with
+    a blanket revocation the Unix time (in whole seconds) of the latest one.
+    """
+    denylist = cache.get(DENYLIST_CACHE_KEY)
+    if denylist is None:
+        from .models import RevokedToken
+
+        jtis, users = set(), {}
+        entries = RevokedToken.objects.filter(expires_at__gt=timezone.now()).values_list(
+            'jti', 'user_id', 'revoked_at'
+        )
+        for jti, user_id, revoked_at in entries:
+            if jti:
+                jtis.add(jti)
+            else:
+                users[user_id] = max(users.get(user_id, 0), int(revoked_at.timestamp()))
+        denylist = (jtis, users)
+        timeout = getattr(settings, 'JWT_DENYLIST_CACHE_TIMEOUT', DEFAULT_DENYLIST_CACHE_TIMEOUT)
+        cache.set(DENYLIST_CACHE_KEY, denylist, timeout)
+    return denylist
+
+
+def is_revoked(token):
+    jtis, users = get_denylist()
+    if token.get(api_settings.JTI_CLAIM) in jtis:
+        return True
+    revoked_at = users.get(token.get(api_settings.USER_ID_CLAIM))
+    # iat has one second resolution, so tokens issued in the second of the
+    # revocation are revoked too
+    return revoked_at is not None and token.get('iat', 0) <= revoked_at
+
+
+def _record_revocation(**fields):
+    from .models import RevokedToken
+
+    now = timezone.now()
+    RevokedToken.objects.filter(expires_at__lte=now).delete()
+    RevokedToken.objects.create(revoked_at=now, **fields)
+    transaction.on_commit(lambda: cache.delete(DENYLIST_CACHE_KEY))
+
+
+def revoke_token(token):
+    """Revoke a single access or refresh token."""
+    _record_revocation(
+        jti=token[api_settings.JTI_CLAIM],
+        user_id=token[api_settings.USER_ID_CLAIM],
+        expires_at=datetime.fromtimestamp(token['exp'], tz=dt_timezone.utc),
+    )
+
+
+def revoke_user_tokens(user_id):
+    """Revoke every token issued to the user until now."""
+    lifetime = max(api_settings.ACCESS_TOKEN_LIFETIME, api_settings.REFRESH_TOKEN_LIFETIME)
+    _record_revocation(user_id=user_id, expires_at=timezone.now() + lifetime)
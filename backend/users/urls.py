@@ -1,9 +1,11 @@
 from django.urls import path
-from .views import RegisterView, UserProfileView, UserListView, UserDetailView
+from .views import RegisterView, LogoutView, UserProfileView, UserListView, UserDetailView, UserProvisionView
 
 urlpatterns = [
     path('register/', RegisterView.as_view(), name='register'),
+    path('logout/', LogoutView.as_view(), name='logout'),
     path('profile/', UserProfileView.as_view(), name='profile'),
     path('users/', UserListView.as_view(), name='user-list'),
+    path('users/provision/', UserProvisionView.as_view(), name='user-provision'),
     path('users/<int:pk>/', UserDetailView.as_view(), name='user-detail'),
 ] 
\ No newline at end of file
@@ -1,9 +1,20 @@
 from rest_framework import generics, permissions, status
 from rest_framework.response import Response
 from rest_framework.views import APIView
+from rest_framework.exceptions import ValidationError
+from rest_framework.parsers import MultiPartParser
+from django.conf import settings
+from django.utils import timezone
 from django.contrib.auth import get_user_model
-from .serializers import RegisterSerializer, AdminUserSerializer, UserProfileSerializer
-from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework_simplejwt.settings import api_settings
+from campus_connect.imports import detect_format, get_import_stream
+from campus_connect.streaming import streaming_response
+from events.views import IsAdminUser
+from .provisioning import UserProvisioning, read_file, write_credentials_csv
+from .serializers import (
+    RegisterSerializer, AdminUserSerializer, UserProfileSerializer, LogoutSerializer, ProvisionOptionsSerializer
+)
+from .tokens import ClaimsRefreshToken, revoke_token
 
 User = get_user_model()
 
@@ -21,7 +32,7 @@ class RegisterView(generics.CreateAPIView):
         user = serializer.save()
         
         # Generate JWT tokens
-        refresh = RefreshToken.for_user(user)
+        refresh = ClaimsRefreshToken.for_user(user)
         
         return Response({
             "user": AdminUserSerializer(user, context=self.get_serializer_context()).data,
@@ -30,6 +41,23 @@ class RegisterView(generics.CreateAPIView):
         }, status=status.HTTP_201_CREATED)
 
 
+class LogoutView(APIView):
+    """View for revoking the caller's access token and, if given, refresh token."""
+    
+    permission_classes = [permissions.IsAuthenticated]
+    
+    def post(self, request):
+        serializer = LogoutSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        
+        revoke_token(request.auth)
+        refresh = serializer.validated_data.get('refresh')
+        if refresh is not None and refresh.get(api_settings.USER_ID_CLAIM) == request.user.pk:
+            revoke_token(refresh)
+        
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
 class UserProfileView(generics.RetrieveUpdateAPIView):
     """View for retrieving and updating user profile."""
     
@@ -37,7 +65,9 @@ class UserProfileView(generics.RetrieveUpdateAPIView):
     permission_classes = [permissions.IsAuthenticated]
     
     def get_object(self):
-        return self.request.user
+        # request.user carries token claims that may be stale; updates must
+        # start from the stored row so none of them are written back
+        return User.objects.get(pk=self.request.user.pk)
 
 
 class UserListView(generics.ListAPIView):
@@ -75,4 +105,45 @@ class UserDetailView(generics.RetrieveUpdateDestroyAPIView):
             self.permission_denied(
                 request,
                 message="You do not have permission to access this resource.",
-            ) 
\ No newline at end of file
+            )
+
+
+class UserProvisionView(APIView):
+    """
+    View for creating guest and student accounts in bulk (admin only).
+    
+    Takes a CSV, JSON or NDJSON file of users, either as the raw request
+    body or as the ``file`` field of a multipart upload, provisions every
+    row, then streams back a CSV with each row's outcome and the generated
+    credentials.
+    """
+    
+    parser_classes = [MultiPartParser]
+    permission_classes = [permissions.IsAuthenticated, IsAdminUser]
+    
+    def post(self, request):
+        options = ProvisionOptionsSerializer(data=request.query_params)
+        options.is_valid(raise_exception=True)
+        options = options.validated_data
+        
+        upload = get_import_stream(request)
+        if upload is None:
+            raise ValidationError({"file": "No file was submitted."})
+        stream, filename, content_type = upload
+        import_format = options.get('import_format') or detect_format(content_type, filename)
+        if import_format is None:
+            raise ValidationError({"import_format": "Pass csv, json or ndjson, or send a matching content type."})
+        
+        provisioning = UserProvisioning(
+            options['passwords'], role=options['role'],
+            hash_workers=getattr(settings, 'PROVISIONING_HASH_WORKERS', 1),
+        )
+        # Every row is provisioned before the response starts
+        credentials = write_credentials_csv(provisioning.run(stream, import_format))
+        response = streaming_response(request, read_file(credentials), content_type='text/csv')
+        filename = f"credentials-{timezone.now():%Y%m%d-%H%M%S}.csv"
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+        # The file may hold passwords
+        response['Cache-Control'] = 'no-store'
+        return response
+
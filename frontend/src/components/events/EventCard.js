@@ -26,6 +26,7 @@ const EventCard = ({ event }) => {
     capacity,
     active,
     background_image,
+    background_image_webp,
   } = event;
 
   // Format dates
@@ -47,11 +48,15 @@ const EventCard = ({ event }) => {
       hoverable
     >
       <div className="relative">
-        <img
-          src={background_image || 'https://via.placeholder.com/400x200?text=Event'}
-          alt={name}
-          className="w-full h-48 object-cover rounded-t-lg"
-        />
+        <picture>
+          {background_image_webp && <source srcSet={background_image_webp} type="image/webp" />}
+          <img
+            src={background_image || 'https://via.placeholder.com/400x200?text=Event'}
+            alt={name}
+            loading="lazy"
+            className="w-full h-48 object-cover rounded-t-lg"
+          />
+        </picture>
         {!active && (
           <div className="absolute top-2 right-2 bg-red-500 text-white text-xs px-2 py-1 rounded">
             Inactive
@@ -1,4 +1,5 @@
 import React, { useEffect, useState } from 'react';
+import axios from 'axios';
 import { useDispatch, useSelector } from 'react-redux';
 import { Link } from 'react-router-dom';
 import Card from '../../components/ui/Card';
@@ -9,6 +10,8 @@ import { fetchEvents } from '../../store/slices/eventSlice';
 import { fetchUsers } from '../../store/slices/userSlice';
 import { fetchRegistrations } from '../../store/slices/registrationSlice';
 
+const API_URL = process.env.REACT_APP_API_URL || 'http://localhost:8000/api/v1';
+
 const Dashboard = () => {
   const dispatch = useDispatch();
   const { user } = useSelector((state) => state.auth);
@@ -25,6 +28,8 @@ const Dashboard = () => {
     totalRegistrations: 0,
     checkedInRegistrations: 0,
   });
+  const [statsLoading, setStatsLoading] = useState(true);
+  const [statsError, setStatsError] = useState(null);
 
   useEffect(() => {
     dispatch(fetchEvents({ admin: true }));
@@ -32,22 +37,29 @@ const Dashboard = () => {
     dispatch(fetchRegistrations({ admin: true }));
   }, [dispatch]);
 
+  // Totals are aggregated server-side; the lists above only feed the "recent" panels
   useEffect(() => {
-    if (events && users && registrations) {
-      const now = new Date();
-      
-      setStats({
-        totalEvents: events.length,
-        upcomingEvents: events.filter(event => new Date(event.start_time) > now).length,
-        totalUsers: users.length,
-        totalRegistrations: registrations.length,
-        checkedInRegistrations: registrations.filter(reg => reg.status === 'checked_in').length,
-      });
-    }
-  }, [events, users, registrations]);
-
-  const isLoading = eventsLoading || usersLoading || registrationsLoading;
-  const hasError = eventsError || usersError || registrationsError;
+    const token = localStorage.getItem('token');
+    
+    axios
+      .get(`${API_URL}/stats/`, { headers: { Authorization: `Bearer ${token}` } })
+      .then((response) => {
+        const { events: eventStats, users: userStats, registrations: registrationStats } = response.data;
+        
+        setStats({
+          totalEvents: eventStats.total,
+          upcomingEvents: eventStats.upcoming,
+          totalUsers: userStats.total,
+          totalRegistrations: registrationStats.total,
+          checkedInRegistrations: registrationStats.by_status.checked_in,
+        });
+      })
+      .catch((error) => setStatsError(error.message || error.toString()))
+      .finally(() => setStatsLoading(false));
+  }, []);
+
+  const isLoading = eventsLoading || usersLoading || registrationsLoading || statsLoading;
+  const hasError = eventsError || usersError || registrationsError || statsError;
 
   if (isLoading) {
     return <Loading text="Loading dashboard data..." />;
@@ -17,14 +17,28 @@ import DownloadIcon from '@mui/icons-material/Download';
 import RefreshIcon from '@mui/icons-material/Refresh';
 import ArrowBackIcon from '@mui/icons-material/ArrowBack';
 import { getEventById, generateEventQRCode } from '../../store/slices/eventSlice';
-import QRCode from 'qrcode.react';
+import api from '../../utils/api';
+
+// Seconds between polls when the server says the code is due now, and
+// after a failed request
+const MIN_POLL_INTERVAL = 5;
+const RETRY_INTERVAL = 10;
+
+const maxAge = (response) => {
+  const match = /max-age=(\d+)/.exec(response.headers['cache-control'] || '');
+  return match ? parseInt(match[1], 10) : 0;
+};
 
 const EventQRCode = () => {
   const { id } = useParams();
   const dispatch = useDispatch();
   const navigate = useNavigate();
   
-  const [qrGenerated, setQrGenerated] = useState(false);
+  // 'loading', 'shown', 'missing' (never generated) or 'expired'
+  const [qrState, setQrState] = useState('loading');
+  const [qrImage, setQrImage] = useState(null);
+  const [nextCodeAt, setNextCodeAt] = useState(null);
+  const [generation, setGeneration] = useState(0);
   const [qrError, setQrError] = useState('');
   
   const { event, isLoading, error } = useSelector((state) => state.events);
@@ -35,20 +49,72 @@ const EventQRCode = () => {
     }
   }, [dispatch, id]);
   
+  // Show the code check-in accepts right now. Codes rotate by themselves
+  // (signed tokens every step, stored codes through the scheduler), so the
+  // next one is fetched once the response's max-age says it was replaced.
   useEffect(() => {
-    if (event && event.qr_code) {
-      setQrGenerated(true);
-    } else {
-      setQrGenerated(false);
+    if (!id) {
+      return undefined;
     }
-  }, [event]);
+    
+    let timer = null;
+    let closed = false;
+    let imageUrl = null;
+    
+    const load = async () => {
+      let response;
+      try {
+        // After a regeneration the browser may still hold the replaced
+        // code, so ask for it under a URL of its own
+        response = await api.get(`/events/${id}/qr-code/`, {
+          params: generation ? { generation } : {},
+          responseType: 'blob',
+        });
+      } catch (error) {
+        if (closed) {
+          return;
+        }
+        const status = error.response?.status;
+        if (status === 404 || status === 400) {
+          // Nothing to show until an admin generates a code
+          setQrState(status === 404 ? 'missing' : 'expired');
+        } else {
+          timer = setTimeout(load, RETRY_INTERVAL * 1000);
+        }
+        return;
+      }
+      if (closed) {
+        return;
+      }
+      
+      if (imageUrl) {
+        URL.revokeObjectURL(imageUrl);
+      }
+      imageUrl = URL.createObjectURL(response.data);
+      const seconds = maxAge(response);
+      setQrImage(imageUrl);
+      setQrState('shown');
+      setNextCodeAt(new Date(Date.now() + seconds * 1000));
+      timer = setTimeout(load, Math.max(seconds, MIN_POLL_INTERVAL) * 1000);
+    };
+    
+    load();
+    return () => {
+      closed = true;
+      clearTimeout(timer);
+      if (imageUrl) {
+        URL.revokeObjectURL(imageUrl);
+      }
+    };
+  }, [id, generation]);
   
   const handleGenerateQRCode = () => {
     setQrError('');
     dispatch(generateEventQRCode(id))
       .unwrap()
       .then(() => {
-        setQrGenerated(true);
+        // Start polling again from the new code
+        setGeneration((value) => value + 1);
       })
       .catch((error) => {
         setQrError(error);
@@ -56,14 +122,9 @@ const EventQRCode = () => {
   };
   
   const handleDownloadQRCode = () => {
-    const canvas = document.getElementById('event-qr-code');
-    if (canvas) {
-      const pngUrl = canvas
-        .toDataURL('image/png')
-        .replace('image/png', 'image/octet-stream');
-      
+    if (qrImage) {
       const downloadLink = document.createElement('a');
-      downloadLink.href = pngUrl;
+      downloadLink.href = qrImage;
       downloadLink.download = `event-${event.id}-qrcode.png`;
       document.body.appendChild(downloadLink);
       downloadLink.click();
@@ -152,19 +213,21 @@ const EventQRCode = () => {
                 justifyContent: 'center'
               }}
             >
-              {qrGenerated && event.qr_code ? (
+              {qrState === 'loading' ? (
+                <CircularProgress />
+              ) : qrState === 'shown' ? (
                 <>
                   <Box sx={{ mb: 2, textAlign: 'center' }}>
-                    <QRCode
+                    <img
                       id="event-qr-code"
-                      value={event.qr_code}
-                      size={200}
-                      level="H"
-                      includeMargin
+                      src={qrImage}
+                      alt="Event check-in QR code"
+                      width={200}
+                      height={200}
                     />
                   </Box>
                   <Typography variant="body2" color="text.secondary" sx={{ mb: 2, textAlign: 'center' }}>
-                    Generated: {new Date(event.qr_code_generated_at).toLocaleString()}
+                    Refreshes automatically. Next code at {nextCodeAt.toLocaleTimeString()}
                   </Typography>
                   <Box sx={{ display: 'flex', gap: 2 }}>
                     <Button
@@ -187,7 +250,9 @@ const EventQRCode = () => {
                 <Box sx={{ textAlign: 'center' }}>
                   <QrCodeIcon sx={{ fontSize: 100, color: 'text.secondary', mb: 2 }} />
                   <Typography variant="body1" gutterBottom>
-                    No QR code has been generated for this event yet.
+                    {qrState === 'expired'
+                      ? 'The QR code for this event has expired.'
+                      : 'No QR code has been generated for this event yet.'}
                   </Typography>
                   <Button
                     variant="contained"
@@ -223,7 +288,8 @@ const EventQRCode = () => {
                 </ol>
               </Typography>
               <Typography variant="body2" paragraph>
-                <strong>Note:</strong> You can regenerate the QR code if needed, but this will invalidate the previous code.
+                <strong>Note:</strong> The code on screen changes by itself while it is open, so it can be left on
+                a display. You can regenerate the QR code if needed, but this will invalidate the previous code.
               </Typography>
             </Paper>
           </Grid>
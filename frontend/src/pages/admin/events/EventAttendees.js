@@ -28,6 +28,9 @@ import ArrowBackIcon from '@mui/icons-material/ArrowBack';
 import { getEventById } from '../../../store/slices/eventSlice';
 import { getEventRegistrations } from '../../../store/slices/registrationSlice';
 import { format } from 'date-fns';
+import api from '../../../utils/api';
+
+const API_URL = process.env.REACT_APP_API_URL || 'http://localhost:8000/api/v1';
 
 const EventAttendees = () => {
   const { id } = useParams();
@@ -47,6 +50,64 @@ const EventAttendees = () => {
     }
   }, [dispatch, id]);
   
+  // Reload attendees when the server pushes a registration change
+  useEffect(() => {
+    if (!id) {
+      return undefined;
+    }
+    
+    const reload = () => dispatch(getEventRegistrations(id));
+    let source = null;
+    let retry = null;
+    let closed = false;
+    
+    // EventSource cannot send the Authorization header, so each connection
+    // uses a short-lived ticket for this event's stream instead
+    const connect = async () => {
+      let ticket;
+      try {
+        const response = await api.post(`/events/${id}/live/ticket/`);
+        ticket = response.data.ticket;
+      } catch (error) {
+        if (!closed) {
+          retry = setTimeout(connect, 10000);
+        }
+        return;
+      }
+      if (closed) {
+        return;
+      }
+      
+      source = new EventSource(`${API_URL}/events/${id}/live/?ticket=${encodeURIComponent(ticket)}`);
+      let snapshotReceived = false;
+      
+      // Every registration change moves the counters, so capacity messages
+      // cover check-ins too; the first one is the snapshot sent on connect
+      source.addEventListener('capacity', () => {
+        if (snapshotReceived) {
+          reload();
+        }
+        snapshotReceived = true;
+      });
+      source.addEventListener('resync', reload);
+      // The ticket has expired by the time the server ends the stream, so
+      // reconnect with a new one rather than letting EventSource retry
+      source.onerror = () => {
+        source.close();
+        retry = setTimeout(connect, 3000);
+      };
+    };
+    connect();
+    
+    return () => {
+      closed = true;
+      clearTimeout(retry);
+      if (source) {
+        source.close();
+      }
+    };
+  }, [dispatch, id]);
+  
   useEffect(() => {
     if (registrations) {
       setFilteredRegistrations(
@@ -98,6 +98,7 @@ const EventDetail = () => {
     capacity,
     active,
     background_image,
+    image_variants,
     is_past,
     is_full,
     available_spots,
@@ -112,11 +113,14 @@ const EventDetail = () => {
     <div>
       {/* Event header with background image */}
       <div className="relative h-64 md:h-80 rounded-lg overflow-hidden mb-8">
-        <img
-          src={background_image || 'https://via.placeholder.com/1200x400?text=Event'}
-          alt={name}
-          className="w-full h-full object-cover"
-        />
+        <picture>
+          {image_variants && <source srcSet={image_variants.hero.webp} type="image/webp" />}
+          <img
+            src={(image_variants && image_variants.hero.jpeg) || background_image || 'https://via.placeholder.com/1200x400?text=Event'}
+            alt={name}
+            className="w-full h-full object-cover"
+          />
+        </picture>
         <div className="absolute inset-0 bg-black bg-opacity-50 flex items-end">
           <div className="p-6 text-white">
             <h1 className="text-3xl md:text-4xl font-bold mb-2">{name}</h1>
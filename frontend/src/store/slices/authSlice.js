@@ -1,8 +1,9 @@
 import { createSlice, createAsyncThunk } from '@reduxjs/toolkit';
+import axios from 'axios';
 import api from '../../utils/api';
 import { handleError } from '../../utils/errorHandler';
-import { getItem, setItem, removeItem } from '../../utils/storage';
-import { AUTH_CONFIG } from '../../utils/config';
+import { getItem, getStringItem, setItem, removeItem } from '../../utils/storage';
+import { API_CONFIG, AUTH_CONFIG } from '../../utils/config';
 
 // Get user from localStorage
 const user = getItem(AUTH_CONFIG.USER_KEY);
@@ -69,9 +70,25 @@ export const login = createAsyncThunk(
 
 // Logout user
 export const logout = createAsyncThunk('auth/logout', async () => {
+  const token = getStringItem(AUTH_CONFIG.TOKEN_KEY);
+  const refresh = getStringItem(AUTH_CONFIG.REFRESH_TOKEN_KEY);
   removeItem(AUTH_CONFIG.USER_KEY);
   removeItem(AUTH_CONFIG.TOKEN_KEY);
   removeItem(AUTH_CONFIG.REFRESH_TOKEN_KEY);
+
+  // Revoke the tokens server-side; plain axios so a rejected token does
+  // not trigger the refresh interceptor
+  if (token) {
+    try {
+      await axios.post(
+        `${API_CONFIG.BASE_URL}/auth/logout/`,
+        refresh ? { refresh } : {},
+        { headers: { Authorization: `Bearer ${token}` } }
+      );
+    } catch (error) {
+      // Already expired or revoked
+    }
+  }
 });
 
 // Update user profile